@@ -16,13 +16,17 @@ from utils.logging import (
     log_technical_detail, log_module_registration, log_unregistered_module_key,
     log_file_processing_result, log_pipeline_summary, log_file_discovery,
     log_iif_parsing_summary, log_module_dispatch, log_module_success,
-    log_sections_found, flush_logs
+    log_sections_found, flush_logs, timed_stage
 )
 from utils.iif_parser import IIFParser
+from utils.list_schema import ListModuleSchema, compile_list_module
 
 # Central module registry
 _module_registry: Dict[str, Any] = {}
 
+# Run-level finalizers, called in registration order after every file is dispatched
+_finalizer_registry: Dict[str, Any] = {}
+
 def run_conversion_pipeline(config: Dict[str, Any]) -> int:
     """Orchestrate the full conversion process with domain-tagged logging.
     
@@ -71,6 +75,16 @@ def run_conversion_pipeline(config: Dict[str, Any]) -> int:
         total_sections_processed = 0
         unimplemented_sections_found = False
         
+        # One extra_config dict is shared by every dispatch in this run so modules can
+        # publish indexes (e.g. the accounts module's account_index) for later modules
+        shared_config: Dict[str, Any] = dict(config.get('extra_config', {}))
+        
+        # Registered modules run in registration order so publishers precede consumers
+        registration_order = {key: position for position, key in enumerate(_module_registry)}
+        
+        # Section that reported HALT; later sections may depend on its output, so dispatch stops there
+        halted_section = None
+        
         for file_path in iif_files:
             filename = os.path.basename(file_path)
             log_technical_detail(f"[CORE] Begin content-based processing - {file_path}")
@@ -78,11 +92,13 @@ def run_conversion_pipeline(config: Dict[str, Any]) -> int:
             # Parse IIF file to extract all module keys (PRD Section 13.4.2)
             try:
                 log_technical_detail(f"[CORE] Initializing IIF parser for: {file_path}")
-                parser = IIFParser(file_path)
-                sections = parser.parse()
-                
-                # Count total records across all sections
-                total_records = sum(len(records) for records in sections.values())
+                with timed_stage('CORE', 'parse') as parse_counts:
+                    parser = IIFParser(file_path)
+                    sections = parser.parse()
+                    
+                    # Count total records across all sections
+                    total_records = sum(len(records) for records in sections.values())
+                    parse_counts.update(sections=len(sections), records=total_records)
                 log_iif_parsing_summary(file_path, len(sections), total_records)
                 
                 # Log discovered module keys (technical detail)
@@ -102,7 +118,9 @@ def run_conversion_pipeline(config: Dict[str, Any]) -> int:
             file_results = []
             
             # Dispatch each section to its registered module (PRD Section 13.4.3)
-            for section_key, records in sections.items():
+            ordered_sections = sorted(sections.items(),
+                                      key=lambda item: registration_order.get(item[0], len(registration_order)))
+            for section_key, records in ordered_sections:
                 if section_key in _module_registry:
                     log_module_dispatch(section_key, len(records))
                     
@@ -111,12 +129,13 @@ def run_conversion_pipeline(config: Dict[str, Any]) -> int:
                         'section': section_key,
                         'records': records,
                         'output_dir': output_dir,
-                        'extra_config': {}
+                        'extra_config': shared_config
                     }
                     
                     # Dispatch to registered module
                     try:
-                        result = dispatch_to_module(_module_registry, section_key, payload)
+                        with timed_stage(f"{section_key.upper()}-PIPELINE", 'dispatch', {'records': len(records)}):
+                            result = dispatch_to_module(_module_registry, section_key, payload)
                         if result:  # Boolean success
                             log_module_success(section_key, "processing completed successfully")
                             total_sections_processed += 1
@@ -133,6 +152,8 @@ def run_conversion_pipeline(config: Dict[str, Any]) -> int:
                             timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # Millisecond precision
                             log_user_error(f"[{section_key.upper()}-PIPELINE] Module reports HALT. User action required. See debug log \"E0113\" around {timestamp}")
                             log_technical_detail(f"[CORE] E0113 Module returned False - {section_key}")
+                            halted_section = section_key
+                            break
                         
                     except Exception as e:
                         log_user_error(f"[CORE] Module {section_key.lower()} failed for {filename} (see logs: module processing errors)")
@@ -147,6 +168,20 @@ def run_conversion_pipeline(config: Dict[str, Any]) -> int:
             # Show file processing results to user (only for successfully processed modules)
             if file_results:
                 log_file_processing_result(file_path, len(sections), total_records, file_results)
+            
+            if halted_section is not None:
+                break
+        
+        if halted_section is not None:
+            log_user_info(f"[CORE] Pipeline stopped after {halted_section} HALT: complete the requested action and run again")
+            log_technical_detail(f"[CORE] Dispatch stopped at HALT - {halted_section}; remaining sections and finalizers skipped")
+            flush_logs()
+            return 2  # Validation error - user action required
+        
+        # Finalizers see the shared config once every section of every file is dispatched
+        for finalizer_name, finalizer in _finalizer_registry.items():
+            with timed_stage(finalizer_name, 'finalize'):
+                finalizer({'output_dir': output_dir, 'extra_config': shared_config})
         
         # Show final summary to user
         if total_sections_processed == 0:
@@ -255,6 +290,29 @@ def register_global_module(key: str, module: Any) -> None:
     """
     register_module(_module_registry, key, module)
 
+def register_list_module(schema: ListModuleSchema) -> None:
+    """Compile a declarative list module once and register it with the global registry.
+    
+    Args:
+        schema (ListModuleSchema): List module declaration; schema.section is the module key
+    """
+    register_global_module(schema.section, compile_list_module(schema))
+
+def register_global_finalizer(name: str, finalizer: Any) -> None:
+    """Register a run-level finalizer called after all sections are dispatched.
+    
+    Args:
+        name (str): Domain tag of the finalizer (e.g., 'DUPLICATES')
+        finalizer (Any): Function taking a payload with output_dir and extra_config
+        
+    Raises:
+        RegistryKeyConflictError: If the name is already registered.
+    """
+    if name in _finalizer_registry:
+        raise RegistryKeyConflictError(f"Finalizer already registered: {name}")
+    log_technical_detail(f"[CORE] Finalizer registered - {name}")
+    _finalizer_registry[name] = finalizer
+
 def get_global_registry() -> Dict[str, Any]:
     """Get the global module registry."""
     return _module_registry
\ No newline at end of file
@@ -5,12 +5,68 @@ UPDATED: Domain-tagged console and debug logging per logging specification.
 
 import os
 import logging
+from typing import Any, Dict, Mapping
 
-from core import run_conversion_pipeline, register_global_module
+from core import run_conversion_pipeline, register_global_module, register_list_module, register_global_finalizer
 from modules.accounts.accounts import run_accounts_pipeline
+from modules.transactions.transactions import run_transactions_pipeline
+from modules.budgets import run_budgets_pipeline
+from modules.items import run_item_custom_fields_pipeline, run_items_pipeline
+from modules.lists import LIST_MODULE_SCHEMAS
+from modules.names import (
+    run_custom_fields_pipeline, run_customers_pipeline, run_vendors_pipeline, run_other_names_pipeline,
+    run_duplicate_report
+)
 from utils.logging import setup_logging, log_user_info, log_user_error, log_technical_detail
 from utils.error_handler import FileNotFoundError
 
+def _name_list(value: str) -> list:
+    return [name.strip().lower() for name in value.split(',') if name.strip()]
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"must be at least 1, got {number}")
+    return number
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise ValueError(f"must not be negative, got {number}")
+    return number
+
+# Run settings read from the environment (no CLI arguments per PRD) into the shared
+# extra_config: environment variable -> (extra_config key, parser)
+EXTRA_CONFIG_ENVIRONMENT = {
+    'QBD_EXPORT_FORMATS': ('export_formats', _name_list),                   # e.g. "sqlite,xml"
+    'QBD_VALIDATION_WORKERS': ('validation_workers', _non_negative_int),    # 0 = single process
+    'QBD_TRANSACTIONS_CHUNK_ROWS': ('transactions_chunk_rows', _positive_int),
+    'QBD_OPENING_BALANCE_DATE': ('opening_balance_date', str.strip),        # IIF or ISO date
+}
+
+def read_extra_config(environ: Mapping[str, str]) -> Dict[str, Any]:
+    """Build the run's extra_config from QBD_* environment settings.
+    
+    Args:
+        environ: Environment mapping (os.environ)
+        
+    Returns:
+        extra_config entries for every setting that is set and non-empty
+        
+    Raises:
+        ValueError: If a setting cannot be parsed, naming the variable
+    """
+    extra_config = {}
+    for variable, (key, parse) in EXTRA_CONFIG_ENVIRONMENT.items():
+        value = environ.get(variable, '').strip()
+        if not value:
+            continue
+        try:
+            extra_config[key] = parse(value)
+        except ValueError as e:
+            raise ValueError(f"Invalid {variable}={value!r}: {str(e)}")
+    return extra_config
+
 def discover_input_files(input_dir: str = 'input') -> list:
     """Discover all IIF files in input directory for content-based processing.
     
@@ -31,28 +87,53 @@ def discover_input_files(input_dir: str = 'input') -> list:
     
     return iif_files
 
+def register_modules() -> None:
+    """Register every domain module and finalizer with the core, in dispatch order."""
+    register_global_module('ACCNT', run_accounts_pipeline)
+    register_global_module('TRNS', run_transactions_pipeline)
+    # Declarative list modules, compiled once at registration
+    for schema in LIST_MODULE_SCHEMAS:
+        register_list_module(schema)
+    # Name lists: the custom-field dictionary precedes the lists that use it
+    register_global_module('CUSTNAMEDICT', run_custom_fields_pipeline)
+    register_global_module('CUST', run_customers_pipeline)
+    register_global_module('VEND', run_vendors_pipeline)
+    register_global_module('OTHERNAME', run_other_names_pipeline)
+    # Items: CUSTITEMDICT labels precede INVITEM; both after ACCNT for account resolution
+    register_global_module('CUSTITEMDICT', run_item_custom_fields_pipeline)
+    register_global_module('INVITEM', run_items_pipeline)
+    register_global_module('BUD', run_budgets_pipeline)
+    # Run-level reports over the names collected from every file
+    register_global_finalizer('DUPLICATES', run_duplicate_report)
+
 def main() -> None:
     """Main entry point - no CLI arguments as per PRD specification."""
     # Initialize logging system first (PRD compliance)
     try:
-        setup_logging()
+        # Log profile from the environment (no CLI arguments per PRD); 'production' turns off per-record debug
+        setup_logging(profile=os.environ.get('QBD_LOG_PROFILE', 'standard'))
         log_technical_detail("[CORE] QBD to GnuCash conversion tool started")
     except Exception as e:
         print(f"FATAL: Logging system initialization failed: {str(e)}")
         exit(1)
     
     try:
+        # Run settings from the environment, checked before any file is touched
+        try:
+            extra_config = read_extra_config(os.environ)
+        except ValueError as e:
+            log_user_error(f"[CORE] {str(e)}")
+            exit(2)
+        if extra_config:
+            log_technical_detail(f"[CORE] Run settings from environment: {extra_config}")
+        
         # Ensure directories exist
         os.makedirs('input', exist_ok=True)
         os.makedirs('output', exist_ok=True)
         log_technical_detail("[CORE] Directory structure verified")
         
         # Register modules with their module keys (PRD Section 13.4.3)
-        register_global_module('ACCNT', run_accounts_pipeline)
-        # Future modules would be registered here:
-        # register_global_module('CUST', run_customers_pipeline) 
-        # register_global_module('VEND', run_vendors_pipeline)
-        # register_global_module('INVITEM', run_items_pipeline)
+        register_modules()
         log_technical_detail("[CORE] Module registration completed")
         
         # Discover all IIF files (content-based, not filename-based)
@@ -71,7 +152,8 @@ def main() -> None:
         config = {
             'iif_files': iif_files,  # Pass all files for content-based dispatch
             'input_dir': 'input',
-            'output_dir': 'output'
+            'output_dir': 'output',
+            'extra_config': extra_config
         }
         
         # Run conversion pipeline (core will handle content-based section dispatch)
@@ -5,15 +5,26 @@ in the module PRDs with integrated text workflow coordination and HALT condition
 """
 
 import logging
-import os
 from typing import Dict, List, Any
 
-from utils.error_handler import ConversionError, OutputWriteError
-from utils.logging import log_user_info, log_user_error, log_technical_detail
+from utils.account_index import ACCOUNT_INDEX_KEY
+from utils.logging import log_user_info, log_user_error, log_technical_detail, timed_stage
 
-from .accounts_tree import build_accounts_tree
-from .accounts_mapping import load_mapping, find_unmapped_types, generate_text_mapping_questions
+from .accounts_snapshot import build_or_update_accounts_tree
+from .accounts_opening import convert_opening_balances, load_opening_balances
+from .accounts_trial_balance import check_trial_balance, log_trial_balance
+from .accounts_tree import build_account_index
+from .accounts_mapping import load_mapping, find_unmapped_types, generate_text_mapping_questions, compile_mapping_resolution
 from .accounts_export import export_accounts
+from .accounts_export_sqlite import export_accounts_sqlite
+from .accounts_export_xml import export_accounts_xml
+from .accounts_validation import validate_accounts
+
+# Export backends selectable through extra_config['export_formats'] in addition to the CSV
+ADDITIONAL_EXPORT_BACKENDS = {
+    'sqlite': export_accounts_sqlite,
+    'xml': export_accounts_xml,
+}
 
 def run_accounts_pipeline(payload: Dict[str, Any]) -> bool:
     """Main entry point for accounts processing pipeline with text workflow coordination.
@@ -23,7 +34,10 @@ def run_accounts_pipeline(payload: Dict[str, Any]) -> bool:
             - section: Section identifier (e.g., 'ACCNT')
             - records: List of account records from !ACCNT section
             - output_dir: Directory for generated output files
-            - extra_config: Additional configuration (optional)
+            - extra_config: Run-wide shared configuration; receives the account reference
+              index under 'account_index' for modules dispatched later; optional
+              'export_formats' list selects additional export backends (e.g. ['sqlite', 'xml']);
+              optional 'opening_balance_date' dates the opening-balance transaction
         
     Returns:
         bool: True for successful completion, False for HALT condition (user action required)
@@ -40,7 +54,8 @@ def run_accounts_pipeline(payload: Dict[str, Any]) -> bool:
         
         # Step 1: Load account mapping configuration with text workflow integration
         log_technical_detail("[ACCOUNTS-ORCHESTRATION] Loading account mapping configuration")
-        mapping = load_mapping()
+        with timed_stage('ACCOUNTS-PIPELINE', 'load_mapping'):
+            mapping = load_mapping(output_dir=output_dir)
         
         # Check for HALT condition from text workflow
         if mapping is None:
@@ -48,24 +63,25 @@ def run_accounts_pipeline(payload: Dict[str, Any]) -> bool:
             log_user_info("[ACCOUNTS-PIPELINE] Pipeline HALT: User action required for mapping completion")
             return False  # HALT condition - user needs to complete questions file
         
-        # Step 2: Basic data validation (inline - no separate module needed)
+        # Step 2: Account data validation
         log_technical_detail("[ACCOUNTS-ORCHESTRATION] Beginning account validation")
         if not accounts_data:
             logging.warning("[ACCOUNTS-PIPELINE] No account records found to process")
             return True
         
-        # Quick validation - check required fields
-        required_fields = ['NAME', 'ACCNTTYPE']
-        for i, account in enumerate(accounts_data):
-            for field in required_fields:
-                if field not in account or not account[field]:
-                    log_user_error(f"[ACCOUNTS-ORCHESTRATION] Pipeline coordination failed: Account record {i} missing required field '{field}'")
-                    raise ConversionError(f"Account record {i} missing required field '{field}'")
+        # Single-pass validation collecting every error; unmapped types are left to the
+        # text workflow in Step 3, so only required fields, names and duplicates are checked here
+        validation_workers = payload.get('extra_config', {}).get('validation_workers', 0)
+        with timed_stage('ACCOUNTS-PIPELINE', 'validate', {'accounts': len(accounts_data)}):
+            validate_accounts(accounts_data, mapping, check_types=False, workers=validation_workers)
         
         log_technical_detail(f"[ACCOUNTS-ORCHESTRATION] Account validation completed - {len(accounts_data)} accounts validated")
         
+        # Compile the merged mapping once and share it across tree building and export
+        resolution = compile_mapping_resolution(mapping)
+        
         # Step 3: Check for unmapped types and handle text workflow
-        unmapped_types = find_unmapped_types(accounts_data, mapping)
+        unmapped_types = find_unmapped_types(accounts_data, mapping, resolution)
         
         if unmapped_types:
             log_user_info(f"[ACCOUNTS-ORCHESTRATION] Sub-module coordination: HALT condition detected")
@@ -78,25 +94,57 @@ def run_accounts_pipeline(payload: Dict[str, Any]) -> bool:
             
             return False  # HALT condition - user needs to complete mapping
         
-        # Step 4: Build account hierarchy tree with double-entry structure
+        # Step 4: Build account hierarchy tree with double-entry structure (incremental when a snapshot exists)
         log_technical_detail("[ACCOUNTS-ORCHESTRATION] Building account hierarchy tree")
-        root_node = build_accounts_tree(accounts_data, mapping)
+        with timed_stage('ACCOUNTS-PIPELINE', 'build_tree', {'accounts': len(accounts_data)}):
+            root_node = build_or_update_accounts_tree(accounts_data, mapping, output_dir, resolution)
         log_technical_detail("[ACCOUNTS-ORCHESTRATION] Account hierarchy tree construction completed")
         
+        # Publish the account reference index for modules dispatched after accounts
+        extra_config = payload.get('extra_config')
+        index = build_account_index(root_node, resolution.default_commodity)
+        if extra_config is not None:
+            extra_config[ACCOUNT_INDEX_KEY] = index
+        
+        # Step 4b: OBAMOUNT balances decoded in one batch into a single opening-balance transaction
+        with timed_stage('ACCOUNTS-PIPELINE', 'opening_balances') as opening_counts:
+            full_names, balances = load_opening_balances(root_node)
+            opening_counts.update(convert_opening_balances(full_names, balances, accounts_data, index,
+                                                           extra_config or {}, output_dir))
+        if opening_counts['splits']:
+            log_user_info(f"[ACCOUNTS-PIPELINE] Generated opening balance transaction: {opening_counts['splits']} splits")
+        
+        # Step 4c: Trial balance and sign conventions per GnuCash account class (warnings only)
+        with timed_stage('ACCOUNTS-PIPELINE', 'trial_balance', {'accounts': len(full_names)}) as balance_counts:
+            trial_balance = check_trial_balance(full_names, balances, index)
+            balance_counts.update(anomalies=trial_balance.anomaly_count)
+        log_trial_balance(trial_balance)
+        
         # Step 5: Export to GnuCash CSV format (domain controls output location)
         log_technical_detail("[ACCOUNTS-ORCHESTRATION] Beginning CSV export")
-        export_accounts(root_node, mapping, output_dir)
-        
-        # Domain module determines its own output path using payload output_dir
-        output_path = os.path.join(output_dir, "accounts.csv")
+        with timed_stage('ACCOUNTS-PIPELINE', 'export_csv') as export_counts:
+            csv_result = export_accounts(root_node, mapping, output_dir, resolution)
+            export_counts.update(bytes=csv_result.size, changed=int(csv_result.changed))
         
-        # Self-report success with output verification
-        if os.path.exists(output_path):
-            file_size = os.path.getsize(output_path)
-            log_user_info(f"[ACCOUNTS-PIPELINE] Generated output file: {output_path} ({file_size} bytes)")
+        # Self-report success from the committed output (written atomically, hash-compared)
+        if csv_result.changed:
+            log_user_info(f"[ACCOUNTS-PIPELINE] Generated output file: {csv_result.path} ({csv_result.size} bytes)")
         else:
-            log_user_error(f"[ACCOUNTS-ORCHESTRATION] Pipeline coordination failed: Expected output file not created: {output_path}")
-            raise OutputWriteError(f"Output file not created: {output_path}")
+            log_user_info(f"[ACCOUNTS-PIPELINE] Output file unchanged since last run, re-import not needed: {csv_result.path}")
+        
+        # Step 6: Optional export backends requested by the run configuration
+        for export_format in payload.get('extra_config', {}).get('export_formats', ()):
+            if export_format == 'csv':
+                continue
+            backend = ADDITIONAL_EXPORT_BACKENDS.get(export_format)
+            if backend is None:
+                logging.warning(f"[ACCOUNTS-PIPELINE] Unknown export format '{export_format}' ignored")
+                continue
+            book_result = backend(root_node, mapping, output_dir, resolution)
+            if book_result.changed:
+                log_user_info(f"[ACCOUNTS-PIPELINE] Generated output file: {book_result.path} ({book_result.size} bytes)")
+            else:
+                log_user_info(f"[ACCOUNTS-PIPELINE] Output file unchanged since last run, re-import not needed: {book_result.path}")
             
         log_user_info(f"[ACCOUNTS-PIPELINE] Accounts processing completed successfully")
         return True  # Boolean success indication
@@ -5,108 +5,113 @@ UPDATED: Cross-platform path handling per Priority 1 decisions.
 
 import csv
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from utils.error_handler import OutputWriteError
-from utils.logging import logging
+from utils.logging import logging, log_technical_lazy
+from utils.output_writer import AtomicOutputFile, OutputWriteResult
 
+from .accounts_mapping import MappingResolution, compile_mapping_resolution
 from .accounts_tree import AccountNode
 
-def _flatten_tree(node: AccountNode, mapping: Dict[str, Any]) -> List[Dict[str, str]]:
-    """Convert account tree to flat list of GnuCash accounts.
+# Exact GnuCash column headers, in CSV order
+GNUCASH_ACCOUNT_COLUMNS = (
+    'Type', 'Full Account Name', 'Account Name', 'Account Code',
+    'Description', 'Account Color', 'Notes', 'Symbol', 'Namespace',
+    'Hidden', 'Tax Info', 'Placeholder'
+)
+
+# Fundamental accounting types are always exported as placeholders
+FUNDAMENTAL_TYPES = frozenset({'Assets', 'Liabilities', 'Equity', 'Income', 'Expenses'})
+
+def _iter_account_rows(node: AccountNode, mapping: Dict[str, Any],
+                       resolution: Optional[MappingResolution] = None) -> Iterator[Tuple[str, ...]]:
+    """Yield GnuCash CSV rows for the account tree in depth-first order.
+    
+    The tree is walked with an explicit stack, so only the pending siblings are held
+    in memory and deep hierarchies cannot hit the recursion limit.
     
     Args:
         node: Root node of account tree
         mapping: Account mapping configuration
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
         
-    Returns:
-        List of dicts with GnuCash account fields matching expected CSV format
+    Yields:
+        Tuples of field values in GNUCASH_ACCOUNT_COLUMNS order
     """
-    accounts = []
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
+    commodity = resolution.default_commodity
     
-    def _process_node(node: AccountNode) -> None:
-        if node.name != "Root":
-            # Use the account's actual type as determined by the tree building process
-            gnc_type = node.type
-            
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.name != "Root":
             # Remove "Root:" prefix from full_name for GnuCash compatibility
-            clean_full_name = node.full_name
-            if clean_full_name.startswith("Root:"):
-                clean_full_name = clean_full_name[5:]  # Remove "Root:" prefix
-            
-            # Determine if this should be a placeholder account
-            is_placeholder = 'F'  # Default to not placeholder
+            full_name = current.full_name
+            if full_name.startswith("Root:"):
+                full_name = full_name[5:]
             
-            # Fundamental accounting types should always be placeholders
-            fundamental_types = {'Assets', 'Liabilities', 'Equity', 'Income', 'Expenses'}
-            if node.name in fundamental_types:
-                is_placeholder = 'T'
-                logging.debug(f"Set placeholder=T for fundamental accounting type: {node.name}")
+            # Fundamental types are placeholders; otherwise keep the source status
+            if current.name in FUNDAMENTAL_TYPES:
+                placeholder = 'T'
             else:
-                # Use original placeholder status from source, or default to F
-                is_placeholder = node.original_placeholder or 'F'
+                placeholder = current.original_placeholder or 'F'
             
-            # Create account record matching GnuCash CSV format exactly
-            account = {
-                'Type': gnc_type,
-                'Full Account Name': clean_full_name,
-                'Account Name': node.name,
-                'Account Code': node.account_code,
-                'Description': node.original_description,  # Preserved from source IIF
-                'Account Color': node.original_color,      # Preserved from source IIF
-                'Notes': node.original_notes,              # Preserved from source IIF
-                'Symbol': mapping.get('default_commodity', 'USD'),
-                'Namespace': 'CURRENCY',
-                'Hidden': node.original_hidden or 'F',     # Use source or default
-                'Tax Info': node.original_tax_info,        # Preserved from source IIF
-                'Placeholder': is_placeholder              # Smart placeholder logic
-            }
-            accounts.append(account)
-            
-            logging.debug(f"Exported account '{node.name}' as type '{gnc_type}' with full name '{clean_full_name}'")
+            yield (
+                current.type,                      # Type as determined by tree building
+                full_name,
+                current.name,
+                current.account_code,
+                current.original_description,      # Preserved from source IIF
+                current.original_color,            # Preserved from source IIF
+                current.original_notes,            # Preserved from source IIF
+                commodity,
+                'CURRENCY',
+                current.original_hidden or 'F',    # Use source or default
+                current.original_tax_info,         # Preserved from source IIF
+                placeholder
+            )
         
-        # Process children
-        for child in node.children:
-            _process_node(child)
-    
-    _process_node(node)
-    return accounts
+        # Push children reversed so they are emitted in their original order
+        stack.extend(reversed(current.children))
 
-def export_accounts(root: AccountNode, mapping: Dict[str, Any], output_dir: str = "output") -> None:
+def export_accounts(root: AccountNode, mapping: Dict[str, Any], output_dir: str = "output",
+                    resolution: Optional[MappingResolution] = None) -> OutputWriteResult:
     """Export account hierarchy to GnuCash CSV format.
     
+    The CSV is written to a temporary file and atomically renamed into place; when
+    its content hash matches the previous run the existing file is kept as is.
+    
     Args:
         root: Root node of account tree
         mapping: Account mapping configuration
         output_dir: Directory for output file (from payload)
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+        
+    Returns:
+        OutputWriteResult with the path, content hash, size and whether the file changed
         
     Raises:
         ExportError: If export fails
     """
+    # Domain module controls output location - FIXED: Use payload output_dir
+    output_path = os.path.join(output_dir, "accounts.csv")
     try:
-        # Convert tree to flat GnuCash format
-        accounts = _flatten_tree(root, mapping)
-        
-        # Domain module controls output location - FIXED: Use payload output_dir
-        output_path = os.path.join(output_dir, "accounts.csv")
-        
-        # Ensure output directory exists
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Write CSV file with exact GnuCash column headers
-        fieldnames = [
-            'Type', 'Full Account Name', 'Account Name', 'Account Code', 
-            'Description', 'Account Color', 'Notes', 'Symbol', 'Namespace', 
-            'Hidden', 'Tax Info', 'Placeholder'
-        ]
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(accounts)
+        # Stream rows straight from the tree walk into a hashed, atomically committed file
+        with AtomicOutputFile(output_path) as f:
+            writer = csv.writer(f)
+            writer.writerow(GNUCASH_ACCOUNT_COLUMNS)
+            row_count = 0
+            for row in _iter_account_rows(root, mapping, resolution):
+                writer.writerow(row)
+                row_count += 1
         
-        logging.info(f"[EXPORT] Exported {len(accounts)} accounts to GnuCash-compatible CSV format")
-        logging.debug(f"[EXPORT] Output file: {output_path} with {len(fieldnames)} columns")
+        logging.info(f"[EXPORT] Exported {row_count} accounts to GnuCash-compatible CSV format")
+        log_technical_lazy("[EXPORT] Output file: %s with %d columns (sha256 %s, %s)",
+                           output_path, len(GNUCASH_ACCOUNT_COLUMNS), f.result.digest[:12],
+                           'updated' if f.result.changed else 'unchanged')
+        return f.result
         
     except (IOError, PermissionError, OSError) as e:
         raise OutputWriteError(f"Failed to write accounts CSV to {output_path}: {str(e)}")
@@ -0,0 +1,182 @@
+"""Account export straight into a GnuCash SQLite book.
+
+Writes the account tree into a new file using the GnuCash SQL schema (books,
+commodities, accounts, slots plus empty transactions/splits tables), so the
+book opens directly in GnuCash without the CSV import assistant. All rows are
+inserted with batched executemany calls inside a single transaction.
+
+Account GUIDs are derived from the account full name (uuid5), so re-exporting
+an unchanged tree produces the same GUIDs.
+"""
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.error_handler import OutputWriteError
+from utils.gnucash_book import CURRENCY_FRACTION, book_flag, book_guid
+from utils.logging import logging, log_technical_detail
+from utils.output_writer import OutputWriteResult, commit_output
+
+from .accounts_export import FUNDAMENTAL_TYPES
+from .accounts_mapping import MappingResolution, compile_mapping_resolution
+from .accounts_tree import AccountNode
+
+SQLITE_BOOK_FILENAME = "accounts.gnucash"
+
+# Rows per executemany batch
+SQLITE_BATCH_SIZE = 5000
+
+# GnuCash KVP slot type for string values
+_SLOT_TYPE_STRING = 4
+
+_SCHEMA = (
+    "CREATE TABLE gnclock (hostname varchar(255), pid int)",
+    "CREATE TABLE versions (table_name text(50) PRIMARY KEY NOT NULL, table_version integer NOT NULL)",
+    "CREATE TABLE books (guid text(32) PRIMARY KEY NOT NULL, root_account_guid text(32) NOT NULL, "
+    "root_template_guid text(32) NOT NULL)",
+    "CREATE TABLE commodities (guid text(32) PRIMARY KEY NOT NULL, namespace text(2048) NOT NULL, "
+    "mnemonic text(2048) NOT NULL, fullname text(2048), cusip text(2048), fraction integer NOT NULL, "
+    "quote_flag integer NOT NULL, quote_source text(2048), quote_tz text(2048))",
+    "CREATE TABLE accounts (guid text(32) PRIMARY KEY NOT NULL, name text(2048) NOT NULL, "
+    "account_type text(2048) NOT NULL, commodity_guid text(32), commodity_scu integer NOT NULL, "
+    "non_std_scu integer NOT NULL, parent_guid text(32), code text(2048), description text(2048), "
+    "hidden integer, placeholder integer)",
+    "CREATE TABLE slots (id integer PRIMARY KEY AUTOINCREMENT NOT NULL, obj_guid text(32) NOT NULL, "
+    "name text(4096) NOT NULL, slot_type integer NOT NULL, int64_val bigint, string_val text(4096), "
+    "double_val float8, timespec_val text(19), guid_val text(32), numeric_val_num bigint, "
+    "numeric_val_denom bigint, gdate_val text(8))",
+    "CREATE INDEX slots_guid_index ON slots (obj_guid)",
+    "CREATE TABLE transactions (guid text(32) PRIMARY KEY NOT NULL, currency_guid text(32) NOT NULL, "
+    "num text(2048) NOT NULL, post_date text(19), enter_date text(19), description text(2048))",
+    "CREATE INDEX tx_post_date_index ON transactions (post_date)",
+    "CREATE TABLE splits (guid text(32) PRIMARY KEY NOT NULL, tx_guid text(32) NOT NULL, "
+    "account_guid text(32) NOT NULL, memo text(2048) NOT NULL, action text(2048) NOT NULL, "
+    "reconcile_state text(1) NOT NULL, reconcile_date text(19), value_num bigint NOT NULL, "
+    "value_denom bigint NOT NULL, quantity_num bigint NOT NULL, quantity_denom bigint NOT NULL, "
+    "lot_guid text(32))",
+    "CREATE INDEX splits_tx_guid_index ON splits (tx_guid)",
+    "CREATE INDEX splits_account_guid_index ON splits (account_guid)",
+)
+
+_TABLE_VERSIONS = (
+    ('Gnucash', 4000000), ('Gnucash-Resave', 19920),
+    ('books', 1), ('commodities', 1), ('accounts', 1), ('slots', 4),
+    ('transactions', 4), ('splits', 5),
+)
+
+_INSERT_ACCOUNT = ("INSERT INTO accounts (guid, name, account_type, commodity_guid, commodity_scu, non_std_scu, "
+                   "parent_guid, code, description, hidden, placeholder) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_INSERT_SLOT = "INSERT INTO slots (obj_guid, name, slot_type, string_val) VALUES (?, ?, ?, ?)"
+
+def _iter_account_rows(root: AccountNode, root_guid: str,
+                       commodity_guid: str) -> Iterator[Tuple[tuple, List[tuple]]]:
+    """Yield (account row, slot rows) for every account below the root, parents first."""
+    stack = [(child, root_guid) for child in reversed(root.children)]
+    while stack:
+        node, parent_guid = stack.pop()
+        full_name = node.full_name[5:] if node.full_name.startswith("Root:") else node.full_name
+        guid = book_guid('account', full_name)
+        placeholder = node.name in FUNDAMENTAL_TYPES or book_flag(node.original_placeholder)
+        row = (guid, node.name, node.type, commodity_guid, CURRENCY_FRACTION, 0, parent_guid,
+               node.account_code, node.original_description,
+               int(book_flag(node.original_hidden)), int(placeholder))
+        slots = []
+        if node.original_notes:
+            slots.append((guid, 'notes', _SLOT_TYPE_STRING, node.original_notes))
+        if node.original_color:
+            slots.append((guid, 'color', _SLOT_TYPE_STRING, node.original_color))
+        yield row, slots
+        stack.extend((child, guid) for child in reversed(node.children))
+
+def export_accounts_sqlite(root: AccountNode, mapping: Dict[str, Any], output_dir: str = "output",
+                           resolution: Optional[MappingResolution] = None) -> OutputWriteResult:
+    """Write the account hierarchy as a new GnuCash SQLite book.
+
+    The book is built in a temporary file next to the target and renamed into
+    place once the transaction has committed, unless its content is unchanged.
+
+    Args:
+        root: Root node of account tree
+        mapping: Account mapping configuration
+        output_dir: Directory for output file (from payload)
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+
+    Returns:
+        OutputWriteResult for the book (unchanged books are not replaced)
+
+    Raises:
+        OutputWriteError: If the book cannot be written
+    """
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
+    currency = resolution.default_commodity
+
+    output_path = os.path.join(output_dir, SQLITE_BOOK_FILENAME)
+    temp_path = output_path + ".tmp"
+
+    commodity_guid = book_guid('commodity', f"CURRENCY::{currency}")
+    # Roots get their own key space so no account full name can collide with them
+    root_guid = book_guid('root', 'account')
+    template_guid = book_guid('root', 'template')
+
+    connection = None
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        # No implicit driver transactions; the whole book is written in one explicit transaction
+        connection = sqlite3.connect(temp_path, isolation_level=None)
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("BEGIN")
+
+        for statement in _SCHEMA:
+            cursor.execute(statement)
+        cursor.executemany("INSERT INTO versions (table_name, table_version) VALUES (?, ?)", _TABLE_VERSIONS)
+        cursor.execute("INSERT INTO commodities (guid, namespace, mnemonic, fullname, cusip, fraction, quote_flag, "
+                       "quote_source, quote_tz) VALUES (?, 'CURRENCY', ?, ?, '', ?, 1, 'currency', '')",
+                       (commodity_guid, currency, currency, CURRENCY_FRACTION))
+        cursor.execute("INSERT INTO books (guid, root_account_guid, root_template_guid) VALUES (?, ?, ?)",
+                       (book_guid('book', 'book'), root_guid, template_guid))
+        cursor.executemany(_INSERT_ACCOUNT, [
+            (root_guid, 'Root Account', 'ROOT', commodity_guid, CURRENCY_FRACTION, 0, None, '', '', 0, 0),
+            (template_guid, 'Template Root', 'ROOT', None, 0, 0, None, '', '', 0, 0),
+        ])
+
+        account_count = 0
+        account_batch: List[tuple] = []
+        slot_batch: List[tuple] = []
+        for row, slots in _iter_account_rows(root, root_guid, commodity_guid):
+            account_batch.append(row)
+            slot_batch.extend(slots)
+            if len(account_batch) >= SQLITE_BATCH_SIZE:
+                cursor.executemany(_INSERT_ACCOUNT, account_batch)
+                cursor.executemany(_INSERT_SLOT, slot_batch)
+                account_count += len(account_batch)
+                account_batch.clear()
+                slot_batch.clear()
+        if account_batch:
+            cursor.executemany(_INSERT_ACCOUNT, account_batch)
+            account_count += len(account_batch)
+        if slot_batch:
+            cursor.executemany(_INSERT_SLOT, slot_batch)
+
+        cursor.execute("COMMIT")
+        connection.close()
+        connection = None
+        result = commit_output(temp_path, output_path)
+
+        logging.info(f"[EXPORT] Exported {account_count} accounts to GnuCash SQLite book")
+        log_technical_detail(f"[EXPORT] SQLite book: {output_path} (currency {currency})")
+        return result
+
+    except (sqlite3.Error, OSError) as e:
+        raise OutputWriteError(f"Failed to write GnuCash SQLite book to {output_path}: {str(e)}")
+    finally:
+        if connection is not None:
+            connection.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,88 @@
+"""Account export as a streaming gzip-compressed GnuCash XML book.
+
+The account tree is written element by element through GnuCashXmlBookWriter,
+so no DOM is built and memory does not grow with the number of accounts. The
+resulting file opens directly in GnuCash without the CSV import assistant.
+Account GUIDs match the SQLite backend (uuid5 of the full name).
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from utils.error_handler import OutputWriteError
+from utils.gnucash_book import GnuCashXmlBookWriter, book_flag, book_guid
+from utils.logging import logging, log_technical_detail
+from utils.output_writer import OutputWriteResult, commit_output
+
+from .accounts_export import FUNDAMENTAL_TYPES
+from .accounts_mapping import MappingResolution, compile_mapping_resolution
+from .accounts_tree import AccountNode
+
+XML_BOOK_FILENAME = "accounts.xml.gnucash"
+
+def _count_accounts(root: AccountNode) -> int:
+    """Count the accounts below the root without materializing them."""
+    count = 0
+    stack = list(root.children)
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+def export_accounts_xml(root: AccountNode, mapping: Dict[str, Any], output_dir: str = "output",
+                        resolution: Optional[MappingResolution] = None) -> OutputWriteResult:
+    """Write the account hierarchy as a gzip-compressed GnuCash XML book.
+
+    Args:
+        root: Root node of account tree
+        mapping: Account mapping configuration
+        output_dir: Directory for output file (from payload)
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+
+    Returns:
+        OutputWriteResult for the book (unchanged books are not replaced)
+
+    Raises:
+        OutputWriteError: If the book cannot be written
+    """
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
+    currency = resolution.default_commodity
+
+    output_path = os.path.join(output_dir, XML_BOOK_FILENAME)
+    temp_path = output_path + ".tmp"
+    # Same root GUID as the SQLite backend, outside the account full-name key space
+    root_guid = book_guid('root', 'account')
+
+    try:
+        # Root account plus every account in the tree
+        account_count = _count_accounts(root) + 1
+        with GnuCashXmlBookWriter(temp_path, currency, account_count=account_count) as book:
+            book.write_account(root_guid, 'Root Account', 'ROOT')
+
+            stack = [(child, root_guid) for child in reversed(root.children)]
+            while stack:
+                node, parent_guid = stack.pop()
+                full_name = node.full_name[5:] if node.full_name.startswith("Root:") else node.full_name
+                guid = book_guid('account', full_name)
+                placeholder = node.name in FUNDAMENTAL_TYPES or book_flag(node.original_placeholder)
+                book.write_account(guid, node.name, node.type, parent_guid,
+                                   code=node.account_code,
+                                   description=node.original_description,
+                                   hidden=book_flag(node.original_hidden),
+                                   placeholder=placeholder,
+                                   notes=node.original_notes,
+                                   color=node.original_color)
+                stack.extend((child, guid) for child in reversed(node.children))
+
+        result = commit_output(temp_path, output_path)
+
+        logging.info(f"[EXPORT] Exported {book.accounts_written - 1} accounts to gzip GnuCash XML book")
+        log_technical_detail(f"[EXPORT] XML book: {output_path} (currency {currency})")
+        return result
+
+    except OSError as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise OutputWriteError(f"Failed to write GnuCash XML book to {output_path}: {str(e)}")
@@ -3,13 +3,195 @@
 UPDATED: Cross-platform path handling and embedded schema validation per Priority 1 decisions.
 """
 
+import hashlib
 import json
 import os
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
 
 from utils.error_handler import MappingLoadError, OutputWriteError
 from utils.logging import logging
 
+from .accounts_rules import compile_account_rules, validate_rule_matchers
+
+class ResolvedAccountType(NamedTuple):
+    """Fully resolved placement of one QBD account type."""
+    gnucash_type: str
+    destination_hierarchy: str
+    hierarchy_parts: Tuple[str, ...]     # destination_hierarchy split on ':'
+    hierarchy_prefixes: Tuple[str, ...]  # 'Assets', 'Assets:Current Assets', ...
+    placeholder: bool
+    mapped: bool                         # False when resolved through default_rules fallback
+
+def _resolve_entry(config: Dict[str, Any], mapped: bool) -> ResolvedAccountType:
+    """Build a resolved entry from an account_types or default_rules object."""
+    destination_hierarchy = config.get('destination_hierarchy', 'Expenses')
+    parts = tuple(destination_hierarchy.split(':'))
+    prefixes = tuple(':'.join(parts[:i + 1]) for i in range(len(parts)))
+    return ResolvedAccountType(config.get('gnucash_type', 'EXPENSE'), destination_hierarchy,
+                               parts, prefixes, bool(config.get('placeholder', False)), mapped)
+
+class MappingResolution:
+    """Merged mapping compiled into a qbd_type -> ResolvedAccountType lookup table.
+
+    Built once per run and shared by the tree builder, validation and export so
+    per-account loops do a single dict lookup instead of nested .get() chains.
+    Pattern-based account_rules are compiled alongside and take precedence over
+    the per-type table when they match an account.
+    """
+
+    def __init__(self, mapping: Dict[str, Any]):
+        self.types: Dict[str, ResolvedAccountType] = {
+            qbd_type: _resolve_entry(config, True)
+            for qbd_type, config in mapping.get('account_types', {}).items()
+        }
+        fallback_rule = mapping.get('default_rules', {}).get('unmapped_accounts', {})
+        if not isinstance(fallback_rule, dict):
+            fallback_rule = {}
+        self.fallback = _resolve_entry(fallback_rule, False)
+        self.default_commodity = mapping.get('default_commodity', 'USD')
+        
+        account_rules = mapping.get('account_rules', [])
+        self.rules = compile_account_rules(account_rules)
+        self.rule_targets = [_resolve_entry(rule, True) for rule in account_rules]
+
+    def resolve(self, qbd_type: str) -> ResolvedAccountType:
+        """Return the placement for a QBD account type, falling back to default_rules."""
+        return self.types.get(qbd_type, self.fallback)
+
+    def resolve_account(self, account: Dict[str, str]) -> ResolvedAccountType:
+        """Return the placement for one account record, applying account_rules first."""
+        qbd_type = account['ACCNTTYPE']
+        if self.rule_targets:
+            rule_index = self.rules.match(qbd_type, account['NAME'], account.get('ACCNUM', ''))
+            if rule_index is not None:
+                return self.rule_targets[rule_index]
+        return self.types.get(qbd_type, self.fallback)
+
+    def unmapped_types(self, qbd_types: Iterable[str]) -> List[str]:
+        """Return the sorted QBD account types that have no explicit mapping."""
+        return sorted(set(qbd_types).difference(self.types))
+
+    def unmapped_record_types(self, records: Iterable[Dict[str, Any]]) -> List[str]:
+        """Return the sorted QBD account types of records matched by neither a type mapping nor a rule."""
+        if not self.rule_targets:
+            return self.unmapped_types(record.get('ACCNTTYPE', '') for record in records)
+        unmapped = set()
+        for record in records:
+            qbd_type = record.get('ACCNTTYPE', '')
+            if qbd_type in self.types or qbd_type in unmapped:
+                continue
+            if self.rules.match(qbd_type, record.get('NAME', ''), record.get('ACCNUM', '')) is None:
+                unmapped.add(qbd_type)
+        return sorted(unmapped)
+
+def compile_mapping_resolution(mapping: Dict[str, Any]) -> MappingResolution:
+    """Compile a merged mapping configuration into its resolution table.
+    
+    Args:
+        mapping: Merged account mapping configuration from load_mapping()
+        
+    Returns:
+        MappingResolution with fallback rules and hierarchy splits precomputed
+    """
+    resolution = MappingResolution(mapping)
+    logging.debug(f"[ACCOUNTS-MAPPING] Compiled mapping resolution table: {len(resolution.types)} types, {resolution.rules.rule_count} rules, "
+                  f"fallback -> {resolution.fallback.gnucash_type} at {resolution.fallback.destination_hierarchy}")
+    return resolution
+
+# Embedded schema for mapping validation (compiled into the lookups below once at import)
+MAPPING_SCHEMA = {
+    "type": "object",
+    "required": ["account_types", "default_rules"],
+    "properties": {
+        "account_types": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["gnucash_type", "destination_hierarchy"],
+                "properties": {
+                    "gnucash_type": {
+                        "type": "string",
+                        "enum": ["ASSET", "LIABILITY", "EQUITY", "INCOME", "EXPENSE", 
+                               "RECEIVABLE", "PAYABLE", "CASH", "BANK", "STOCK", 
+                               "MUTUAL", "CREDIT", "ROOT", "TRADING"]
+                    },
+                    "destination_hierarchy": {
+                        "type": "string",
+                        "minLength": 1,
+                        "pattern": "^[^:]*(?::[^:]+)*$"  # Valid hierarchy format
+                    }
+                },
+                "additionalProperties": False
+            }
+        },
+        "default_rules": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "string"
+            }
+        }
+    },
+    "additionalProperties": True  # Allow metadata fields
+}
+
+_ACCOUNT_TYPE_SCHEMA = MAPPING_SCHEMA["properties"]["account_types"]["additionalProperties"]
+_REQUIRED_TOP_LEVEL = tuple(MAPPING_SCHEMA["required"])
+_REQUIRED_TYPE_FIELDS = tuple(_ACCOUNT_TYPE_SCHEMA["required"])
+_VALID_GNUCASH_TYPES = frozenset(_ACCOUNT_TYPE_SCHEMA["properties"]["gnucash_type"]["enum"])
+_SORTED_GNUCASH_TYPES = sorted(_VALID_GNUCASH_TYPES)
+
+# Characters not allowed in destination hierarchies, reported in this order
+_INVALID_HIERARCHY_CHARS = '/\\<>|"*?'
+_INVALID_HIERARCHY_CHARS_RE = re.compile('[' + re.escape(_INVALID_HIERARCHY_CHARS) + ']')
+
+def _validate_placement(config: Dict[str, Any], label: str, file_path: str) -> List[str]:
+    """Validate the gnucash_type/destination_hierarchy fields of one mapping entry.
+    
+    Args:
+        config: account_types entry or account_rules object
+        label: Entry label for messages (e.g. "Account type 'BANK'")
+        file_path: File path for error reporting
+        
+    Returns:
+        List of validation error messages (empty if valid)
+    """
+    errors = []
+    
+    # Check required fields
+    for required_field in _REQUIRED_TYPE_FIELDS:
+        if required_field not in config:
+            errors.append(f"{file_path}: {label} missing required field '{required_field}'")
+        elif not isinstance(config[required_field], str):
+            errors.append(f"{file_path}: {label} field '{required_field}' must be a string")
+        elif not config[required_field].strip():
+            errors.append(f"{file_path}: {label} field '{required_field}' cannot be empty")
+    
+    # Validate gnucash_type enum
+    gnucash_type = config.get("gnucash_type", "")
+    if isinstance(gnucash_type, str):
+        gnucash_type = gnucash_type.upper()
+        if gnucash_type and gnucash_type not in _VALID_GNUCASH_TYPES:
+            errors.append(f"{file_path}: {label} has invalid gnucash_type '{gnucash_type}'. Valid types: {_SORTED_GNUCASH_TYPES}")
+    
+    # Validate hierarchy format
+    hierarchy = config.get("destination_hierarchy", "")
+    if hierarchy and isinstance(hierarchy, str):
+        # Check for invalid characters with a single regex scan
+        found_chars = set(_INVALID_HIERARCHY_CHARS_RE.findall(hierarchy))
+        if found_chars:
+            for char in _INVALID_HIERARCHY_CHARS:
+                if char in found_chars:
+                    errors.append(f"{file_path}: {label} hierarchy contains invalid character '{char}'")
+
+        # Check for double colons or starting/ending colons
+        if '::' in hierarchy:
+            errors.append(f"{file_path}: {label} hierarchy contains double colons '::'")
+        if hierarchy.startswith(':') or hierarchy.endswith(':'):
+            errors.append(f"{file_path}: {label} hierarchy cannot start or end with ':'")
+    
+    return errors
+
 def validate_mapping_schema(mapping_data: Dict[str, Any], file_path: str) -> List[str]:
     """Validate mapping data against embedded schema.
     
@@ -22,49 +204,13 @@ def validate_mapping_schema(mapping_data: Dict[str, Any], file_path: str) -> Lis
     """
     errors = []
     
-    # Define embedded schema for validation
-    MAPPING_SCHEMA = {
-        "type": "object",
-        "required": ["account_types", "default_rules"],
-        "properties": {
-            "account_types": {
-                "type": "object",
-                "additionalProperties": {
-                    "type": "object",
-                    "required": ["gnucash_type", "destination_hierarchy"],
-                    "properties": {
-                        "gnucash_type": {
-                            "type": "string",
-                            "enum": ["ASSET", "LIABILITY", "EQUITY", "INCOME", "EXPENSE", 
-                                   "RECEIVABLE", "PAYABLE", "CASH", "BANK", "STOCK", 
-                                   "MUTUAL", "CREDIT", "ROOT", "TRADING"]
-                        },
-                        "destination_hierarchy": {
-                            "type": "string",
-                            "minLength": 1,
-                            "pattern": "^[^:]*(?::[^:]+)*$"  # Valid hierarchy format
-                        }
-                    },
-                    "additionalProperties": False
-                }
-            },
-            "default_rules": {
-                "type": "object",
-                "additionalProperties": {
-                    "type": "string"
-                }
-            }
-        },
-        "additionalProperties": True  # Allow metadata fields
-    }
-    
     # Validate top-level structure
     if not isinstance(mapping_data, dict):
         errors.append(f"{file_path}: Root must be a JSON object")
         return errors
     
     # Check required fields
-    for field in MAPPING_SCHEMA["required"]:
+    for field in _REQUIRED_TOP_LEVEL:
         if field not in mapping_data:
             errors.append(f"{file_path}: Missing required field '{field}'")
     
@@ -73,41 +219,25 @@ def validate_mapping_schema(mapping_data: Dict[str, Any], file_path: str) -> Lis
     if not isinstance(account_types, dict):
         errors.append(f"{file_path}: 'account_types' must be an object")
     else:
-        valid_gnucash_types = set(MAPPING_SCHEMA["properties"]["account_types"]["additionalProperties"]["properties"]["gnucash_type"]["enum"])
-        
         for qbd_type, config in account_types.items():
             if not isinstance(config, dict):
                 errors.append(f"{file_path}: Account type '{qbd_type}' must be an object")
                 continue
             
-            # Check required fields for each account type
-            for required_field in ["gnucash_type", "destination_hierarchy"]:
-                if required_field not in config:
-                    errors.append(f"{file_path}: Account type '{qbd_type}' missing required field '{required_field}'")
-                elif not isinstance(config[required_field], str):
-                    errors.append(f"{file_path}: Account type '{qbd_type}' field '{required_field}' must be a string")
-                elif not config[required_field].strip():
-                    errors.append(f"{file_path}: Account type '{qbd_type}' field '{required_field}' cannot be empty")
-            
-            # Validate gnucash_type enum
-            gnucash_type = config.get("gnucash_type", "").upper()
-            if gnucash_type and gnucash_type not in valid_gnucash_types:
-                errors.append(f"{file_path}: Account type '{qbd_type}' has invalid gnucash_type '{gnucash_type}'. Valid types: {sorted(valid_gnucash_types)}")
-            
-            # Validate hierarchy format
-            hierarchy = config.get("destination_hierarchy", "")
-            if hierarchy:
-                # Check for invalid characters
-                invalid_chars = ['/', '\\', '<', '>', '|', '"', '*', '?']
-                for char in invalid_chars:
-                    if char in hierarchy:
-                        errors.append(f"{file_path}: Account type '{qbd_type}' hierarchy contains invalid character '{char}'")
-                
-                # Check for double colons or starting/ending colons
-                if '::' in hierarchy:
-                    errors.append(f"{file_path}: Account type '{qbd_type}' hierarchy contains double colons '::'")
-                if hierarchy.startswith(':') or hierarchy.endswith(':'):
-                    errors.append(f"{file_path}: Account type '{qbd_type}' hierarchy cannot start or end with ':'")
+            errors.extend(_validate_placement(config, f"Account type '{qbd_type}'", file_path))
+    
+    # Validate optional pattern-based account_rules
+    account_rules = mapping_data.get("account_rules", [])
+    if not isinstance(account_rules, list):
+        errors.append(f"{file_path}: 'account_rules' must be a list")
+    else:
+        for position, rule in enumerate(account_rules, 1):
+            label = f"Account rule #{position}"
+            if not isinstance(rule, dict):
+                errors.append(f"{file_path}: {label} must be an object")
+                continue
+            errors.extend(_validate_placement(rule, label, file_path))
+            errors.extend(validate_rule_matchers(rule, label, file_path))
     
     # Validate default_rules structure
     default_rules = mapping_data.get("default_rules", {})
@@ -134,58 +264,25 @@ def validate_mapping_schema(mapping_data: Dict[str, Any], file_path: str) -> Lis
     
     return errors
 
-def generate_text_mapping_questions(unmapped_accounts: List[str], records: List[Dict[str, Any]], output_dir: str) -> None:
-    """Generate user-friendly questions file for unmapped accounts with QBD path hints.
-    
-    Args:
-        unmapped_accounts: List of QBD accounts needing mapping
-        records: List of account records from QBD for path lookup
-        output_dir: Directory for output file
-        
-    Raises:
-        OutputWriteError: If questions file cannot be created
-    """
-    try:
-        # Use cross-platform path construction
-        questions_path = os.path.join(output_dir, "accounts_mapping_questions.txt")
-        instructions_path = os.path.join(output_dir, "accounts_mapping_instructions.txt")
-        
-        # Create clean questions file with QBD path hints
-        questions_content = "Where should these accounts go in GnuCash?\n\n"
-        
-        # Create lookup for QBD account data
-        qbd_accounts = {record.get('ACCNTTYPE', ''): record for record in records}
-        
-        for qbd_account in unmapped_accounts:
-            questions_content += f"[{qbd_account}]\n"
-            
-            # Add QBD path hint if available
-            if qbd_account in qbd_accounts:
-                record = qbd_accounts[qbd_account]
-                # Build QBD path from available fields
-                qbd_path_parts = []
-                if record.get('PARENT'):
-                    qbd_path_parts.append(record.get('PARENT'))
-                if record.get('NAME'):
-                    qbd_path_parts.append(record.get('NAME'))
-                
-                if qbd_path_parts:
-                    qbd_path = ':'.join(qbd_path_parts)
-                    questions_content += f"QuickBooks import path: {qbd_path}\n"
-            
-            questions_content += f"Enter the full GnuCash account path here: \n\n"
-        
-        # Add separator and minimal instructions
-        questions_content += """================================================================================
+# Separator between the editable questions and the trailing guidance
+QUESTIONS_SEPARATOR = "================================================================================"
+
+# Answer line written under every [ACCOUNT] block, and how many lines after the block it may appear
+ANSWER_PROMPT = "Enter the full GnuCash account path here"
+ANSWER_WINDOW = 2
+
+# Anything outside printable ASCII (32-126) on a line is rejected
+_NON_PRINTABLE_RE = re.compile(r'[^\x20-\x7e\n]')
+
+_QUESTIONS_FOOTER = QUESTIONS_SEPARATOR + """
 WARNING: ASCII only (A-Z, 0-9, basic punctuation). Special characters cause failure.
 REQUIREMENT: Must start with Assets | Liabilities | Equity | Income | Expenses
 
 Enter full account path using colons: "Income:Service Revenue:Labor"
 See accounts_mapping_instructions.txt for examples and detailed help.
 """
-        
-        # Create detailed instructions file
-        instructions_content = """DETAILED MAPPING INSTRUCTIONS FOR GNUCASH ACCOUNT CONVERSION
+
+_INSTRUCTIONS_CONTENT = """DETAILED MAPPING INSTRUCTIONS FOR GNUCASH ACCOUNT CONVERSION
 
 ABOUT THIS PROCESS:
 This maps QuickBooks accounts not in the baseline configuration.
@@ -229,15 +326,54 @@ COMPLETION CHECKLIST:
 
 Consult your QuickBooks Desktop Chart of Accounts for guidance.
 """
+
+def generate_text_mapping_questions(unmapped_accounts: List[str], records: List[Dict[str, Any]], output_dir: str) -> None:
+    """Generate user-friendly questions file for unmapped accounts with QBD path hints.
+    
+    Question blocks are streamed straight to the file so thousands of unmapped
+    entries cost linear time and constant memory.
+    
+    Args:
+        unmapped_accounts: List of QBD accounts needing mapping
+        records: List of account records from QBD for path lookup
+        output_dir: Directory for output file
+        
+    Raises:
+        OutputWriteError: If questions file cannot be created
+    """
+    try:
+        # Use cross-platform path construction
+        questions_path = os.path.join(output_dir, "accounts_mapping_questions.txt")
+        instructions_path = os.path.join(output_dir, "accounts_mapping_instructions.txt")
+        
+        # Create lookup for QBD account data
+        qbd_accounts = {record.get('ACCNTTYPE', ''): record for record in records}
         
-        # Write both files
         os.makedirs(output_dir, exist_ok=True)
         
+        # Create clean questions file with QBD path hints
         with open(questions_path, 'w', encoding='utf-8') as f:
-            f.write(questions_content)
+            f.write("Where should these accounts go in GnuCash?\n\n")
+            
+            for qbd_account in unmapped_accounts:
+                f.write(f"[{qbd_account}]\n")
+                
+                # Add QBD path hint if available
+                record = qbd_accounts.get(qbd_account)
+                if record is not None:
+                    # Build QBD path from available fields
+                    qbd_path = ':'.join(part for part in (record.get('PARENT'), record.get('NAME')) if part)
+                    if qbd_path:
+                        f.write(f"QuickBooks import path: {qbd_path}\n")
+                
+                f.write(f"{ANSWER_PROMPT}: \n\n")
             
+            # Add separator and minimal instructions
+            f.write(_QUESTIONS_FOOTER)
+        
+        # Create detailed instructions file
         with open(instructions_path, 'w', encoding='utf-8') as f:
-            f.write(instructions_content)
+            f.write(_INSTRUCTIONS_CONTENT)
         
         logging.info(f"[ACCOUNTS-UNMAPPED-PROCESSING] Generated questions file: accounts_mapping_questions.txt and accounts_mapping_instructions.txt")
         logging.info(f"[ACCOUNTS-UNMAPPED-PROCESSING] Edit the questions file and restart pipeline to continue")
@@ -292,68 +428,71 @@ def parse_text_mapping_file(questions_file_path: str) -> Dict[str, Any]:
         raise MappingLoadError(f"Questions file not found: {questions_file_path}")
     
     try:
-        # ASCII validation with immediate HALT on first non-ASCII detection
         with open(questions_file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Line-by-line ASCII scanning with immediate HALT
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            for char_pos, char in enumerate(line):
-                # Character range validation: printable characters (32-126)
-                if ord(char) < 32 or ord(char) > 126:
-                    logging.error(f"[ACCOUNTS-MAPPING] Non-ASCII characters detected in questions file - please re-edit using standard ASCII characters only")
-                    raise MappingLoadError(f"Non-ASCII character detected at line {line_num}, position {char_pos + 1}: '{char}' (ASCII {ord(char)}). Please use only standard ASCII characters.")
+        # ASCII validation with immediate HALT on first non-ASCII detection (single C-level scan)
+        invalid_char = _NON_PRINTABLE_RE.search(content)
+        if invalid_char:
+            offset = invalid_char.start()
+            char = invalid_char.group()
+            line_num = content.count('\n', 0, offset) + 1
+            char_pos = offset - (content.rfind('\n', 0, offset) + 1)
+            logging.error(f"[ACCOUNTS-MAPPING] Non-ASCII characters detected in questions file - please re-edit using standard ASCII characters only")
+            raise MappingLoadError(f"Non-ASCII character detected at line {line_num}, position {char_pos + 1}: '{char}' (ASCII {ord(char)}). Please use only standard ASCII characters.")
         
         account_mappings = {}
+        valid_categories = ['Assets', 'Liabilities', 'Equity', 'Income', 'Expenses']
         
-        # Split content into sections (before instructions)
-        if "================================================================================" in content:
-            questions_section = content.split("================================================================================")[0]
-        else:
-            questions_section = content
+        def add_mapping(qbd_account: str, full_path: str) -> None:
+            """Validate and record one completed account block."""
+            if not full_path:
+                return
+            
+            # Validate that path starts with one of the 5 fundamental accounting types
+            path_root = full_path.split(':')[0].strip()
+            if path_root not in valid_categories:
+                raise MappingLoadError(f"Account path '{full_path}' must start with one of: {', '.join(valid_categories)}")
+            
+            # Infer GnuCash type from full path
+            gnucash_type = infer_gnucash_type(full_path)
+            
+            account_mappings[qbd_account] = {
+                "gnucash_type": gnucash_type,
+                "destination_hierarchy": full_path
+            }
+            
+            logging.debug(f"[ACCOUNTS-UNMAPPED-PROCESSING] Parsed: {qbd_account} -> {gnucash_type} at {full_path}")
         
-        # Parse each account block with simplified format
-        i = 0
+        # Single pass over the lines: each [ACCOUNT] block is open for the next
+        # ANSWER_WINDOW lines, where the answer prompt may appear
+        open_blocks = []  # [qbd_account, lines_left, full_path]
         
-        while i < len(lines):
-            line = lines[i].strip()
+        for line in content.split('\n'):
+            stripped = line.strip()
+            
+            if open_blocks:
+                if stripped.startswith(ANSWER_PROMPT):
+                    path_parts = line.split(':', 1)
+                    if len(path_parts) == 2:
+                        # Normalize spaces around colons and strip whitespace
+                        full_path = path_parts[1].strip().replace(' : ', ':').replace(': ', ':').replace(' :', ':')
+                        for block in open_blocks:
+                            block[2] = full_path
+                for block in open_blocks:
+                    block[1] -= 1
+                while open_blocks and open_blocks[0][1] == 0:
+                    qbd_account, _, full_path = open_blocks.pop(0)
+                    add_mapping(qbd_account, full_path)
             
             # Look for account name line (contains brackets)
-            if line.startswith('[') and line.endswith(']'):
-                qbd_account = line[1:-1].strip()  # Remove brackets
-                
+            if stripped.startswith('[') and stripped.endswith(']'):
+                qbd_account = stripped[1:-1].strip()  # Remove brackets
                 if qbd_account:  # Valid account name
-                    # Look for full account path in next lines
-                    full_path = ""
-                    
-                    # Check next few lines for full account path
-                    for j in range(i + 1, min(i + 3, len(lines))):
-                        if lines[j].strip().startswith('Enter the full GnuCash account path here'):
-                            path_parts = lines[j].split(':', 1)
-                            if len(path_parts) == 2:
-                                # Normalize spaces around colons and strip whitespace
-                                full_path = path_parts[1].strip().replace(' : ', ':').replace(': ', ':').replace(' :', ':')
-                    
-                    if full_path:
-                        # Validate that path starts with one of the 5 fundamental accounting types
-                        valid_categories = ['Assets', 'Liabilities', 'Equity', 'Income', 'Expenses']
-                        path_root = full_path.split(':')[0].strip()
-                        
-                        if path_root not in valid_categories:
-                            raise MappingLoadError(f"Account path '{full_path}' must start with one of: {', '.join(valid_categories)}")
-                        
-                        # Infer GnuCash type from full path
-                        gnucash_type = infer_gnucash_type(full_path)
-                        
-                        account_mappings[qbd_account] = {
-                            "gnucash_type": gnucash_type,
-                            "destination_hierarchy": full_path
-                        }
-                        
-                        logging.debug(f"[ACCOUNTS-UNMAPPED-PROCESSING] Parsed: {qbd_account} -> {gnucash_type} at {full_path}")
-            
-            i += 1
+                    open_blocks.append([qbd_account, ANSWER_WINDOW, ""])
+        
+        for qbd_account, _, full_path in open_blocks:
+            add_mapping(qbd_account, full_path)
         
         if not account_mappings:
             raise MappingLoadError("No valid account mappings found in questions file. Please fill in the account names and full account paths.")
@@ -421,27 +560,76 @@ def is_questions_file_completed(questions_file_path: str) -> bool:
         True if file appears to have user input, False otherwise
     """
     try:
+        # Stream lines and stop at the first filled-in answer
         with open(questions_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Simple check: if file contains filled-in answers
-        lines = content.split('\n')
-        for line in lines:
-            # Look for completed account names or full paths
-            if (line.startswith('Enter the full GnuCash account path here') and 
-                ':' in line and line.split(':', 1)[1].strip()):
-                return True
+            for line in f:
+                # Look for completed account names or full paths
+                if (line.startswith(ANSWER_PROMPT) and 
+                    ':' in line and line.split(':', 1)[1].strip()):
+                    return True
         
         return False
         
     except Exception:
         return False
 
-def load_mapping(user_mapping_path: Optional[str] = None) -> Dict[str, Any]:
+# Compiled mapping cache: validated, merged configuration reused while inputs are unchanged.
+# Stored as plain JSON in output_dir: the folder is user-writable, so nothing loaded from it may run code
+MAPPING_CACHE_FILENAME = "accounts_mapping_cache.json"
+MAPPING_CACHE_VERSION = 3
+
+def _file_digest(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file, or 'absent' if it does not exist."""
+    if not os.path.exists(file_path):
+        return "absent"
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _mapping_cache_key(baseline_path: str, override_path: str) -> str:
+    """Build the cache key from the baseline and override file contents."""
+    return f"v{MAPPING_CACHE_VERSION}:{_file_digest(baseline_path)}:{_file_digest(override_path)}"
+
+def _load_cached_mapping(cache_path: str, cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached merged mapping if it was compiled from identical inputs."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (IOError, OSError, ValueError) as e:
+        logging.debug(f"[ACCOUNTS-MAPPING] Ignoring unreadable mapping cache {cache_path}: {str(e)}")
+        return None
+    if not isinstance(cached, dict) or cached.get('key') != cache_key:
+        logging.debug("[ACCOUNTS-MAPPING] Mapping cache is stale - recompiling configuration")
+        return None
+    mapping = cached.get('mapping')
+    if not isinstance(mapping, dict) or not isinstance(mapping.get('account_types'), dict):
+        logging.debug(f"[ACCOUNTS-MAPPING] Ignoring malformed mapping cache {cache_path}")
+        return None
+    return mapping
+
+def _save_cached_mapping(cache_path: str, cache_key: str, mapping: Dict[str, Any]) -> None:
+    """Store the validated, merged mapping for reuse on the next run."""
+    temp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': cache_key, 'mapping': mapping}, f, ensure_ascii=False)
+        os.replace(temp_path, cache_path)
+        logging.debug(f"[ACCOUNTS-MAPPING] Saved compiled mapping cache: {cache_path}")
+    except (IOError, OSError, TypeError, ValueError) as e:
+        # Cache is an optimization only - a failed write just means recompiling next run
+        logging.debug(f"[ACCOUNTS-MAPPING] Failed to save mapping cache {cache_path}: {str(e)}")
+
+def load_mapping(user_mapping_path: Optional[str] = None, output_dir: str = "output") -> Dict[str, Any]:
     """Load account mapping configuration with integrated text-based workflow.
     
     Args:
         user_mapping_path: Optional path to user override mapping file
+        output_dir: Directory holding the compiled mapping cache (from payload)
         
     Returns:
         Dict containing validated account mapping rules and settings
@@ -458,6 +646,20 @@ def load_mapping(user_mapping_path: Optional[str] = None) -> Dict[str, Any]:
         if not os.path.exists(baseline_path):
             raise MappingLoadError(f"Baseline mapping file not found: {baseline_path}")
         
+        questions_path = os.path.join("output", "accounts_mapping_questions.txt")
+        override_path = user_mapping_path or os.path.join("output", "accounts_mapping_specific.json")
+        
+        # Reuse the compiled configuration while baseline and override files are unchanged
+        # (a pending questions file always goes through the text workflow below)
+        cache_key = None
+        cache_path = os.path.join(output_dir, MAPPING_CACHE_FILENAME)
+        if not os.path.exists(questions_path):
+            cache_key = _mapping_cache_key(baseline_path, override_path)
+            cached_mapping = _load_cached_mapping(cache_path, cache_key)
+            if cached_mapping is not None:
+                logging.info(f"[ACCOUNTS-MAPPING] Account mapping configuration ready - {len(cached_mapping['account_types'])} types mapped and validated (cached)")
+                return cached_mapping
+        
         with open(baseline_path, 'r', encoding='utf-8') as f:
             mapping = json.load(f)
         
@@ -469,9 +671,6 @@ def load_mapping(user_mapping_path: Optional[str] = None) -> Dict[str, Any]:
         logging.info(f"[ACCOUNTS-MAPPING] Loaded and validated baseline mapping: {len(mapping.get('account_types', {}))} accounts")
         
         # Check for text-based mapping workflow (Priority 1)
-        questions_path = os.path.join("output", "accounts_mapping_questions.txt")
-        override_path = user_mapping_path or os.path.join("output", "accounts_mapping_specific.json")
-        
         if os.path.exists(questions_path):
             if is_questions_file_completed(questions_path):
                 try:
@@ -534,6 +733,11 @@ def load_mapping(user_mapping_path: Optional[str] = None) -> Dict[str, Any]:
                     override_count += len(specific['account_types'])
                     logging.info(f"[ACCOUNTS-MAPPING] Applied {len(specific['account_types'])} account type overrides")
                     
+                if specific.get('account_rules'):
+                    mapping.setdefault('account_rules', []).extend(specific['account_rules'])
+                    override_count += len(specific['account_rules'])
+                    logging.info(f"[ACCOUNTS-MAPPING] Applied {len(specific['account_rules'])} pattern-based account rules")
+                    
                 if 'default_rules' in specific:
                     mapping['default_rules'].update(specific['default_rules'])
                     override_count += len(specific['default_rules'])
@@ -554,36 +758,38 @@ def load_mapping(user_mapping_path: Optional[str] = None) -> Dict[str, Any]:
         logging.info("[ACCOUNTS-MAPPING] No user override file found - using baseline configuration")
         logging.debug(f"[ACCOUNTS-MAPPING] To customize mappings, create: {override_path}")
         
-        # Final validation of merged configuration
-        final_errors = validate_mapping_schema(mapping, "merged_configuration")
-        if final_errors:
-            raise MappingLoadError(f"Final merged configuration validation failed: {'; '.join(final_errors)}")
-        
+        # Baseline and override were validated individually above; merging two valid
+        # documents entry by entry cannot produce an invalid one, so no third pass is needed
         logging.info(f"[ACCOUNTS-MAPPING] Account mapping configuration ready - {len(mapping['account_types'])} types mapped and validated")
+        
+        if cache_key:
+            _save_cached_mapping(cache_path, cache_key, mapping)
         return mapping
         
     except (IOError, json.JSONDecodeError) as e:
         logging.error(f"[E1101] Failed to load account mapping configuration: {str(e)}")
         raise MappingLoadError(f"Failed to load account mapping configuration: {str(e)}")
 
-def find_unmapped_types(records: List[Dict[str, Any]], mapping: Dict[str, Any]) -> List[str]:
+def find_unmapped_types(records: List[Dict[str, Any]], mapping: Dict[str, Any],
+                        resolution: Optional[MappingResolution] = None) -> List[str]:
     """Find QBD accounts that are not mapped in the configuration.
     
     Args:
         records: List of account records from !ACCNT section
         mapping: Account mapping configuration
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
         
     Returns:
         List of unmapped QBD account strings
     """
-    mapped_types = set(mapping.get('account_types', {}).keys())
-    record_types = set(record.get('ACCNTTYPE', '') for record in records)
-    unmapped = record_types - mapped_types
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
+    unmapped = resolution.unmapped_record_types(records)
     
     if unmapped:
         logging.info(f"[ACCOUNTS-UNMAPPED-PROCESSING] Found {len(unmapped)} unmapped accounts requiring user input")
-        logging.debug(f"[ACCOUNTS-MAPPING] Mapped types available: {sorted(mapped_types)}")
+        logging.debug(f"[ACCOUNTS-MAPPING] Mapped types available: {sorted(resolution.types)}")
     else:
         logging.debug("[ACCOUNTS-MAPPING] All accounts are properly mapped")
     
-    return sorted(unmapped)
\ No newline at end of file
+    return unmapped
\ No newline at end of file
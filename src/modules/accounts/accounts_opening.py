@@ -0,0 +1,170 @@
+"""Opening-balance transaction from the ACCNT OBAMOUNT column.
+
+QuickBooks exports each account's balance in OBAMOUNT. The balances of every
+converted account are decoded in one batch (utils.amount_columns) and written
+as a single multi-split GnuCash transaction, one split per account with a
+non-zero balance. A complete chart balances to zero; when it does not, the
+difference is reported and posted to the Opening Balances equity account so
+the transaction still imports.
+"""
+
+import csv
+import logging
+import os
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.account_index import AccountIndex
+from utils.amount_columns import decode_amount_column
+from utils.error_handler import DomainValidationError, OutputWriteError
+from utils.iif_values import format_cents, parse_amount_cents, parse_iif_date
+from utils.logging import log_technical_lazy
+from utils.output_writer import AtomicOutputFile, OutputWriteResult
+from utils.transaction_csv import TRANSACTION_CSV_COLUMNS, Transaction, TransactionSplit, transaction_rows
+
+from .accounts_tree import AccountNode
+
+# Offset account candidates: the QBD equity account first, then the GnuCash default
+OPENING_BALANCE_EQUITY_ACCOUNTS = ('Opening Bal Equity', 'Equity:Opening Balances')
+
+OPENING_BALANCE_FILENAME = 'opening_balances.csv'
+OPENING_BALANCE_TRANSACTION_ID = 'OPENING-BALANCES'
+
+# Invalid OBAMOUNT values listed in the exception message
+MAX_REPORTED_ERRORS = 20
+
+def collect_opening_balances(root: AccountNode) -> Tuple[List[str], List[str]]:
+    """GnuCash full names and raw OBAMOUNT values of accounts created from ACCNT records, in tree order."""
+    full_names, values = [], []
+    stack = list(reversed(root.children))
+    while stack:
+        node = stack.pop()
+        if node.source_record:
+            full_names.append(node.full_name[5:] if node.full_name.startswith("Root:") else node.full_name)
+            values.append(node.source_record.get('OBAMOUNT', ''))
+        stack.extend(reversed(node.children))
+    return full_names, values
+
+def decode_opening_balances(full_names: List[str], values: List[str]) -> List[int]:
+    """Decode every OBAMOUNT into cents in one batch.
+
+    Raises:
+        DomainValidationError: Listing the accounts whose OBAMOUNT is not a valid amount
+    """
+    try:
+        return decode_amount_column(values, 'OBAMOUNT').tolist()
+    except ValueError:
+        pass
+    # Only on failure: name every offending account instead of a record position
+    problems = []
+    for full_name, value in zip(full_names, values):
+        try:
+            parse_amount_cents(value)
+        except ValueError as e:
+            problems.append(f"Account '{full_name}': OBAMOUNT {str(e)}")
+    more = f"\n... and {len(problems) - MAX_REPORTED_ERRORS} more" if len(problems) > MAX_REPORTED_ERRORS else ""
+    raise DomainValidationError(f"{len(problems)} invalid opening balances:\n"
+                                + "\n".join(problems[:MAX_REPORTED_ERRORS]) + more)
+
+def opening_balance_date(records: List[Dict[str, str]], configured: str = '') -> Optional[date]:
+    """Posting date: extra_config['opening_balance_date'] if set, else the latest ACCNT TIMESTAMP (UTC)."""
+    if configured:
+        return parse_iif_date(configured)
+    timestamps = [int(stamp) for stamp in (record.get('TIMESTAMP', '').strip() for record in records) if stamp.isdigit()]
+    if not timestamps:
+        return None
+    return datetime.fromtimestamp(max(timestamps), timezone.utc).date()
+
+def offset_account(index: AccountIndex) -> str:
+    """GnuCash full name of the Opening Balances equity account."""
+    for name in OPENING_BALANCE_EQUITY_ACCOUNTS:
+        full_name = index.resolve(name)
+        if full_name is not None:
+            return full_name
+    return OPENING_BALANCE_EQUITY_ACCOUNTS[-1]
+
+def build_opening_balance_transaction(full_names: List[str], cents: List[int], posted: date,
+                                      offset_full_name: str) -> Tuple[Optional[Transaction], int]:
+    """Build the opening-balance transaction.
+
+    Returns:
+        (Transaction, or None when every balance is zero; imbalance in cents before the offset split)
+    """
+    imbalance = sum(cents)
+    splits = [TransactionSplit(full_name, amount, 'Opening balance', '', 'n')
+              for full_name, amount in zip(full_names, cents) if amount]
+    if imbalance:
+        splits.append(TransactionSplit(offset_full_name, -imbalance, 'Opening balance offset', '', 'n'))
+    if not splits:
+        return None, imbalance
+    return Transaction(OPENING_BALANCE_TRANSACTION_ID, posted.isoformat(), '', 'Opening Balances',
+                       'Converted from QuickBooks OBAMOUNT', splits), imbalance
+
+def export_opening_balances(transaction: Transaction, commodity: str, output_dir: str) -> OutputWriteResult:
+    """Write output/opening_balances.csv in the GnuCash multi-split transaction layout."""
+    output_path = os.path.join(output_dir, OPENING_BALANCE_FILENAME)
+    try:
+        with AtomicOutputFile(output_path) as f:
+            writer = csv.writer(f)
+            writer.writerow(TRANSACTION_CSV_COLUMNS)
+            writer.writerows(transaction_rows(transaction, f"CURRENCY::{commodity}"))
+    except OSError as e:
+        raise OutputWriteError(f"Failed to write opening balances CSV to {output_path}: {str(e)}")
+    log_technical_lazy("[ACCOUNTS-OPENING] Output file: %s (sha256 %s, %s)", output_path,
+                       f.result.digest[:12], 'updated' if f.result.changed else 'unchanged')
+    return f.result
+
+def load_opening_balances(root: AccountNode) -> Tuple[List[str], List[int]]:
+    """GnuCash full names and OBAMOUNT cents of every account created from an ACCNT record.
+
+    Raises:
+        DomainValidationError: If an OBAMOUNT is not a valid amount
+    """
+    full_names, values = collect_opening_balances(root)
+    return full_names, decode_opening_balances(full_names, values)
+
+def convert_opening_balances(full_names: List[str], cents: List[int], records: List[Dict[str, str]],
+                             index: AccountIndex, extra_config: Dict[str, Any], output_dir: str) -> Dict[str, int]:
+    """Check and export the opening balances of the converted account tree.
+
+    Args:
+        full_names: GnuCash full names from load_opening_balances
+        cents: Opening balance of each account in cents
+        records: ACCNT records (for the TIMESTAMP fallback date)
+        index: Account index of the tree (offset account and book currency)
+        extra_config: Run-wide shared configuration; optional 'opening_balance_date'
+        output_dir: Directory for output file
+
+    Returns:
+        Counts for the stage metrics: accounts, splits, imbalance (cents)
+
+    Raises:
+        DomainValidationError: If the configured date is invalid
+    """
+    counts = {'accounts': len(full_names), 'splits': 0, 'imbalance': 0}
+
+    try:
+        posted = opening_balance_date(records, extra_config.get('opening_balance_date', ''))
+    except ValueError as e:
+        raise DomainValidationError(f"Invalid opening_balance_date: {str(e)}")
+    if posted is None:
+        logging.warning("[ACCOUNTS-OPENING] No opening balance date: set QBD_OPENING_BALANCE_DATE "
+                        "or export ACCNT with TIMESTAMP; opening balances not written")
+        return counts
+
+    offset_full_name = offset_account(index)
+    transaction, imbalance = build_opening_balance_transaction(full_names, cents, posted, offset_full_name)
+    counts['imbalance'] = imbalance
+    if imbalance:
+        logging.warning(f"[ACCOUNTS-OPENING] Opening balances do not sum to zero: offset of "
+                        f"{format_cents(-imbalance)} posted to '{offset_full_name}'")
+        if offset_full_name not in index:
+            logging.warning(f"[ACCOUNTS-OPENING] '{offset_full_name}' is not in accounts.csv; create it in GnuCash "
+                            f"before importing {OPENING_BALANCE_FILENAME}")
+    if transaction is None:
+        log_technical_lazy("[ACCOUNTS-OPENING] Every opening balance is zero; no transaction written")
+        return counts
+
+    export_opening_balances(transaction, index.commodity, output_dir)
+    counts['splits'] = len(transaction.splits)
+    return counts
@@ -0,0 +1,274 @@
+"""Pattern-based account mapping rules with a compiled matcher.
+
+Rules extend the exact ACCNTTYPE mapping with matches on the QBD account name
+(regex), numeric ACCNUM ranges and parent account paths. All rules are compiled
+once into a combined name regex per account type, a sorted ACCNUM range index and
+a parent path table, so resolving an account costs a constant number of lookups
+regardless of how many rules are configured.
+
+Rule format (``account_rules`` list in the mapping JSON)::
+
+    {
+        "name_pattern": "Payroll.*",         # regex, must match the full QBD NAME
+        "ignore_case": true,                 # optional, default false
+        "accnum_range": [6000, 6999],        # optional, inclusive numeric ACCNUM range
+        "parent_path": "Payroll Expenses",   # optional, QBD parent account path prefix
+        "account_types": ["EXP"],            # optional, restrict to these ACCNTTYPE values
+        "priority": 10,                      # optional, higher wins, default 0
+        "gnucash_type": "EXPENSE",
+        "destination_hierarchy": "Expenses:Payroll"
+    }
+
+At least one of name_pattern, accnum_range or parent_path is required. When
+several rules match, the highest priority wins and ties go to the rule declared
+first.
+"""
+
+import bisect
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+RULE_MATCHER_FIELDS = ('name_pattern', 'accnum_range', 'parent_path')
+
+# Key for rules that apply to every account type
+_ANY_TYPE = None
+
+# Numbered backreference (\1) or numbered conditional ((?(1)...)) not escaped by a backslash;
+# group numbers shift inside the combined alternation, so these patterns are matched on their own
+_NUMBERED_GROUP_REF = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)')
+
+def parse_accnum(accnum: str) -> Optional[int]:
+    """Return ACCNUM as an integer, or None when it is blank or not purely numeric."""
+    accnum = accnum.strip()
+    return int(accnum) if accnum.isdigit() else None
+
+def validate_rule_matchers(rule: Dict[str, Any], label: str, file_path: str) -> List[str]:
+    """Validate the matcher part of a single account rule.
+
+    Args:
+        rule: Rule object from the mapping file
+        label: Human readable rule label for messages (e.g. "Account rule #1")
+        file_path: File path for error reporting
+
+    Returns:
+        List of validation error messages (empty if valid)
+    """
+    errors = []
+
+    if not any(field in rule for field in RULE_MATCHER_FIELDS):
+        errors.append(f"{file_path}: {label} needs at least one of {', '.join(RULE_MATCHER_FIELDS)}")
+
+    if 'name_pattern' in rule:
+        pattern = rule['name_pattern']
+        if not isinstance(pattern, str) or not pattern:
+            errors.append(f"{file_path}: {label} name_pattern must be a non-empty string")
+        else:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                errors.append(f"{file_path}: {label} name_pattern is not a valid regular expression: {str(e)}")
+
+    if 'accnum_range' in rule:
+        bounds = rule['accnum_range']
+        if (not isinstance(bounds, list) or len(bounds) != 2 or
+                not all(isinstance(bound, int) and not isinstance(bound, bool) for bound in bounds)):
+            errors.append(f"{file_path}: {label} accnum_range must be a list of two integers [low, high]")
+        elif bounds[0] > bounds[1]:
+            errors.append(f"{file_path}: {label} accnum_range low bound {bounds[0]} exceeds high bound {bounds[1]}")
+
+    if 'parent_path' in rule:
+        parent_path = rule['parent_path']
+        if not isinstance(parent_path, str) or not parent_path.strip(':').strip():
+            errors.append(f"{file_path}: {label} parent_path must be a non-empty account path")
+
+    if 'account_types' in rule:
+        account_types = rule['account_types']
+        if not isinstance(account_types, list) or not all(isinstance(t, str) and t for t in account_types):
+            errors.append(f"{file_path}: {label} account_types must be a list of ACCNTTYPE strings")
+
+    if 'priority' in rule and (not isinstance(rule['priority'], int) or isinstance(rule['priority'], bool)):
+        errors.append(f"{file_path}: {label} priority must be an integer")
+
+    if 'ignore_case' in rule and not isinstance(rule['ignore_case'], bool):
+        errors.append(f"{file_path}: {label} ignore_case must be true or false")
+
+    return errors
+
+class _CompiledRule:
+    """One rule with its conditions compiled for secondary checks."""
+
+    def __init__(self, index: int, rule: Dict[str, Any]):
+        self.index = index
+        self.priority = rule.get('priority', 0)
+        self.rank = (-self.priority, index)  # sort key: highest priority, then declaration order
+        flags = re.IGNORECASE if rule.get('ignore_case') else 0
+        self.name_source = rule.get('name_pattern')
+        self.name_regex = re.compile(self.name_source, flags) if self.name_source else None
+        self.numbered_refs = bool(self.name_source and _NUMBERED_GROUP_REF.search(self.name_source))
+        self.ignore_case = bool(flags)
+        bounds = rule.get('accnum_range')
+        self.accnum_range: Optional[Tuple[int, int]] = tuple(bounds) if bounds else None
+        parent_path = rule.get('parent_path')
+        self.parent_path = parent_path.strip(':') if parent_path else None
+        types = rule.get('account_types')
+        self.account_types = frozenset(types) if types else None
+
+    def matches(self, qbd_type: str, name: str, accnum: Optional[int]) -> bool:
+        """Check every condition of this rule against one account."""
+        if self.account_types is not None and qbd_type not in self.account_types:
+            return False
+        if self.name_regex is not None and not self.name_regex.fullmatch(name):
+            return False
+        if self.accnum_range is not None:
+            if accnum is None or not self.accnum_range[0] <= accnum <= self.accnum_range[1]:
+                return False
+        if self.parent_path is not None:
+            if not name.startswith(self.parent_path + ':'):
+                return False
+        return True
+
+class AccountRuleMatcher:
+    """Compiled form of a mapping's account_rules list.
+
+    Each rule is indexed under its most selective condition (parent path, then
+    ACCNUM range, then name pattern); remaining conditions are checked only on
+    the few candidates a lookup returns. Name-only rules are merged into one
+    alternation regex per account type, ordered by priority, so a single
+    fullmatch finds the winning name rule.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rule_count = len(rules)
+        compiled = [_CompiledRule(index, rule) for index, rule in enumerate(rules)]
+
+        parent_rules: Dict[str, List[_CompiledRule]] = {}
+        range_rules: List[_CompiledRule] = []
+        name_rules: Dict[Optional[str], List[_CompiledRule]] = {}
+
+        for rule in compiled:
+            if rule.parent_path is not None:
+                parent_rules.setdefault(rule.parent_path, []).append(rule)
+            elif rule.accnum_range is not None:
+                range_rules.append(rule)
+            elif rule.account_types is None:
+                name_rules.setdefault(_ANY_TYPE, []).append(rule)
+            else:
+                for qbd_type in rule.account_types:
+                    name_rules.setdefault(qbd_type, []).append(rule)
+
+        self._parent_rules = {path: sorted(group, key=lambda r: r.rank) for path, group in parent_rules.items()}
+        self._build_range_index(range_rules)
+        self._name_matchers = {qbd_type: self._combine_name_rules(group) for qbd_type, group in name_rules.items()}
+
+        # Pattern/parent winners depend only on (type, name); ACCNUM ranges are resolved per lookup
+        self._name_cache: Dict[Tuple[str, str], Optional[_CompiledRule]] = {}
+
+    def _build_range_index(self, range_rules: List[_CompiledRule]) -> None:
+        """Split ACCNUM ranges into disjoint segments, each listing its covering rules."""
+        boundaries = sorted({bound for rule in range_rules
+                             for bound in (rule.accnum_range[0], rule.accnum_range[1] + 1)})
+        self._range_starts: List[int] = boundaries[:-1]
+        self._range_segments: List[List[_CompiledRule]] = []
+        for start in self._range_starts:
+            covering = [rule for rule in range_rules if rule.accnum_range[0] <= start <= rule.accnum_range[1]]
+            self._range_segments.append(sorted(covering, key=lambda r: r.rank))
+        self._range_end = boundaries[-1] if boundaries else None
+
+    @staticmethod
+    def _combine_name_rules(group: List[_CompiledRule]) -> Tuple[Optional[re.Pattern], Dict[str, _CompiledRule], List[_CompiledRule]]:
+        """Combine name rules into one priority-ordered alternation regex."""
+        ordered = sorted(group, key=lambda r: r.rank)
+        alternatives = []
+        by_group: Dict[str, _CompiledRule] = {}
+        for rule in ordered:
+            group_name = f"_rule{rule.index}"
+            flags = 'i' if rule.ignore_case else ''
+            body = f"(?{flags}:{rule.name_source})" if flags else f"(?:{rule.name_source})"
+            alternatives.append(f"(?P<{group_name}>{body})")
+            by_group[group_name] = rule
+        if any(rule.numbered_refs for rule in ordered):
+            return None, by_group, ordered
+        try:
+            return re.compile('|'.join(alternatives)), by_group, ordered
+        except re.error:
+            # Patterns that cannot be combined (e.g. duplicate group names) are matched one by one
+            return None, by_group, ordered
+
+    def _match_name_group(self, qbd_type: Optional[str], name: str) -> Optional[_CompiledRule]:
+        """Return the winning name-only rule for one account type group."""
+        matcher = self._name_matchers.get(qbd_type)
+        if matcher is None:
+            return None
+        combined, by_group, ordered = matcher
+        if combined is not None:
+            match = combined.fullmatch(name)
+            return by_group[match.lastgroup] if match else None
+        for rule in ordered:
+            if rule.name_regex.fullmatch(name):
+                return rule
+        return None
+
+    def _match_name_and_parent(self, qbd_type: str, name: str) -> Optional[_CompiledRule]:
+        """Return the best rule decided by type and name alone (memoized per pair)."""
+        key = (qbd_type, name)
+        if key in self._name_cache:
+            return self._name_cache[key]
+
+        candidates = [self._match_name_group(qbd_type, name), self._match_name_group(_ANY_TYPE, name)]
+
+        if self._parent_rules and ':' in name:
+            parts = name.split(':')
+            for depth in range(1, len(parts)):
+                for rule in self._parent_rules.get(':'.join(parts[:depth]), ()):
+                    if rule.accnum_range is None and rule.matches(qbd_type, name, None):
+                        candidates.append(rule)
+                        break
+
+        best = min((rule for rule in candidates if rule is not None), key=lambda r: r.rank, default=None)
+        self._name_cache[key] = best
+        return best
+
+    def _match_accnum(self, qbd_type: str, name: str, accnum: int) -> Optional[_CompiledRule]:
+        """Return the best rule that needs the ACCNUM value to decide."""
+        best = None
+        if self._range_end is not None and accnum < self._range_end:
+            position = bisect.bisect_right(self._range_starts, accnum) - 1
+            if position >= 0:
+                for rule in self._range_segments[position]:
+                    if rule.matches(qbd_type, name, accnum):
+                        best = rule
+                        break
+
+        # Parent path rules that also carry an ACCNUM range
+        if self._parent_rules and ':' in name:
+            parts = name.split(':')
+            for depth in range(1, len(parts)):
+                for rule in self._parent_rules.get(':'.join(parts[:depth]), ()):
+                    if rule.accnum_range is not None and rule.matches(qbd_type, name, accnum):
+                        if best is None or rule.rank < best.rank:
+                            best = rule
+                        break
+        return best
+
+    def match(self, qbd_type: str, name: str, accnum: str = '') -> Optional[int]:
+        """Find the rule that applies to an account.
+
+        Args:
+            qbd_type: QBD ACCNTTYPE value
+            name: Full QBD account NAME (with ':' separated parents)
+            accnum: Raw ACCNUM field value
+
+        Returns:
+            Index of the winning rule in the original rule list, or None
+        """
+        best = self._match_name_and_parent(qbd_type, name)
+        accnum_value = parse_accnum(accnum) if accnum else None
+        if accnum_value is not None:
+            range_best = self._match_accnum(qbd_type, name, accnum_value)
+            if range_best is not None and (best is None or range_best.rank < best.rank):
+                best = range_best
+        return best.index if best is not None else None
+
+def compile_account_rules(rules: List[Dict[str, Any]]) -> AccountRuleMatcher:
+    """Compile a validated account_rules list into a matcher."""
+    return AccountRuleMatcher(rules or [])
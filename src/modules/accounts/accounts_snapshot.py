@@ -0,0 +1,298 @@
+"""Persisted account tree snapshots and incremental tree updates.
+
+This module stores the finished account tree together with the ACCNT records it
+was built from, and on the next run applies only the added, removed and renamed
+records (keyed by REFNUM) to the previous tree instead of rebuilding it.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Set
+
+from utils.error_handler import OutputWriteError, ValidationError
+from utils.logging import log_user_info, log_technical_detail
+from utils.output_writer import AtomicOutputFile
+
+from .accounts_mapping import MappingResolution, compile_mapping_resolution
+from .accounts_tree import AccountNode, build_accounts_tree
+
+SNAPSHOT_FILENAME = "accounts_tree_snapshot.json"
+SNAPSHOT_VERSION = 1
+
+# Branches that always exist directly under Root, in their fixed order
+FUNDAMENTAL_BRANCHES = ('Assets', 'Liabilities', 'Equity', 'Income', 'Expenses')
+
+# Node attributes persisted in the snapshot (children are handled separately)
+_NODE_FIELDS = (
+    'name', 'type', 'account_code', 'full_name', 'original_qbd_name',
+    'original_description', 'original_hidden', 'original_placeholder',
+    'original_tax_info', 'original_notes', 'original_color', 'source_record'
+)
+
+def _mapping_fingerprint(mapping: Dict[str, Any]) -> str:
+    """Return a stable hash of the mapping configuration used to build a tree."""
+    encoded = json.dumps(mapping, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def _node_to_dict(node: AccountNode) -> Dict[str, Any]:
+    """Serialize an account node and its subtree."""
+    data = {field: getattr(node, field) for field in _NODE_FIELDS}
+    data['children'] = [_node_to_dict(child) for child in node.children]
+    return data
+
+def _node_from_dict(data: Dict[str, Any], parent: Optional[AccountNode] = None) -> AccountNode:
+    """Rebuild an account node and its subtree from snapshot data."""
+    node = AccountNode(data['name'], data['type'], data['account_code'], data['source_record'])
+    for field in _NODE_FIELDS:
+        setattr(node, field, data[field])
+    node.parent = parent
+    node.children = [_node_from_dict(child, node) for child in data['children']]
+    return node
+
+def _candidate_branches(accounts: List[Dict[str, str]], resolution: MappingResolution) -> List[Set[str]]:
+    """Determine which top-level branches each account record can land in.
+
+    Top-level accounts always land under their destination hierarchy. Sub-accounts
+    are placed under their parent account when it has been placed already, so
+    they may land in any branch used by a record carrying the parent's name.
+
+    Args:
+        accounts: List of account records from ACCNT module key
+        resolution: Compiled mapping resolution table
+
+    Returns:
+        List of branch name sets aligned with the account records
+    """
+    branches_by_name: Dict[str, Set[str]] = {}
+    own_branches = []
+    for account in accounts:
+        branch = resolution.resolve_account(account).hierarchy_parts[0]
+        own_branches.append(branch)
+        branches_by_name.setdefault(account['NAME'], set()).add(branch)
+
+    candidates = []
+    for account, branch in zip(accounts, own_branches):
+        qbd_name = account['NAME']
+        if ':' in qbd_name:
+            candidates.append({branch} | branches_by_name.get(qbd_name.split(':')[0], set()))
+        else:
+            candidates.append({branch})
+    return candidates
+
+def load_tree_snapshot(snapshot_path: str, mapping: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Load a previously persisted account tree snapshot.
+
+    Args:
+        snapshot_path: Path to the snapshot file
+        mapping: Current account mapping configuration
+
+    Returns:
+        Snapshot dict, or None if missing, unreadable or built from a different mapping
+    """
+    if not os.path.exists(snapshot_path):
+        log_technical_detail(f"[ACCOUNTS-TREE] No tree snapshot found at {snapshot_path}")
+        return None
+
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (IOError, ValueError) as e:
+        log_technical_detail(f"[ACCOUNTS-TREE] Ignoring unreadable tree snapshot {snapshot_path}: {str(e)}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        log_technical_detail(f"[ACCOUNTS-TREE] Ignoring tree snapshot with unsupported version: {snapshot_path}")
+        return None
+
+    if snapshot.get('mapping_fingerprint') != _mapping_fingerprint(mapping):
+        log_technical_detail("[ACCOUNTS-TREE] Mapping configuration changed since last snapshot - full rebuild required")
+        return None
+
+    return snapshot
+
+def save_tree_snapshot(root: AccountNode, accounts: List[Dict[str, str]], mapping: Dict[str, Any], snapshot_path: str) -> None:
+    """Persist an account tree and the records it was built from.
+
+    Args:
+        root: Root node of the finished account tree
+        accounts: Unmodified account records the tree was built from
+        mapping: Account mapping configuration used for the build
+        snapshot_path: Destination path of the snapshot file
+    """
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'mapping_fingerprint': _mapping_fingerprint(mapping),
+        'records': accounts,
+        'tree': _node_to_dict(root)
+    }
+
+    try:
+        # Written through a temp file so a crash cannot truncate the previous snapshot
+        with AtomicOutputFile(snapshot_path) as f:
+            json.dump(snapshot, f)
+        if f.result.changed:
+            log_technical_detail(f"[ACCOUNTS-TREE] Saved tree snapshot with {len(accounts)} records: {snapshot_path}")
+        else:
+            log_technical_detail(f"[ACCOUNTS-TREE] Tree snapshot unchanged: {snapshot_path}")
+    except (OSError, OutputWriteError) as e:
+        # A missing snapshot only costs a full rebuild on the next run
+        log_technical_detail(f"[ACCOUNTS-TREE] Failed to save tree snapshot {snapshot_path}: {str(e)}")
+
+def diff_account_records(previous: List[Dict[str, str]], current: List[Dict[str, str]]) -> Optional[Dict[str, List[str]]]:
+    """Compare two ACCNT record lists keyed by REFNUM.
+
+    Args:
+        previous: Records from the snapshot
+        current: Records from the current IIF file
+
+    Returns:
+        Dict with 'added', 'removed', 'renamed' and 'modified' REFNUM lists,
+        or None if the records cannot be keyed by unique REFNUMs
+    """
+    previous_by_ref = {record.get('REFNUM', ''): record for record in previous}
+    current_by_ref = {record.get('REFNUM', ''): record for record in current}
+
+    if ('' in previous_by_ref or '' in current_by_ref or
+            len(previous_by_ref) != len(previous) or len(current_by_ref) != len(current)):
+        return None
+
+    diff = {'added': [], 'removed': [], 'renamed': [], 'modified': []}
+    for refnum, record in current_by_ref.items():
+        old_record = previous_by_ref.get(refnum)
+        if old_record is None:
+            diff['added'].append(refnum)
+        elif old_record.get('NAME') != record.get('NAME'):
+            diff['renamed'].append(refnum)
+        elif old_record != record:
+            diff['modified'].append(refnum)
+    diff['removed'] = [refnum for refnum in previous_by_ref if refnum not in current_by_ref]
+    return diff
+
+def update_accounts_tree(snapshot: Dict[str, Any], accounts: List[Dict[str, str]], mapping: Dict[str, Any],
+                         resolution: Optional[MappingResolution] = None) -> Optional[AccountNode]:
+    """Apply ACCNT record changes to a previously built account tree.
+
+    Only the top-level branches touched by added, removed, renamed or modified
+    records are rebuilt; the 1-child rule therefore runs on those subtrees only.
+    The result is identical to a full build_accounts_tree() of the current records.
+
+    Args:
+        snapshot: Snapshot loaded by load_tree_snapshot()
+        accounts: Current account records from ACCNT module key
+        mapping: Account mapping configuration
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+
+    Returns:
+        Updated root node, or None if the change set requires a full rebuild
+
+    Raises:
+        ValidationError: If the updated records violate AR/AP uniqueness rules
+    """
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
+
+    previous = snapshot['records']
+    diff = diff_account_records(previous, accounts)
+    if diff is None:
+        log_technical_detail("[ACCOUNTS-TREE] Records lack unique REFNUM values - full rebuild required")
+        return None
+
+    # Child order follows record order, so reordered survivors need a full rebuild
+    current_refs = set(record['REFNUM'] for record in accounts)
+    previous_refs = set(record['REFNUM'] for record in previous)
+    if ([record['REFNUM'] for record in previous if record['REFNUM'] in current_refs] !=
+            [record['REFNUM'] for record in accounts if record['REFNUM'] in previous_refs]):
+        log_technical_detail("[ACCOUNTS-TREE] Record order changed since last snapshot - full rebuild required")
+        return None
+
+    changed = set(diff['removed']) | set(diff['added']) | set(diff['renamed']) | set(diff['modified'])
+    previous_candidates = dict(zip((r['REFNUM'] for r in previous), _candidate_branches(previous, resolution)))
+    current_candidates = dict(zip((r['REFNUM'] for r in accounts), _candidate_branches(accounts, resolution)))
+
+    # Seed affected branches with every branch a changed record touched before or after
+    affected: Set[str] = set()
+    for refnum in previous_refs | current_refs:
+        old_branches = previous_candidates.get(refnum, set())
+        new_branches = current_candidates.get(refnum, set())
+        if refnum in changed or old_branches != new_branches:
+            affected |= old_branches | new_branches
+
+    if not affected:
+        log_user_info("[ACCOUNTS-TREE] No account changes since last run - reusing previous account tree")
+        return _node_from_dict(snapshot['tree'])
+
+    # Sub-accounts that may land in several branches tie those branches together
+    linked_sets = [branches for branches in list(previous_candidates.values()) + list(current_candidates.values())
+                   if len(branches) > 1]
+    grew = True
+    while grew:
+        grew = False
+        for branches in linked_sets:
+            if branches & affected and not branches <= affected:
+                affected |= branches
+                grew = True
+
+    if not affected <= set(FUNDAMENTAL_BRANCHES):
+        log_technical_detail(f"[ACCOUNTS-TREE] Changes touch non-standard top-level branches {sorted(affected)} - full rebuild required")
+        return None
+
+    # AR/AP uniqueness spans the whole chart, not just the rebuilt branches
+    ar_accounts = set(record['NAME'] for record in accounts if record['ACCNTTYPE'] == 'AR')
+    ap_accounts = set(record['NAME'] for record in accounts if record['ACCNTTYPE'] == 'AP')
+    if len(ar_accounts) > 1:
+        raise ValidationError(f"Multiple AR accounts found: {ar_accounts}. Only one AR root account allowed per PRD Section 7.1")
+    if len(ap_accounts) > 1:
+        raise ValidationError(f"Multiple AP accounts found: {ap_accounts}. Only one AP root account allowed per PRD Section 7.1")
+
+    # Rebuild the affected branches from the records that can land in them
+    affected_records = [record for record in accounts if current_candidates[record['REFNUM']] & affected]
+    partial_root = build_accounts_tree(affected_records, mapping, resolution)
+    rebuilt = {child.name: child for child in partial_root.children}
+
+    root = _node_from_dict(snapshot['tree'])
+    for index, branch_node in enumerate(root.children):
+        if branch_node.name in affected:
+            new_branch = rebuilt[branch_node.name]
+            new_branch.parent = root
+            root.children[index] = new_branch
+
+    log_user_info(f"[ACCOUNTS-TREE] Incremental update: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+                  f"{len(diff['renamed'])} renamed, {len(diff['modified'])} modified accounts")
+    log_technical_detail(f"[ACCOUNTS-TREE] Rebuilt {len(affected)} of {len(root.children)} top-level branches: {sorted(affected)}")
+    return root
+
+def build_or_update_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, Any], output_dir: str,
+                                  resolution: Optional[MappingResolution] = None) -> AccountNode:
+    """Build the account tree, incrementally updating the persisted snapshot when possible.
+
+    Args:
+        accounts: List of account records from ACCNT module key
+        mapping: Account mapping configuration with destination hierarchies
+        output_dir: Directory holding the tree snapshot (from payload)
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+
+    Returns:
+        Root node of the account tree
+
+    Raises:
+        ValidationError: If hierarchy cannot be constructed or AR/AP rules violated
+    """
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
+    snapshot_path = os.path.join(output_dir, SNAPSHOT_FILENAME)
+
+    # Tree construction may merge data into source records, so snapshot pristine copies
+    pristine_records = [dict(record) for record in accounts]
+
+    root = None
+    snapshot = load_tree_snapshot(snapshot_path, mapping)
+    if snapshot is not None:
+        root = update_accounts_tree(snapshot, accounts, mapping, resolution)
+
+    if root is None:
+        log_technical_detail("[ACCOUNTS-TREE] Performing full account tree build")
+        root = build_accounts_tree(accounts, mapping, resolution)
+
+    save_tree_snapshot(root, pristine_records, mapping, snapshot_path)
+    return root
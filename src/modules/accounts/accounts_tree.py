@@ -3,10 +3,15 @@
 Fixed version that prevents phantom intermediate nodes when accounts have similar names.
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
+from utils.account_index import AccountIndex
 from utils.error_handler import ValidationError
-from utils.logging import log_technical_detail, log_config_mapping, log_config_placement
+from utils.logging import (
+    log_config_mapping, log_config_placement, log_record_detail, log_technical_lazy, record_detail_enabled
+)
+
+from .accounts_mapping import MappingResolution, ResolvedAccountType, compile_mapping_resolution
 
 class AccountNode:
     def __init__(self, name: str, acc_type: str, account_code: str = "", source_record: dict = None):
@@ -27,12 +32,13 @@ class AccountNode:
         self.original_notes = self.source_record.get('NOTES', '')
         self.original_color = self.source_record.get('COLOR', '')
         
-        # Log systematic field capture for user visibility
-        captured_fields = [k for k, v in self.source_record.items() if v]
-        if captured_fields:
-            log_technical_detail(f"Field capture: '{name}' preserved {len(captured_fields)} source fields: {captured_fields}")
-        else:
-            log_technical_detail(f"Field capture: '{name}' no additional source fields found")
+        # Log systematic field capture for user visibility (per-record detail, skipped when disabled)
+        if record_detail_enabled():
+            captured_fields = [k for k, v in self.source_record.items() if v]
+            if captured_fields:
+                log_record_detail("Field capture: '%s' preserved %d source fields: %s", name, len(captured_fields), captured_fields)
+            else:
+                log_record_detail("Field capture: '%s' no additional source fields found", name)
 
     def add_child(self, child: 'AccountNode') -> None:
         """Add a child node to this account."""
@@ -56,7 +62,7 @@ class AccountNode:
             if self.name == child.name:
                 # Structural elimination: merge child into parent and remove redundant child
                 if self._types_compatible_for_promotion(self.type, child.type):
-                    log_technical_detail(f"Config: Applied 1-child rule - eliminated redundant '{self.name}' by merging child into parent")
+                    log_record_detail("Config: Applied 1-child rule - eliminated redundant '%s' by merging child into parent", self.name)
                     
                     # Promote parent to child's type
                     self.type = child.type
@@ -72,7 +78,7 @@ class AccountNode:
                         parent_value = getattr(self, field_name, '')
                         if child_value and not parent_value:
                             setattr(self, field_name, child_value)
-                            log_technical_detail(f"Config: Absorbed '{field_name}' from eliminated child")
+                            log_record_detail("Config: Absorbed '%s' from eliminated child", field_name)
                     
                     # Merge source records (child data takes precedence for non-empty values)
                     for key, value in getattr(child, 'source_record', {}).items():
@@ -89,12 +95,12 @@ class AccountNode:
                         grandchild._update_full_name()
                         self.children.append(grandchild)
                         
-                    log_technical_detail(f"Config: Moved {len(grandchildren)} grandchildren up to eliminate redundant layer")
+                    log_record_detail("Config: Moved %d grandchildren up to eliminate redundant layer", len(grandchildren))
                     
                 else:
-                    log_technical_detail(f"Config: 1-child rule skipped for '{self.name}' - type incompatible despite same name")
+                    log_record_detail("Config: 1-child rule skipped for '%s' - type incompatible despite same name", self.name)
             else:
-                log_technical_detail(f"Config: 1-child rule skipped for '{self.name}' - different name from child '{child.name}' (legitimate hierarchy)")
+                log_record_detail("Config: 1-child rule skipped for '%s' - different name from child '%s' (legitimate hierarchy)", self.name, child.name)
 
     def _update_full_name(self) -> None:
         """Update full_name based on current parent hierarchy."""
@@ -131,12 +137,14 @@ class AccountNode:
         # Promotion is allowed only within the same accounting type group
         return parent_group == child_group
 
-def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any] = None) -> AccountNode:
+def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any] = None,
+                        resolution: Optional[MappingResolution] = None) -> AccountNode:
     """Build account hierarchy with proper double-entry accounting structure.
     
     Args:
         accounts: List of account records from ACCNT module key
         mapping: Account mapping configuration with destination hierarchies
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
         
     Returns:
         Root node of the properly structured account tree
@@ -146,6 +154,8 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
     """
     if mapping is None:
         mapping = {}
+    if resolution is None:
+        resolution = compile_mapping_resolution(mapping)
     
     # Create the fundamental double-entry accounting structure
     root = AccountNode("Root", "ROOT")
@@ -171,36 +181,39 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
     hierarchy_nodes: Dict[str, AccountNode] = {}
     hierarchy_nodes.update(fundamental_types)  # Include fundamental types
     
+    # Per-account resolution computed once and reused by the placement pass
+    resolved_accounts: List[ResolvedAccountType] = []
+    # (destination_hierarchy, name) of every top-level account, for intermediate conflict checks
+    top_level_targets: Set[Tuple[str, str]] = set()
+    # Destination hierarchies of all records sharing a name, in record order, for parent lookup
+    destinations_by_name: Dict[str, List[str]] = {}
+    
     # Process each account and place in proper hierarchy
     for account in accounts:
         qbd_name = account['NAME']
         qbd_type = account['ACCNTTYPE']
-        account_code = account.get('ACCNUM', '')
         
-        # Get mapping for this account type
-        type_mapping = mapping.get('account_types', {}).get(qbd_type, {})
-        gnucash_type = type_mapping.get('gnucash_type', 'EXPENSE')  # Default fallback
-        destination_hierarchy = type_mapping.get('destination_hierarchy', 'Expenses')
+        # Get mapping for this account (rules, then type, then default_rules fallback)
+        resolved = resolution.resolve_account(account)
+        resolved_accounts.append(resolved)
+        destinations_by_name.setdefault(qbd_name, []).append(resolved.destination_hierarchy)
+        if ':' not in qbd_name:
+            top_level_targets.add((resolved.destination_hierarchy, qbd_name))
         
         # User configuration feedback: Show mapping decisions (file only)
-        if type_mapping:
-            log_config_mapping(qbd_name, qbd_type, gnucash_type, destination_hierarchy)
+        if resolved.mapped:
+            log_config_mapping(qbd_name, qbd_type, resolved.gnucash_type, resolved.destination_hierarchy)
         else:
-            fallback_rule = mapping.get('default_rules', {}).get('unmapped_accounts', {})
-            fallback_type = fallback_rule.get('gnucash_type', 'EXPENSE')
-            fallback_hierarchy = fallback_rule.get('destination_hierarchy', 'Expenses')
-            log_technical_detail(f"Config: Account type '{qbd_type}' not mapped, using fallback -> {fallback_type} at {fallback_hierarchy}")
-            # Use fallback values
-            gnucash_type = fallback_type
-            destination_hierarchy = fallback_hierarchy
+            log_record_detail("Config: Account type '%s' not mapped, using fallback -> %s at %s",
+                              qbd_type, resolved.gnucash_type, resolved.destination_hierarchy)
         
         # Special AR/AP validation per PRD Section 7.1
         if qbd_type == 'AR':
             ar_accounts.add(qbd_name)
-            log_technical_detail(f"Config: Registered AR account '{qbd_name}' - will enforce uniqueness")
+            log_record_detail("Config: Registered AR account '%s' - will enforce uniqueness", qbd_name)
         elif qbd_type == 'AP':
             ap_accounts.add(qbd_name)
-            log_technical_detail(f"Config: Registered AP account '{qbd_name}' - will enforce uniqueness")
+            log_record_detail("Config: Registered AP account '%s' - will enforce uniqueness", qbd_name)
     
     # Validate AR/AP uniqueness rules
     if len(ar_accounts) > 1:
@@ -209,45 +222,24 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
         raise ValidationError(f"Multiple AP accounts found: {ap_accounts}. Only one AP root account allowed per PRD Section 7.1")
     
     # Create intermediate hierarchy nodes as needed - FIXED VERSION
-    def ensure_hierarchy_path(path: str) -> AccountNode:
+    def ensure_hierarchy_path(resolved: ResolvedAccountType) -> AccountNode:
         """Ensure all nodes in hierarchy path exist, creating as needed.
         
         FIXED: Only create intermediate nodes when they don't conflict with actual accounts.
         """
+        path = resolved.destination_hierarchy
         if path in hierarchy_nodes:
             return hierarchy_nodes[path]
         
-        parts = path.split(':')
-        current_path = ""
         parent_node = root
         
-        for i, part in enumerate(parts):
-            if i == 0:
-                current_path = part
-            else:
-                current_path = f"{current_path}:{part}"
-            
+        for part, current_path in zip(resolved.hierarchy_parts, resolved.hierarchy_prefixes):
             if current_path not in hierarchy_nodes:
-                # CRITICAL FIX: Check if this intermediate node would conflict with actual accounts
-                # Only create intermediate nodes if they won't be replaced by actual accounts later
-                should_create_intermediate = True
-                
-                # Check if any actual account will occupy this exact position
-                for account in accounts:
-                    account_qbd_name = account['NAME']
-                    account_qbd_type = account['ACCNTTYPE']
-                    account_mapping = mapping.get('account_types', {}).get(account_qbd_type, {})
-                    account_dest_hierarchy = account_mapping.get('destination_hierarchy', 'Expenses')
-                    
-                    # If this is a top-level account that should go directly under the parent
-                    if ':' not in account_qbd_name:  # Top-level account
-                        expected_full_path = f"{account_dest_hierarchy}:{account_qbd_name}"
-                        if current_path == account_dest_hierarchy and part == account_qbd_name:
-                            should_create_intermediate = False
-                            log_technical_detail(f"Config: Skipping intermediate node '{part}' - will be replaced by actual account '{account_qbd_name}'")
-                            break
-                
-                if should_create_intermediate:
+                # CRITICAL FIX: Only create intermediate nodes if they won't be replaced by
+                # an actual top-level account placed at this exact position later
+                if (current_path, part) in top_level_targets:
+                    log_record_detail("Config: Skipping intermediate node '%s' - will be replaced by actual account '%s'", part, part)
+                else:
                     # Determine appropriate type for intermediate node
                     if current_path in fundamental_types:
                         node_type = fundamental_types[current_path].type
@@ -258,22 +250,17 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
                     new_node = AccountNode(part, node_type)
                     hierarchy_nodes[current_path] = new_node
                     parent_node.add_child(new_node)
-                    log_technical_detail(f"Config: Created intermediate hierarchy node '{part}' under '{parent_node.full_name}'")
+                    log_record_detail("Config: Created intermediate hierarchy node '%s' under '%s'", part, parent_node.full_name)
             
             parent_node = hierarchy_nodes.get(current_path, parent_node)
         
         return hierarchy_nodes.get(path, parent_node)
     
     # Place each account in its proper location
-    for account in accounts:
+    for account, resolved in zip(accounts, resolved_accounts):
         qbd_name = account['NAME']
-        qbd_type = account['ACCNTTYPE'] 
         account_code = account.get('ACCNUM', '')
-        
-        # Get mapping for this account type
-        type_mapping = mapping.get('account_types', {}).get(qbd_type, {})
-        gnucash_type = type_mapping.get('gnucash_type', 'EXPENSE')
-        destination_hierarchy = type_mapping.get('destination_hierarchy', 'Expenses')
+        gnucash_type = resolved.gnucash_type
         
         # Handle QuickBooks sub-account names (containing colons)
         if ':' in qbd_name:
@@ -282,27 +269,23 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
             
             # Find the parent account in the same destination hierarchy
             parent_account_name = parts[0]  # The first part is the parent account name
-            parent_account = None
             
             # Look for the parent account that should have been processed already
             parent_node = None
-            for processed_account in accounts:
-                if processed_account['NAME'] == parent_account_name:
-                    # Find where this parent was placed
-                    parent_mapping = mapping.get('account_types', {}).get(processed_account['ACCNTTYPE'], {})
-                    parent_dest_hierarchy = parent_mapping.get('destination_hierarchy', 'Expenses')
-                    parent_path = f"{parent_dest_hierarchy}:{parent_account_name}"
-                    if parent_path in hierarchy_nodes:
-                        parent_node = hierarchy_nodes[parent_path]
-                        break
+            for parent_dest_hierarchy in destinations_by_name.get(parent_account_name, ()):
+                # Find where this parent was placed
+                parent_path = f"{parent_dest_hierarchy}:{parent_account_name}"
+                if parent_path in hierarchy_nodes:
+                    parent_node = hierarchy_nodes[parent_path]
+                    break
             
             if not parent_node:
                 # Parent not found, use the destination hierarchy
-                parent_node = ensure_hierarchy_path(destination_hierarchy)
+                parent_node = ensure_hierarchy_path(resolved)
             
             current_parent = parent_node
             
-            log_technical_detail(f"Config: Processing hierarchical account '{qbd_name}' with {len(parts)} levels")
+            log_record_detail("Config: Processing hierarchical account '%s' with %d levels", qbd_name, len(parts))
             
             for i, part in enumerate(parts):
                 if i == len(parts) - 1:
@@ -322,16 +305,17 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
                     
                     if existing_child:
                         current_parent = existing_child
-                        log_technical_detail(f"Config: Using existing intermediate node '{intermediate_name}'")
+                        log_record_detail("Config: Using existing intermediate node '%s'", intermediate_name)
                     else:
                         # Create intermediate node - no source record for intermediates
                         intermediate_node = AccountNode(intermediate_name, gnucash_type, "")
                         current_parent.add_child(intermediate_node)
                         current_parent = intermediate_node
-                        log_technical_detail(f"Config: Created intermediate node '{intermediate_name}' under '{current_parent.parent.full_name if current_parent.parent else 'Root'}'")
+                        log_record_detail("Config: Created intermediate node '%s' under '%s'", intermediate_name,
+                                          current_parent.parent.full_name if current_parent.parent else 'Root')
         else:
             # Top-level account under its destination hierarchy
-            parent_node = ensure_hierarchy_path(destination_hierarchy)
+            parent_node = ensure_hierarchy_path(resolved)
             
             # CRITICAL FIX: Create the account directly under the destination hierarchy
             # Don't create intermediate nodes that match the account name
@@ -340,7 +324,7 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
             parent_node.add_child(account_node)
             
             # Update hierarchy registry to point to the actual account
-            account_full_path = f"{destination_hierarchy}:{qbd_name}"
+            account_full_path = f"{resolved.destination_hierarchy}:{qbd_name}"
             hierarchy_nodes[account_full_path] = account_node
             
             log_config_placement(qbd_name, parent_node.full_name, gnucash_type)
@@ -356,7 +340,30 @@ def build_accounts_tree(accounts: List[Dict[str, str]], mapping: Dict[str, any]
         return count
     
     total_accounts = count_accounts(root)
-    log_technical_detail(f"Built double-entry accounting tree with {total_accounts} accounts")
-    log_technical_detail(f"AR accounts: {len(ar_accounts)}, AP accounts: {len(ap_accounts)}")
+    log_technical_lazy("Built double-entry accounting tree with %d accounts", total_accounts)
+    log_technical_lazy("AR accounts: %d, AP accounts: %d", len(ar_accounts), len(ap_accounts))
+    
+    return root
+
+def build_account_index(root: AccountNode, commodity: str = 'USD') -> AccountIndex:
+    """Build the shared account reference index from a finished account tree.
+    
+    Args:
+        root: Root node of the account tree
+        commodity: Book currency (the mapping's default commodity)
+        
+    Returns:
+        AccountIndex keyed by GnuCash full name and original QBD account name
+    """
+    index = AccountIndex(commodity)
+    stack = list(reversed(root.children))
+    while stack:
+        node = stack.pop()
+        full_name = node.full_name[5:] if node.full_name.startswith("Root:") else node.full_name
+        # Only nodes created from ACCNT records carry a QBD name other modules can reference
+        index.add(full_name, node.type, node.original_qbd_name if node.source_record else None)
+        stack.extend(reversed(node.children))
     
-    return root
\ No newline at end of file
+    log_technical_lazy("[ACCOUNTS-TREE] Built account reference index: %d full names, %d QBD names",
+                       len(index), len(index.by_qbd_name))
+    return index
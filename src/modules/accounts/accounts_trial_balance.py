@@ -0,0 +1,110 @@
+"""Trial-balance and sign-convention check of the decoded opening balances.
+
+Every account's GnuCash type is mapped to one of the five account classes and
+the balances are summed per class in one grouped pass: a single np.add.at when
+NumPy is installed, otherwise one C-level compress/sum per class over a
+bytes.translate mask of the class codes. The classes must sum to zero
+(assets + expenses = liabilities + equity + income) and each balance is
+compared against its class's normal sign: debit-normal assets and expenses are
+positive, credit-normal liabilities, equity and income negative, as QuickBooks
+exports them and GnuCash stores split values.
+
+Contra accounts (accumulated depreciation, owner's draw, sales discounts)
+legitimately carry the opposite sign, so sign findings are reported as
+warnings for review rather than errors.
+"""
+
+import logging
+from itertools import compress, repeat
+from operator import mul
+from typing import Dict, List, NamedTuple
+
+from utils.account_index import AccountIndex
+from utils.amount_columns import np
+from utils.iif_values import format_cents
+from utils.logging import log_technical_lazy
+
+# Account classes in report order with their normal balance sign
+ACCOUNT_CLASSES = ('ASSET', 'LIABILITY', 'EQUITY', 'INCOME', 'EXPENSE', 'OTHER')
+NORMAL_SIGNS = (1, -1, -1, -1, 1, 0)   # OTHER (TRADING, ROOT) has no convention
+
+# GnuCash account type -> position in ACCOUNT_CLASSES
+GNUCASH_TYPE_CLASSES = {
+    'ASSET': 0, 'RECEIVABLE': 0, 'CASH': 0, 'BANK': 0, 'STOCK': 0, 'MUTUAL': 0,
+    'LIABILITY': 1, 'PAYABLE': 1, 'CREDIT': 1,
+    'EQUITY': 2,
+    'INCOME': 3,
+    'EXPENSE': 4,
+}
+_OTHER_CLASS = ACCOUNT_CLASSES.index('OTHER')
+
+# bytes.translate tables turning a class-code string into a 0/1 mask of one class
+_CLASS_MASKS = [bytes(int(code == account_class) for code in range(256)) for account_class in range(len(ACCOUNT_CLASSES))]
+
+# Opposite-sign accounts listed individually per class; the count is always reported
+MAX_REPORTED_ACCOUNTS = 10
+
+class TrialBalanceReport(NamedTuple):
+    """Per-class totals and sign findings of one account tree."""
+    totals: Dict[str, int]                  # Cents per account class
+    imbalance: int                          # Sum over all classes; zero for a balanced chart
+    opposite_sign: Dict[str, List[str]]     # Class -> accounts whose balance has the contra sign
+    reversed_classes: List[str]             # Classes whose total has the contra sign
+
+    @property
+    def anomaly_count(self) -> int:
+        return sum(len(accounts) for accounts in self.opposite_sign.values()) + len(self.reversed_classes)
+
+def _group_totals(codes: bytes, cents: List[int]) -> List[int]:
+    if np is not None:
+        totals = np.zeros(len(ACCOUNT_CLASSES), dtype=np.int64)
+        np.add.at(totals, np.frombuffer(codes, dtype=np.uint8), np.array(cents, dtype=np.int64))
+        return totals.tolist()
+    return [sum(compress(cents, codes.translate(mask))) for mask in _CLASS_MASKS]
+
+def _opposite_sign_positions(codes: bytes, cents: List[int]) -> List[int]:
+    if np is not None:
+        signs = np.array(NORMAL_SIGNS, dtype=np.int64)[np.frombuffer(codes, dtype=np.uint8)]
+        return np.flatnonzero(np.array(cents, dtype=np.int64) * signs < 0).tolist()
+    signed = map(mul, cents, map(NORMAL_SIGNS.__getitem__, codes))
+    return list(compress(range(len(cents)), map((0).__gt__, signed)))
+
+def check_trial_balance(full_names: List[str], cents: List[int], index: AccountIndex) -> TrialBalanceReport:
+    """Group balances by GnuCash account class and check totals and sign conventions.
+
+    Args:
+        full_names: GnuCash full names of the accounts
+        cents: Balance of each account in cents
+        index: Account index providing each account's GnuCash type
+
+    Returns:
+        TrialBalanceReport
+    """
+    # One byte per account: its position in ACCOUNT_CLASSES
+    codes = bytes(map(GNUCASH_TYPE_CLASSES.get, map(index.types.get, full_names), repeat(_OTHER_CLASS)))
+    totals = _group_totals(codes, cents)
+
+    opposite_sign: Dict[str, List[str]] = {}
+    for position in _opposite_sign_positions(codes, cents):
+        opposite_sign.setdefault(ACCOUNT_CLASSES[codes[position]], []).append(full_names[position])
+
+    reversed_classes = [account_class for account_class, sign, total in zip(ACCOUNT_CLASSES, NORMAL_SIGNS, totals)
+                        if sign * total < 0]
+    return TrialBalanceReport(dict(zip(ACCOUNT_CLASSES, totals)), sum(totals), opposite_sign, reversed_classes)
+
+def log_trial_balance(report: TrialBalanceReport) -> None:
+    """Log the per-class totals and every finding (warnings for anomalies)."""
+    log_technical_lazy("[ACCOUNTS-TRIAL-BALANCE] Class totals: %s",
+                       ', '.join(f"{account_class} {format_cents(total)}"
+                                 for account_class, total in report.totals.items() if total))
+    if report.imbalance:
+        logging.warning(f"[ACCOUNTS-TRIAL-BALANCE] Trial balance is off by {format_cents(report.imbalance)}: "
+                        f"assets and expenses do not equal liabilities, equity and income")
+    for account_class in report.reversed_classes:
+        logging.warning(f"[ACCOUNTS-TRIAL-BALANCE] {account_class} total {format_cents(report.totals[account_class])} "
+                        f"has the opposite of the class's normal sign")
+    for account_class, accounts in report.opposite_sign.items():
+        listed = ', '.join(f"'{name}'" for name in accounts[:MAX_REPORTED_ACCOUNTS])
+        more = f" and {len(accounts) - MAX_REPORTED_ACCOUNTS} more" if len(accounts) > MAX_REPORTED_ACCOUNTS else ""
+        logging.warning(f"[ACCOUNTS-TRIAL-BALANCE] {len(accounts)} {account_class} accounts carry a contra "
+                        f"balance (check they are contra accounts): {listed}{more}")
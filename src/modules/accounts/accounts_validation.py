@@ -8,48 +8,154 @@ import logging
 import os
 import re
 import json
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from utils.error_handler import ValidationError, MappingLoadError
 
-def validate_accounts(accounts: List[Dict[str, str]], mapping: Dict[str, Any]) -> None:
+from .accounts_mapping import MappingResolution, compile_mapping_resolution
+from .accounts_rules import AccountRuleMatcher
+
+# Account name format - allow common business characters including periods, parentheses, and asterisks
+ACCOUNT_NAME_RE = re.compile(r"^[A-Za-z0-9*][A-Za-z0-9:_\-'&.()* ]*$")
+REQUIRED_FIELDS = ('NAME', 'ACCNTTYPE')
+
+# Record sets at least this large are split into chunks when a process pool is requested
+VALIDATION_CHUNK_SIZE = 20000
+
+# Errors echoed to the console and exception message; the log file receives all of them
+MAX_REPORTED_ERRORS = 20
+
+def _validate_chunk(accounts: List[Dict[str, str]], start_index: int,
+                    valid_types: Optional[FrozenSet[str]], rules: Optional[AccountRuleMatcher],
+                    seen_names: Optional[Dict[str, int]] = None) -> List[Tuple[int, str]]:
+    """Check one slice of account records in a single pass.
+    
+    Args:
+        accounts: Account records to check
+        start_index: Index of the first record in the full record list
+        valid_types: Mapped QBD account types, or None to skip the type check
+        rules: Compiled account rules that may map otherwise unknown types
+        seen_names: First index of each name seen so far, or None to skip duplicate detection
+        
+    Returns:
+        List of (record index, error message) tuples
+    """
+    errors = []
+    name_match = ACCOUNT_NAME_RE.match
+    
+    for index, account in enumerate(accounts, start_index):
+        name = account.get('NAME')
+        
+        # Check for duplicates (same rule as _find_duplicate_names)
+        if seen_names is not None and name:
+            first_index = seen_names.setdefault(name, index)
+            if first_index != index:
+                errors.append((index, f"Duplicate account name: {name} (first seen in record {first_index})"))
+        
+        # Check required fields
+        missing = [field for field in REQUIRED_FIELDS if not account.get(field)]
+        if missing:
+            errors.append((index, f"Account missing required fields: {', '.join(missing)}"))
+            continue
+        
+        qbd_type = account['ACCNTTYPE']
+        
+        # Validate account name format
+        if not name_match(name):
+            errors.append((index, f"Invalid account name format: {name}"))
+        
+        # Validate account type using config-driven validation (pattern rules may also map it)
+        if (valid_types is not None and qbd_type not in valid_types and
+                (rules is None or rules.match(qbd_type, name, account.get('ACCNUM', '')) is None)):
+            errors.append((index, f"Invalid account type: {qbd_type} (not found in mapping configuration)"))
+    
+    return errors
+
+def _find_duplicate_names(accounts: List[Dict[str, str]]) -> List[Tuple[int, str]]:
+    """Report every repeated account name with the index of its first occurrence."""
+    errors = []
+    seen_names: Dict[str, int] = {}
+    for index, account in enumerate(accounts):
+        name = account.get('NAME')
+        if not name:
+            continue
+        first_index = seen_names.setdefault(name, index)
+        if first_index != index:
+            errors.append((index, f"Duplicate account name: {name} (first seen in record {first_index})"))
+    return errors
+
+def find_account_errors(accounts: List[Dict[str, str]], mapping: Dict[str, Any],
+                        resolution: Optional[MappingResolution] = None,
+                        check_types: bool = True, workers: int = 0) -> List[Tuple[int, str]]:
+    """Collect every validation problem in the account records.
+    
+    Args:
+        accounts: List of account records from ACCNT section
+        mapping: Account mapping configuration with valid account types
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+        check_types: Whether to report account types missing from the mapping
+        workers: Process pool size for chunked validation of large record sets (0 = in-process)
+        
+    Returns:
+        List of (record index, error message) tuples ordered by record index
+    """
+    valid_types = None
+    rules = None
+    if check_types:
+        if resolution is None:
+            resolution = compile_mapping_resolution(mapping)
+        valid_types = frozenset(resolution.types)
+        rules = resolution.rules if resolution.rule_targets else None
+    
+    if workers <= 1 or len(accounts) < 2 * VALIDATION_CHUNK_SIZE:
+        return _validate_chunk(accounts, 0, valid_types, rules, {})
+    
+    # Chunks are checked in worker processes while duplicates are found here
+    starts = range(0, len(accounts), VALIDATION_CHUNK_SIZE)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_validate_chunk, accounts[start:start + VALIDATION_CHUNK_SIZE],
+                               start, valid_types, rules) for start in starts]
+        errors = _find_duplicate_names(accounts)
+        for future in futures:
+            errors.extend(future.result())
+    
+    # Stable sort keeps each record's duplicate error ahead of its other errors, as in-process
+    errors.sort(key=lambda error: error[0])
+    return errors
+
+def validate_accounts(accounts: List[Dict[str, str]], mapping: Dict[str, Any],
+                      resolution: Optional[MappingResolution] = None,
+                      check_types: bool = True, workers: int = 0) -> None:
     """Validate account records from IIF file.
     
+    All records are checked in one run; every problem is logged with its record
+    index before a single ValidationError is raised.
+    
     Args:
         accounts: List of account records from ACCNT section
         mapping: Account mapping configuration with valid account types
+        resolution: Precompiled mapping resolution table (compiled from mapping if omitted)
+        check_types: Whether to report account types missing from the mapping
+        workers: Process pool size for chunked validation of large record sets (0 = in-process)
         
     Raises:
         ValidationError: If validation fails
     """
-    seen_accounts = set()
+    if check_types and resolution is None:
+        resolution = compile_mapping_resolution(mapping)
     
-    # Get valid account types from mapping configuration (config-driven)
-    valid_types = set(mapping['account_types'].keys())
+    errors = find_account_errors(accounts, mapping, resolution, check_types, workers)
     
-    for account in accounts:
-        # Check required fields
-        required_fields = ['NAME', 'ACCNTTYPE']
-        missing = [f for f in required_fields if f not in account]
-        if missing:
-            raise ValidationError(f"Account missing required fields: {', '.join(missing)}")
-            
-        # Validate account name format - allow common business characters including periods, parentheses, and asterisks
-        if not re.match(r"^[A-Za-z0-9*][A-Za-z0-9:_\-'&.()* ]*$", account['NAME']):
-            raise ValidationError(f"Invalid account name format: {account['NAME']}")
-            
-        # Check for duplicates
-        if account['NAME'] in seen_accounts:
-            raise ValidationError(f"Duplicate account name: {account['NAME']}")
-        seen_accounts.add(account['NAME'])
-        
-        # Validate account type using config-driven validation
-        if account['ACCNTTYPE'] not in valid_types:
-            raise ValidationError(
-                f"Invalid account type: {account['ACCNTTYPE']} "
-                f"(not found in mapping configuration). "
-                f"Valid types: {', '.join(sorted(valid_types))}"
-            )
+    if errors:
+        for index, message in errors:
+            logging.debug(f"[ACCOUNTS-VALIDATION] Record {index}: {message}")
+        if check_types:
+            logging.debug(f"[ACCOUNTS-VALIDATION] Valid types: {', '.join(sorted(resolution.types))}")
+        
+        shown = '; '.join(f"record {index}: {message}" for index, message in errors[:MAX_REPORTED_ERRORS])
+        more = f"; ... {len(errors) - MAX_REPORTED_ERRORS} more (see log)" if len(errors) > MAX_REPORTED_ERRORS else ""
+        raise ValidationError(f"{len(errors)} account validation errors in {len(accounts)} records: {shown}{more}")
     
     logging.info(f"Validated {len(accounts)} accounts using config-driven validation")
 
@@ -0,0 +1,7 @@
+"""Entry point for budgets processing pipeline."""
+
+# Clean module interface - only expose the main pipeline function
+from .budgets import run_budgets_pipeline
+
+# Domain module follows PRD interface contract
+__all__ = ['run_budgets_pipeline']
@@ -0,0 +1,164 @@
+"""Budgets module pipeline for !BUD.
+
+Each BUD record is one budget line: an account, a period type, up to twelve
+period amounts, a start date and optionally a class or customer. The period
+amounts are decoded column by column into integer-cent arrays
+(utils.amount_columns), so the per-cell work happens in C rather than in a
+Python loop over string fields. Lines are then aggregated per budget and
+account with slice sums over the sorted columns (or one NumPy reduceat when
+NumPy is installed), validated, and exported.
+
+GnuCash budgets are per account only, so class and customer budget lines for
+the same account are summed into one GnuCash budget line.
+"""
+
+from array import array
+from operator import itemgetter
+from typing import Any, Dict, List, Sequence, Tuple
+
+from utils.account_index import ACCOUNT_INDEX_KEY
+from utils.amount_columns import decode_amount_column, np, stack_columns
+from utils.error_handler import DomainDependencyError, DomainValidationError
+from utils.iif_values import parse_iif_date
+from utils.logging import log_user_info, log_user_error, timed_stage
+
+from .budgets_export import BudgetLine, export_budgets
+
+# Periods per budget year for each QBD period type
+BUDGET_PERIOD_COUNTS = {'MONTH': 12, 'QUARTER': 4, 'YEAR': 1}
+
+# Problems listed in the exception message; the total count is always reported
+MAX_REPORTED_ERRORS = 20
+
+# (start date, period type, account full name)
+BudgetKey = Tuple[str, str, str]
+
+def amount_fields(header: Sequence[str]) -> List[str]:
+    """Period amount columns in order: AMOUNT, AMOUNT_2, ... (see IIFParser)."""
+    return [field for field in header if field == 'AMOUNT' or field.startswith('AMOUNT_')]
+
+def decode_period_columns(records: List[Dict[str, str]], fields: Sequence[str]) -> List[array]:
+    """Decode every period amount column into an array of cents."""
+    return [decode_amount_column(list(map(itemgetter(field), records)), field) for field in fields]
+
+def _group_bounds(keys: List[BudgetKey], order: List[int]) -> List[Tuple[int, int]]:
+    """Contiguous [start, end) runs of equal keys in sorted order."""
+    bounds = []
+    start = 0
+    for position in range(1, len(order) + 1):
+        if position == len(order) or keys[order[position]] != keys[order[start]]:
+            bounds.append((start, position))
+            start = position
+    return bounds
+
+def aggregate_budget_lines(keys: List[BudgetKey], columns: List[array]) -> List[BudgetLine]:
+    """Sum the period columns of all records sharing a budget key.
+
+    Args:
+        keys: Budget key of each record
+        columns: Period amount columns in cents, one value per record
+
+    Returns:
+        One BudgetLine per key, in key order
+    """
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    bounds = _group_bounds(keys, order)
+    matrix = stack_columns(columns)
+    if matrix is not None:
+        sums = np.add.reduceat(matrix[order], [start for start, _ in bounds], axis=0).tolist()
+    else:
+        sorted_columns = [array('q', map(column.__getitem__, order)) for column in columns]
+        per_column = [[sum(column[start:end]) for start, end in bounds] for column in sorted_columns]
+        sums = [list(group) for group in zip(*per_column)] if per_column else [[] for _ in bounds]
+    return [BudgetLine(*keys[order[start]], end - start, amounts)
+            for (start, end), amounts in zip(bounds, sums)]
+
+def _check_unused_periods(records: List[Dict[str, str]], columns: List[array]) -> List[str]:
+    """Amounts beyond a line's period count (e.g. a 5th QUARTER amount) are errors."""
+    positions_by_type: Dict[str, List[int]] = {}
+    for position, record in enumerate(records):
+        positions_by_type.setdefault(record.get('PERIOD', ''), []).append(position)
+
+    problems = []
+    for period_type, positions in positions_by_type.items():
+        period_count = BUDGET_PERIOD_COUNTS.get(period_type, len(columns))
+        for offset, column in enumerate(columns[period_count:], start=period_count + 1):
+            if len(positions) == len(column):
+                nonzero = len(column) - column.count(0)
+            else:
+                nonzero = sum(1 for position in positions if column[position])
+            if nonzero:
+                problems.append(f"{nonzero} {period_type} budget lines have an amount in period {offset}, "
+                                f"beyond the {period_count} periods of a {period_type} budget")
+    return problems
+
+def run_budgets_pipeline(payload: Dict[str, Any]) -> bool:
+    """Main entry point for budgets processing pipeline.
+
+    Args:
+        payload: Dispatch payload containing:
+            - section: Section identifier ('BUD')
+            - records: BUD records
+            - output_dir: Directory for generated output files
+            - extra_config: Run-wide shared configuration; must hold the accounts
+              module's 'account_index'
+
+    Returns:
+        bool: True for successful completion
+
+    Raises:
+        DomainDependencyError: If the account index is not available
+        DomainValidationError: If amounts are malformed, accounts do not resolve
+            or lines have amounts beyond their period count
+    """
+    try:
+        records = payload.get('records', [])
+        output_dir = payload.get('output_dir', 'output')
+        extra_config = payload.get('extra_config', {})
+        log_user_info(f"[BUDGETS-PIPELINE] Starting budget processing with {len(records)} budget lines")
+
+        index = extra_config.get(ACCOUNT_INDEX_KEY)
+        if index is None:
+            raise DomainDependencyError("Account index not available: the ACCNT section must be converted "
+                                        "before BUD (place the account list before budgets)")
+
+        problems: List[str] = []
+        with timed_stage('BUDGETS-PIPELINE', 'decode', {'lines': len(records)}) as counts:
+            fields = amount_fields(list(records[0])) if records else []
+            try:
+                columns = decode_period_columns(records, fields)
+            except ValueError as e:
+                raise DomainValidationError(f"Invalid budget amount: {str(e)}")
+            counts.update(periods=len(fields), cells=len(records) * len(fields))
+
+        with timed_stage('BUDGETS-PIPELINE', 'aggregate') as counts:
+            keys: List[BudgetKey] = []
+            for position, record in enumerate(records, start=1):
+                account_name = record.get('ACCNT', '')
+                full_name = index.resolve(account_name)
+                if full_name is None:
+                    problems.append(f"Budget line {position}: account '{account_name}' not found in converted accounts")
+                try:
+                    start = parse_iif_date(record.get('STARTDATE', ''))
+                except ValueError as e:
+                    problems.append(f"Budget line {position}: {str(e)}")
+                    start = None
+                keys.append((start.isoformat() if start else '', record.get('PERIOD', ''), full_name or ''))
+            problems.extend(_check_unused_periods(records, columns))
+            if problems:
+                more = f"\n... and {len(problems) - MAX_REPORTED_ERRORS} more" if len(problems) > MAX_REPORTED_ERRORS else ""
+                raise DomainValidationError(f"{len(problems)} budget errors:\n"
+                                            + "\n".join(problems[:MAX_REPORTED_ERRORS]) + more)
+
+            lines = aggregate_budget_lines(keys, columns)
+            # Lines whose periods are all zero carry nothing for GnuCash
+            lines = [line for line in lines if any(line.amounts)]
+            counts.update(accounts=len(lines))
+
+        budget_count = export_budgets(lines, BUDGET_PERIOD_COUNTS, output_dir)
+        log_user_info(f"[BUDGETS-PIPELINE] Generated budgets.csv ({budget_count} budgets, {len(lines)} account lines)")
+        return True
+
+    except Exception as e:
+        log_user_error(f"[BUDGETS-PIPELINE] Budget processing failed: {str(e)}")
+        raise
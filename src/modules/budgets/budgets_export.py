@@ -0,0 +1,61 @@
+"""Budget export in the GnuCash budget editor layout.
+
+One row per budget and account with one column per period, amounts in the
+account's natural sign as GnuCash stores them (income budgets negative, as in
+QuickBooks). Budgets are named after their start date and period type.
+"""
+
+import csv
+import os
+from typing import Dict, List, NamedTuple
+
+from utils.error_handler import OutputWriteError
+from utils.iif_values import format_cents
+from utils.logging import log_technical_lazy
+from utils.output_writer import AtomicOutputFile
+
+class BudgetLine(NamedTuple):
+    """Aggregated budget amounts of one account in one budget."""
+    start_date: str         # ISO date
+    period_type: str        # QBD PERIOD, e.g. 'MONTH'
+    full_account_name: str
+    source_lines: int       # BUD records summed into this line
+    amounts: List[int]      # Cents per period
+
+BUDGET_COLUMNS = ('Budget', 'Start Date', 'Period Type', 'Full Account Name', 'Source Lines')
+
+def budget_name(start_date: str, period_type: str) -> str:
+    return f"QuickBooks {period_type.lower()} budget from {start_date}"
+
+def export_budgets(lines: List[BudgetLine], period_counts: Dict[str, int], output_dir: str) -> int:
+    """Write output/budgets.csv.
+
+    Args:
+        lines: Aggregated budget lines, grouped by budget
+        period_counts: Periods per QBD period type (unknown types export every period)
+        output_dir: Directory for output file
+
+    Returns:
+        Number of distinct budgets written
+    """
+    period_columns = max((len(line.amounts) for line in lines), default=0)
+    header = BUDGET_COLUMNS + tuple(f"Period {period}" for period in range(1, period_columns + 1))
+    output_path = os.path.join(output_dir, 'budgets.csv')
+    budgets = set()
+    try:
+        with AtomicOutputFile(output_path) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for line in lines:
+                budgets.add((line.start_date, line.period_type))
+                period_count = period_counts.get(line.period_type, len(line.amounts))
+                amounts = [format_cents(cents) for cents in line.amounts[:period_count]]
+                amounts.extend([''] * (period_columns - len(amounts)))
+                writer.writerow((budget_name(line.start_date, line.period_type), line.start_date,
+                                 line.period_type, line.full_account_name, line.source_lines, *amounts))
+    except OSError as e:
+        raise OutputWriteError(f"Failed to write budgets CSV to {output_path}: {str(e)}")
+
+    log_technical_lazy("[BUDGETS-EXPORT] Output file: %s, %d budgets (sha256 %s, %s)", output_path, len(budgets),
+                       f.result.digest[:12], 'updated' if f.result.changed else 'unchanged')
+    return len(budgets)
@@ -0,0 +1,7 @@
+"""Entry points for the items pipelines (CUSTITEMDICT, INVITEM)."""
+
+# Clean module interface - only expose the pipeline functions
+from .items import run_item_custom_fields_pipeline, run_items_pipeline
+
+# Domain module follows PRD interface contract
+__all__ = ['run_item_custom_fields_pipeline', 'run_items_pipeline']
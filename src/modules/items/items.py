@@ -0,0 +1,170 @@
+"""Items module pipeline for !INVITEM (and its !CUSTITEMDICT labels).
+
+INVITEM arrives in two layouts: item definitions, which reference income,
+expense, COGS and inventory asset accounts by QBD name, and group items (GRP,
+STAX) each followed by its member items. Account references are checked in
+bulk against the AccountIndex the accounts module published, one hash lookup
+per reference, and every dangling reference is flagged in the output and the
+log instead of stopping at the first one.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from utils.account_index import ACCOUNT_INDEX_KEY
+from utils.custom_fields import CUSTOM_FIELD_PREFIX, compile_custom_field_join
+from utils.error_handler import DomainDependencyError
+from utils.iif_values import unquote_iif
+from utils.logging import log_user_info, log_user_error, log_technical_lazy, timed_stage
+
+from .items_export import ItemAccounts, export_item_groups, export_item_mapping
+
+# extra_config keys: item name -> ItemAccounts, and CUSTITEMDICT labels
+ITEM_INDEX_KEY = 'item_index'
+ITEM_CUSTOM_FIELD_KEY = 'item_custom_fields'
+
+# Account reference columns of item definitions
+ITEM_ACCOUNT_FIELDS = ('ACCNT', 'ASSETACCNT', 'COGSACCNT')
+
+# Item types whose records in the group layout are followed by member items
+GROUP_ITEM_TYPES = frozenset({'GRP', 'STAX'})
+
+# Purchases of inventory items post to the inventory asset account
+INVENTORY_ITEM_TYPES = frozenset({'INVENTORY', 'INVENTORYASSEMBLY'})
+
+# Dangling references listed individually in the log; the total count is always reported
+MAX_REPORTED_REFERENCES = 20
+
+Group = Tuple[str, str, str, List[str]]
+
+def split_item_records(records: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], List[Group]]:
+    """Separate item definitions from the group layout.
+
+    Returns:
+        (definition records, [(group name, group type, description, member names)])
+    """
+    definitions = []
+    groups: List[Group] = []
+    for record in records:
+        if 'ACCNT' in record:
+            definitions.append(record)
+            continue
+        item_type = record.get('INVITEMTYPE', '')
+        name = unquote_iif(record.get('NAME', ''))
+        if item_type in GROUP_ITEM_TYPES:
+            groups.append((name, item_type, unquote_iif(record.get('DESC', '')), []))
+        elif groups:
+            groups[-1][3].append(name)
+        else:
+            logging.warning(f"[ITEMS-PIPELINE] Item '{name}' in the group layout does not follow a group item")
+    return definitions, groups
+
+def _bill_account_field(record: Dict[str, str]) -> str:
+    """Column holding the account purchases of this item post to."""
+    if record.get('INVITEMTYPE', '') in INVENTORY_ITEM_TYPES:
+        return 'ASSETACCNT'
+    # Two-sided items keep the purchase account in COGSACCNT
+    return 'COGSACCNT' if record.get('COGSACCNT') else 'ACCNT'
+
+def run_item_custom_fields_pipeline(payload: Dict[str, Any]) -> bool:
+    """Resolve CUSTITEMDICT labels once for the items module.
+
+    Args:
+        payload: Dispatch payload; labels are published in extra_config under
+            'item_custom_fields'
+
+    Returns:
+        bool: True for successful completion
+    """
+    labels = {}
+    for record in payload.get('records', []):
+        position = record.get('INDEX', '').strip()
+        label = unquote_iif(record.get('LABEL', '')).strip()
+        if position.isdigit() and label and record.get('INUSE', '').strip().upper() == 'Y':
+            labels[f"{CUSTOM_FIELD_PREFIX}{int(position) + 1}"] = label
+    payload.get('extra_config', {})[ITEM_CUSTOM_FIELD_KEY] = labels
+    log_technical_lazy("[CUSTITEMDICT-PIPELINE] Item custom fields: %s",
+                       ', '.join(f"{field}={label}" for field, label in labels.items()) or 'none')
+    return True
+
+def run_items_pipeline(payload: Dict[str, Any]) -> bool:
+    """Main entry point for items processing pipeline.
+
+    Args:
+        payload: Dispatch payload containing:
+            - section: Section identifier ('INVITEM')
+            - records: INVITEM records of both layouts
+            - output_dir: Directory for generated output files
+            - extra_config: Run-wide shared configuration; must hold the accounts
+              module's 'account_index'; receives 'item_index' (item name -> ItemAccounts)
+
+    Returns:
+        bool: True for successful completion
+
+    Raises:
+        DomainDependencyError: If the account index is not available
+    """
+    try:
+        records = payload.get('records', [])
+        output_dir = payload.get('output_dir', 'output')
+        extra_config = payload.get('extra_config', {})
+        log_user_info(f"[ITEMS-PIPELINE] Starting item processing with {len(records)} records")
+
+        index = extra_config.get(ACCOUNT_INDEX_KEY)
+        if index is None:
+            raise DomainDependencyError("Account index not available: the ACCNT section must be converted "
+                                        "before INVITEM (place the account list before items)")
+
+        with timed_stage('ITEMS-PIPELINE', 'resolve', {'records': len(records)}) as counts:
+            definitions, groups = split_item_records(records)
+
+            # One pass over every account reference; dangling ones grouped by item
+            dangling: Dict[int, List[str]] = {}
+            for position, field, value in index.find_unresolved(definitions, ITEM_ACCOUNT_FIELDS):
+                dangling.setdefault(position, []).append(f"{field} '{value}'")
+
+            header = list(definitions[0]) if definitions else []
+            custom_fields = compile_custom_field_join(header, extra_config.get(ITEM_CUSTOM_FIELD_KEY, {}))
+
+            resolve = index.resolve
+            item_index: Dict[str, ItemAccounts] = {}
+            rows = []
+            for position, record in enumerate(definitions):
+                name = unquote_iif(record.get('NAME', ''))
+                inventory = record.get('INVITEMTYPE', '') in INVENTORY_ITEM_TYPES
+                accounts = ItemAccounts(resolve(record.get('ACCNT', '')) or '',
+                                        resolve(record.get(_bill_account_field(record), '')) or '',
+                                        resolve(record.get('ASSETACCNT', '')) or '',
+                                        (resolve(record.get('COGSACCNT', '')) or '') if inventory else '')
+                item_index[name] = accounts
+                rows.append((name, record.get('INVITEMTYPE', ''), unquote_iif(record.get('DESC', '')),
+                             unquote_iif(record.get('PURCHASEDESC', '')), accounts.invoice_account,
+                             accounts.bill_account, accounts.asset_account, accounts.cogs_account, unquote_iif(record.get('PRICE', '')),
+                             unquote_iif(record.get('COST', '')), record.get('TAXABLE', ''), record.get('HIDDEN', ''),
+                             '; '.join(custom_fields(record)), '; '.join(dangling.get(position, ()))))
+
+            # Group members must name item definitions
+            dangling_members = [(group, member) for group, _, _, members in groups
+                                for member in members if member not in item_index]
+            reference_count = sum(len(problems) for problems in dangling.values()) + len(dangling_members)
+            counts.update(items=len(rows), groups=len(groups), dangling=reference_count)
+
+        extra_config[ITEM_INDEX_KEY] = item_index
+        export_item_mapping(rows, output_dir)
+        export_item_groups(groups, output_dir)
+
+        if reference_count:
+            messages = [f"Item '{rows[position][0]}': {', '.join(problems)} not found in converted accounts"
+                        for position, problems in dangling.items()]
+            messages += [f"Group '{group}': member item '{member}' not found" for group, member in dangling_members]
+            for message in messages[:MAX_REPORTED_REFERENCES]:
+                logging.warning(f"[ITEMS-PIPELINE] {message}")
+            log_user_info(f"[ITEMS-PIPELINE] {reference_count} dangling references flagged in items.csv "
+                          f"'Unresolved' column and the log file")
+
+        log_user_info(f"[ITEMS-PIPELINE] Generated items.csv ({len(rows)} items) and item_groups.csv ({len(groups)} groups)")
+        return True
+
+    except Exception as e:
+        log_user_error(f"[ITEMS-PIPELINE] Item processing failed: {str(e)}")
+        raise
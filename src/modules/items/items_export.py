@@ -0,0 +1,53 @@
+"""Item-to-account mapping and item group exports.
+
+GnuCash invoice and bill entries each post to one account, so every item is
+exported with the GnuCash full name of the account its sales post to and the
+account its purchases post to. Group items (GRP, STAX) are exported with their
+member items. Neither file is a GnuCash import; they are the lookup tables the
+invoice and bill conversion, or manual re-entry, works from.
+"""
+
+import csv
+import os
+from typing import Iterable, List, NamedTuple, Tuple
+
+from utils.error_handler import OutputWriteError
+from utils.logging import log_technical_lazy
+from utils.output_writer import AtomicOutputFile, OutputWriteResult
+
+ITEM_MAPPING_COLUMNS = (
+    'Item', 'Type', 'Description', 'Purchase Description', 'Invoice Account', 'Bill Account',
+    'Inventory Asset Account', 'COGS Account', 'Price', 'Cost', 'Taxable', 'Hidden', 'Notes', 'Unresolved'
+)
+
+ITEM_GROUP_COLUMNS = ('Group', 'Group Type', 'Description', 'Item')
+
+class ItemAccounts(NamedTuple):
+    """Accounts an item posts to, as GnuCash full names ('' when not set or unresolved)."""
+    invoice_account: str
+    bill_account: str
+    asset_account: str
+    cogs_account: str       # Inventory items only
+
+def _write_csv(output_path: str, columns: Tuple[str, ...], rows: Iterable[Tuple[str, ...]],
+               label: str) -> OutputWriteResult:
+    try:
+        with AtomicOutputFile(output_path) as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+    except OSError as e:
+        raise OutputWriteError(f"Failed to write {label} CSV to {output_path}: {str(e)}")
+    log_technical_lazy("[ITEMS-EXPORT] Output file: %s (sha256 %s, %s)", output_path,
+                       f.result.digest[:12], 'updated' if f.result.changed else 'unchanged')
+    return f.result
+
+def export_item_mapping(rows: Iterable[Tuple[str, ...]], output_dir: str) -> OutputWriteResult:
+    """Write output/items.csv from rows in ITEM_MAPPING_COLUMNS order."""
+    return _write_csv(os.path.join(output_dir, 'items.csv'), ITEM_MAPPING_COLUMNS, rows, 'item mapping')
+
+def export_item_groups(groups: List[Tuple[str, str, str, List[str]]], output_dir: str) -> OutputWriteResult:
+    """Write output/item_groups.csv, one row per group member (one blank-member row for empty groups)."""
+    rows = ((name, item_type, description, member)
+            for name, item_type, description, members in groups for member in (members or ('',)))
+    return _write_csv(os.path.join(output_dir, 'item_groups.csv'), ITEM_GROUP_COLUMNS, rows, 'item group')
@@ -0,0 +1,7 @@
+"""Declarative list module schemas."""
+
+# Clean module interface - only expose the schema declarations
+from .list_modules import LIST_MODULE_SCHEMAS
+
+# Domain module follows PRD interface contract
+__all__ = ['LIST_MODULE_SCHEMAS']
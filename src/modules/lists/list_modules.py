@@ -0,0 +1,50 @@
+"""Declarative QBD list modules.
+
+Each simple list is declared as a ListModuleSchema and compiled by core's
+register_list_module. GnuCash has no CSV importer for these lists, so they are
+exported as reference CSVs for re-entry (billing terms) or for use as
+transfer/memo vocabularies.
+"""
+
+from utils.list_schema import ListField, ListModuleSchema
+
+def yes_no_flag(value: str) -> str:
+    """QBD Y/N flag to the T/F convention used by the account CSV."""
+    return 'T' if value.strip().upper() == 'Y' else 'F'
+
+def percent_value(value: str) -> str:
+    """'2.0%' -> '2.0'."""
+    return value.strip().rstrip('%')
+
+def terms_type(value: str) -> str:
+    """QBD TERMSTYPE to the GnuCash billing term type."""
+    return 'proximo' if value.strip() == '1' else 'days'
+
+def _name_list(section: str, output_filename: str) -> ListModuleSchema:
+    """Lists that carry only a name and the hidden flag."""
+    return ListModuleSchema(section, output_filename, (
+        ListField('Name', 'NAME'),
+        ListField('Hidden', 'HIDDEN', yes_no_flag),
+    ))
+
+LIST_MODULE_SCHEMAS = (
+    _name_list('CLASS', 'classes.csv'),
+    _name_list('CTYPE', 'customer_types.csv'),
+    _name_list('VTYPE', 'vendor_types.csv'),
+    _name_list('JOBTYPE', 'job_types.csv'),
+    _name_list('PAYMETH', 'payment_methods.csv'),
+    _name_list('SHIPMETH', 'shipping_methods.csv'),
+    _name_list('INVMEMO', 'invoice_memos.csv'),
+    ListModuleSchema('TERMS', 'billing_terms.csv', (
+        ListField('Name', 'NAME'),
+        ListField('Type', 'TERMSTYPE', terms_type),
+        ListField('Due Days', 'STDDUEDAYS', default='0'),
+        ListField('Discount Days', 'STDDISCDAYS', default='0'),
+        ListField('Discount Percent', 'DISCPER', percent_value, default='0'),
+        # Date-driven (proximo) terms use the day-of-month fields instead of the day counts
+        ListField('Due Day Of Month', 'DAYOFMONTHDUE', default='0'),
+        ListField('Discount Day Of Month', 'DISCDAYOFMONTH', default='0'),
+        ListField('Cutoff Days', 'DATEMINDAYS', default='0'),
+        ListField('Hidden', 'HIDDEN', yes_no_flag),
+    )),
+)
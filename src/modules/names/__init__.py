@@ -0,0 +1,11 @@
+"""Entry points for the name list pipelines (CUSTNAMEDICT, CUST, VEND, OTHERNAME)."""
+
+# Clean module interface - only expose the pipeline functions
+from .names import (
+    run_custom_fields_pipeline, run_customers_pipeline, run_vendors_pipeline, run_other_names_pipeline
+)
+from .names_duplicates import run_duplicate_report
+
+# Domain module follows PRD interface contract
+__all__ = ['run_custom_fields_pipeline', 'run_customers_pipeline', 'run_vendors_pipeline',
+           'run_other_names_pipeline', 'run_duplicate_report']
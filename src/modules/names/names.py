@@ -0,0 +1,170 @@
+"""Name list pipelines: CUSTNAMEDICT, CUST, VEND and OTHERNAME.
+
+CUSTNAMEDICT is registered first and publishes the resolved custom-field labels;
+the name modules then export GnuCash customer and vendor CSVs in one pass over
+their records, joining custom fields through a precompiled itemgetter, and add
+every name to the shared NameIndex so names used in more than one list are
+reported.
+"""
+
+import csv
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+from utils.error_handler import OutputWriteError
+from utils.iif_values import unquote_iif
+from utils.logging import log_user_info, log_user_error, log_technical_lazy, timed_stage
+from utils.list_schema import ListModuleSchema
+from utils.name_index import NAME_INDEX_KEY, NameIndex
+from utils.output_writer import AtomicOutputFile
+
+from .names_fields import CUSTOM_FIELD_INDEX_KEY, CustomFieldIndex, compile_custom_field_join
+from .names_export import (
+    CUSTOMER_JOB_COLUMNS, CUSTOMER_SCHEMA, GNUCASH_CUSTOMER_COLUMNS, GNUCASH_VENDOR_COLUMNS,
+    JOB_SEPARATOR, OTHER_NAME_SCHEMA, VENDOR_SCHEMA, compile_name_row
+)
+
+# Duplicate names listed individually in the log; the total count is always reported
+MAX_REPORTED_DUPLICATES = 20
+
+def _export_names(section: str, records: List[Dict[str, str]], payload: Dict[str, Any],
+                  schema: ListModuleSchema, columns: Tuple[str, ...],
+                  split_jobs: bool = False) -> Tuple[int, List[Dict[str, str]]]:
+    """Write one name list and index its names.
+
+    Returns:
+        (rows written, job records set aside when split_jobs is set)
+    """
+    output_dir = payload.get('output_dir', 'output')
+    extra_config = payload.get('extra_config', {})
+    domain = f"{section}-PIPELINE"
+
+    name_index = extra_config.setdefault(NAME_INDEX_KEY, NameIndex())
+    header = list(records[0]) if records else []
+    custom_fields = extra_config.get(CUSTOM_FIELD_INDEX_KEY)
+    if custom_fields is not None:
+        join = custom_fields.join_for(section, header)
+    else:
+        join = compile_custom_field_join(header, {})
+    row_for = compile_name_row(schema, join)
+
+    output_path = os.path.join(output_dir, schema.output_filename)
+    duplicates_before = len(name_index.duplicates)
+    jobs = []
+    row_count = 0
+    with timed_stage(domain, 'export', {'records': len(records)}) as counts:
+        try:
+            with AtomicOutputFile(output_path) as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for record in records:
+                    name = unquote_iif(record.get('NAME', ''))
+                    if split_jobs and JOB_SEPARATOR in name:
+                        jobs.append(record)
+                        continue
+                    row = row_for(record)
+                    writer.writerow(row)
+                    name_index.add(section, name, row[0])
+                    row_count += 1
+        except OSError as e:
+            raise OutputWriteError(f"Failed to write {section} CSV to {output_path}: {str(e)}")
+        new_duplicates = name_index.duplicates[duplicates_before:]
+        counts.update(rows=row_count, duplicates=len(new_duplicates))
+
+    for existing, duplicate in new_duplicates[:MAX_REPORTED_DUPLICATES]:
+        logging.warning(f"[{domain}] Name '{duplicate.name}' ({duplicate.section} {duplicate.record_id}) "
+                        f"duplicates '{existing.name}' ({existing.section} {existing.record_id})")
+    if new_duplicates:
+        log_user_info(f"[{domain}] {len(new_duplicates)} names duplicate names already converted (see log file)")
+
+    log_technical_lazy("[%s] Output file: %s (sha256 %s, %s)", domain, output_path,
+                       f.result.digest[:12], 'updated' if f.result.changed else 'unchanged')
+    return row_count, jobs
+
+def _export_customer_jobs(jobs: List[Dict[str, str]], output_dir: str, name_index: NameIndex) -> None:
+    """Write the customer jobs reference CSV (parent customer id, job name, details)."""
+    output_path = os.path.join(output_dir, 'customer_jobs.csv')
+    try:
+        with AtomicOutputFile(output_path) as f:
+            writer = csv.writer(f)
+            writer.writerow(CUSTOMER_JOB_COLUMNS)
+            for record in jobs:
+                customer, _, job_name = unquote_iif(record.get('NAME', '')).partition(JOB_SEPARATOR)
+                parent = name_index.lookup(customer)
+                customer_id = parent.record_id if parent is not None and parent.section == 'CUST' else ''
+                writer.writerow((customer_id, customer, job_name,
+                                 unquote_iif(record.get('JOBDESC', '')), unquote_iif(record.get('JOBTYPE', '')),
+                                 record.get('JOBSTATUS', '')))
+    except OSError as e:
+        raise OutputWriteError(f"Failed to write customer jobs CSV to {output_path}: {str(e)}")
+
+def run_custom_fields_pipeline(payload: Dict[str, Any]) -> bool:
+    """Resolve CUSTNAMEDICT custom-field labels once for the name modules.
+
+    Args:
+        payload: Dispatch payload; the index is published in extra_config under
+            'custom_field_index'
+
+    Returns:
+        bool: True for successful completion
+    """
+    records = payload.get('records', [])
+    index = CustomFieldIndex.from_records(records)
+    payload.get('extra_config', {})[CUSTOM_FIELD_INDEX_KEY] = index
+    for section, labels in index.labels.items():
+        log_technical_lazy("[CUSTNAMEDICT-PIPELINE] %s custom fields: %s", section,
+                           ', '.join(f"{field}={label}" for field, label in labels.items()) or 'none')
+    return True
+
+def run_customers_pipeline(payload: Dict[str, Any]) -> bool:
+    """Main entry point for the CUST pipeline.
+
+    Args:
+        payload: Dispatch payload containing:
+            - section: Section identifier ('CUST')
+            - records: CUST records
+            - output_dir: Directory for generated output files
+            - extra_config: Run-wide shared configuration; optional 'custom_field_index'
+              from CUSTNAMEDICT; receives the shared 'name_index'
+
+    Returns:
+        bool: True for successful completion
+    """
+    try:
+        records = payload.get('records', [])
+        log_user_info(f"[CUST-PIPELINE] Starting customer processing with {len(records)} records")
+        row_count, jobs = _export_names('CUST', records, payload, CUSTOMER_SCHEMA,
+                                        GNUCASH_CUSTOMER_COLUMNS, split_jobs=True)
+        if jobs:
+            _export_customer_jobs(jobs, payload.get('output_dir', 'output'),
+                                  payload.get('extra_config', {})[NAME_INDEX_KEY])
+        log_user_info(f"[CUST-PIPELINE] Generated customers.csv ({row_count} customers, {len(jobs)} jobs)")
+        return True
+    except Exception as e:
+        log_user_error(f"[CUST-PIPELINE] Customer processing failed: {str(e)}")
+        raise
+
+def run_vendors_pipeline(payload: Dict[str, Any]) -> bool:
+    """Main entry point for the VEND pipeline (see run_customers_pipeline)."""
+    try:
+        records = payload.get('records', [])
+        log_user_info(f"[VEND-PIPELINE] Starting vendor processing with {len(records)} records")
+        row_count, _ = _export_names('VEND', records, payload, VENDOR_SCHEMA, GNUCASH_VENDOR_COLUMNS)
+        log_user_info(f"[VEND-PIPELINE] Generated vendors.csv ({row_count} vendors)")
+        return True
+    except Exception as e:
+        log_user_error(f"[VEND-PIPELINE] Vendor processing failed: {str(e)}")
+        raise
+
+def run_other_names_pipeline(payload: Dict[str, Any]) -> bool:
+    """Main entry point for the OTHERNAME pipeline (see run_customers_pipeline)."""
+    try:
+        records = payload.get('records', [])
+        log_user_info(f"[OTHERNAME-PIPELINE] Starting other name processing with {len(records)} records")
+        row_count, _ = _export_names('OTHERNAME', records, payload, OTHER_NAME_SCHEMA, GNUCASH_VENDOR_COLUMNS)
+        log_user_info(f"[OTHERNAME-PIPELINE] Generated other_names.csv ({row_count} names)")
+        return True
+    except Exception as e:
+        log_user_error(f"[OTHERNAME-PIPELINE] Other name processing failed: {str(e)}")
+        raise
@@ -0,0 +1,70 @@
+"""Near-duplicate name review report.
+
+Runs as a core finalizer once all sections are dispatched, so customer, vendor
+and account names from every input file are checked together. Customer and
+vendor names are compared with each other; accounts only with their siblings,
+by leaf name, since a shared parent path would make any two siblings look alike.
+Candidates are written to output/duplicate_candidates.csv for review; nothing
+is merged automatically.
+"""
+
+import csv
+import os
+from typing import Any, Dict, List
+
+from utils.account_index import ACCOUNT_INDEX_KEY
+from utils.duplicate_finder import NameCandidate, find_duplicate_candidates
+from utils.error_handler import OutputWriteError
+from utils.logging import log_user_info, log_technical_lazy
+from utils.name_index import NAME_INDEX_KEY
+from utils.output_writer import AtomicOutputFile
+
+DUPLICATE_REPORT_FILENAME = 'duplicate_candidates.csv'
+
+DUPLICATE_REPORT_COLUMNS = ('Score', 'List A', 'Name A', 'List B', 'Name B')
+
+# Name lists checked for near-duplicates
+DUPLICATE_NAME_SECTIONS = frozenset({'CUST', 'VEND'})
+
+def collect_name_candidates(extra_config: Dict[str, Any]) -> List[NameCandidate]:
+    """Gather CUST/VEND names from the shared name index and ACCNT leaf names from the account index."""
+    candidates = []
+    name_index = extra_config.get(NAME_INDEX_KEY)
+    if name_index is not None:
+        entries = list(name_index.entries.values()) + [duplicate for _, duplicate in name_index.duplicates]
+        candidates.extend(NameCandidate('names', entry.section, entry.name)
+                          for entry in entries if entry.section in DUPLICATE_NAME_SECTIONS)
+    account_index = extra_config.get(ACCOUNT_INDEX_KEY)
+    if account_index is not None:
+        for name in account_index.by_qbd_name:
+            parent, _, leaf = name.rpartition(':')
+            candidates.append(NameCandidate(f"accounts:{parent}", 'ACCNT', name, leaf))
+    return candidates
+
+def run_duplicate_report(payload: Dict[str, Any]) -> bool:
+    """Write the near-duplicate review report for the run.
+
+    Args:
+        payload: Finalizer payload with output_dir and the run's extra_config
+
+    Returns:
+        bool: True for successful completion
+    """
+    output_dir = payload.get('output_dir', 'output')
+    candidates = collect_name_candidates(payload.get('extra_config', {}))
+    pairs = find_duplicate_candidates(candidates)
+
+    output_path = os.path.join(output_dir, DUPLICATE_REPORT_FILENAME)
+    try:
+        with AtomicOutputFile(output_path) as f:
+            writer = csv.writer(f)
+            writer.writerow(DUPLICATE_REPORT_COLUMNS)
+            writer.writerows((f"{pair.score:.3f}", pair.first.section, pair.first.name,
+                              pair.second.section, pair.second.name) for pair in pairs)
+    except OSError as e:
+        raise OutputWriteError(f"Failed to write duplicate report to {output_path}: {str(e)}")
+
+    log_technical_lazy("[DUPLICATES] Checked %d names, %d candidate pairs", len(candidates), len(pairs))
+    if pairs:
+        log_user_info(f"[DUPLICATES] {len(pairs)} possible duplicate names listed in {DUPLICATE_REPORT_FILENAME} for review")
+    return True
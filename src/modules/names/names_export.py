@@ -0,0 +1,91 @@
+"""Customer and vendor export to the GnuCash customer/vendor import CSV layout.
+
+GnuCash's "Import Customers & Vendors" reads a fixed column order; vendors use
+the first eleven customer columns. The address block of a QBD record is its
+name line (BADDR1/ADDR1) followed by up to four address lines. Fields GnuCash
+has no column for (notes, notepad, custom fields) are folded into 'notes'.
+"""
+
+from typing import Callable, Dict, List, Sequence
+
+from utils.iif_values import unquote_iif
+from utils.list_schema import ListField, ListModuleSchema, compile_row_transformer
+
+# Exact GnuCash customer import columns, in CSV order
+GNUCASH_CUSTOMER_COLUMNS = (
+    'id', 'company', 'name', 'addr1', 'addr2', 'addr3', 'addr4', 'phone', 'fax', 'email',
+    'notes', 'shipname', 'shipaddr1', 'shipaddr2', 'shipaddr3', 'shipaddr4', 'shipphone',
+    'shipfax', 'shipemail'
+)
+
+# Vendors use the customer layout without the shipping block
+GNUCASH_VENDOR_COLUMNS = GNUCASH_CUSTOMER_COLUMNS[:11]
+
+# Position of 'notes', which is assembled from several fields
+NOTES_COLUMN = GNUCASH_CUSTOMER_COLUMNS.index('notes')
+
+# Reference CSV of customer jobs (GnuCash has no CSV job importer)
+CUSTOMER_JOB_COLUMNS = ('Customer ID', 'Customer', 'Job Name', 'Description', 'Job Type', 'Job Status')
+
+# One line per CSV record: the importer reads the file line by line
+NOTES_SEPARATOR = '; '
+
+# QBD job names are 'Customer:Job' (or deeper)
+JOB_SEPARATOR = ':'
+
+def gnucash_id(refnum: str) -> str:
+    """QBD REFNUM to a GnuCash style zero-padded id."""
+    return refnum.strip().zfill(6)
+
+def _text(column: str, source: str) -> ListField:
+    return ListField(column, source, unquote_iif)
+
+# Customer and vendor columns other than 'notes'
+CUSTOMER_SCHEMA = ListModuleSchema('CUST', 'customers.csv', (
+    ListField('id', 'REFNUM', gnucash_id),
+    _text('company', 'NAME'),
+    _text('name', 'BADDR1'),
+    _text('addr1', 'BADDR2'), _text('addr2', 'BADDR3'), _text('addr3', 'BADDR4'), _text('addr4', 'BADDR5'),
+    _text('phone', 'PHONE1'), _text('fax', 'FAXNUM'), _text('email', 'EMAIL'),
+    _text('shipname', 'SADDR1'),
+    _text('shipaddr1', 'SADDR2'), _text('shipaddr2', 'SADDR3'), _text('shipaddr3', 'SADDR4'),
+    _text('shipaddr4', 'SADDR5'),
+    ListField('shipphone', None), ListField('shipfax', None), ListField('shipemail', None),
+))
+
+VENDOR_SCHEMA = ListModuleSchema('VEND', 'vendors.csv', (
+    ListField('id', 'REFNUM', gnucash_id),
+    _text('company', 'NAME'),
+    _text('name', 'ADDR1'),
+    _text('addr1', 'ADDR2'), _text('addr2', 'ADDR3'), _text('addr3', 'ADDR4'), _text('addr4', 'ADDR5'),
+    _text('phone', 'PHONE1'), _text('fax', 'FAXNUM'), _text('email', 'EMAIL'),
+))
+
+# OTHERNAME has no GnuCash counterpart; it is exported in the vendor layout for reference
+OTHER_NAME_SCHEMA = ListModuleSchema('OTHERNAME', 'other_names.csv', (
+    ListField('id', 'REFNUM', gnucash_id),
+    _text('company', 'NAME'),
+    _text('name', 'BADDR1'),
+    _text('addr1', 'BADDR2'), _text('addr2', 'BADDR3'), _text('addr3', 'BADDR4'), _text('addr4', 'BADDR5'),
+    _text('phone', 'PHONE1'), _text('fax', 'FAXNUM'), _text('email', 'EMAIL'),
+))
+
+def compile_name_row(schema: ListModuleSchema,
+                     custom_fields: Callable[[Dict[str, str]], List[str]]) -> Callable[[Dict[str, str]], Sequence[str]]:
+    """Compile the full export row: schema columns with 'notes' assembled in place.
+
+    Args:
+        schema: Columns other than 'notes', in export order
+        custom_fields: Compiled custom-field join for the section
+
+    Returns:
+        Function mapping one record to its CSV row
+    """
+    transform = compile_row_transformer(schema)
+
+    def row(record: Dict[str, str]) -> Sequence[str]:
+        base = transform(record)
+        notes = [unquote_iif(value) for value in (record.get('NOTE', ''), record.get('NOTEPAD', '')) if value]
+        notes.extend(custom_fields(record))
+        return base[:NOTES_COLUMN] + (NOTES_SEPARATOR.join(notes),) + base[NOTES_COLUMN:]
+    return row
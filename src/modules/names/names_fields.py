@@ -0,0 +1,55 @@
+"""Custom-field definitions from !CUSTNAMEDICT.
+
+QuickBooks stores the values of name-list custom fields positionally in
+CUSTFLD1..CUSTFLD15; !CUSTNAMEDICT row INDEX n holds the label of CUSTFLD(n+1)
+and Y/N flags saying whether the field is used for customers, vendors and
+employees. The dictionary is resolved once into a CustomFieldIndex, published
+in extra_config under CUSTOM_FIELD_INDEX_KEY, and each name module turns it
+into a single itemgetter plus a label tuple for its section.
+"""
+
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from utils.custom_fields import CUSTOM_FIELD_PREFIX, compile_custom_field_join
+from utils.iif_values import unquote_iif
+
+# extra_config key under which the CUSTNAMEDICT module publishes the index
+CUSTOM_FIELD_INDEX_KEY = 'custom_field_index'
+
+# CUSTNAMEDICT flag column for each name section
+_SECTION_FLAG_COLUMNS = {'CUST': 'CUSTOMER', 'VEND': 'VENDOR', 'EMP': 'EMPLOYEE'}
+
+class CustomFieldIndex:
+    """Labels of the custom fields enabled for each name section."""
+
+    def __init__(self):
+        self.labels: Dict[str, Dict[str, str]] = {section: {} for section in _SECTION_FLAG_COLUMNS}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, str]]) -> 'CustomFieldIndex':
+        """Build the index from CUSTNAMEDICT records."""
+        index = cls()
+        for record in records:
+            position = record.get('INDEX', '').strip()
+            label = unquote_iif(record.get('LABEL', '')).strip()
+            if not position.isdigit() or not label:
+                continue
+            field = f"{CUSTOM_FIELD_PREFIX}{int(position) + 1}"
+            for section, flag_column in _SECTION_FLAG_COLUMNS.items():
+                if record.get(flag_column, '').strip().upper() == 'Y':
+                    index.labels[section][field] = label
+        return index
+
+    def join_for(self, section: str, header: Sequence[str]) -> Callable[[Dict[str, str]], List[str]]:
+        """Compile the custom-field join for one section's record layout.
+
+        Fields without an enabled label keep their data under a generic label.
+
+        Args:
+            section: Name section, e.g. 'CUST'
+            header: Field names of the section's records
+
+        Returns:
+            Function returning 'Label: value' strings for a record's non-blank custom fields
+        """
+        return compile_custom_field_join(header, self.labels.get(section, {}))
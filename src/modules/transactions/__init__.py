@@ -0,0 +1,7 @@
+"""Entry point for transactions processing pipeline."""
+
+# Clean module interface - only expose the main pipeline function
+from .transactions import run_transactions_pipeline
+
+# Domain module follows PRD interface contract
+__all__ = ['run_transactions_pipeline']
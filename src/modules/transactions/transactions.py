@@ -0,0 +1,166 @@
+"""Transactions module pipeline for !TRNS/!SPL/!ENDTRNS blocks.
+
+The IIF parser does not hold the TRNS section in memory: the payload's records
+are a StreamedSection that re-reads the file and yields each TRNS record with
+its SPL records attached once the block is complete. This pipeline consumes
+that stream one transaction at a time: amounts are converted
+to integer cents, every transaction must sum to zero, and split accounts are
+resolved through the account reference index published by the accounts module.
+Balanced transactions are written straight to rotating GnuCash CSV chunk files,
+so working memory is one transaction plus the open chunk's write buffer,
+whatever the size of the ledger.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.account_index import ACCOUNT_INDEX_KEY, AccountIndex
+from utils.error_handler import DomainDependencyError, DomainValidationError
+from utils.iif_parser import SPLITS_KEY
+from utils.iif_values import format_cents, parse_amount_cents, parse_iif_date
+from utils.logging import log_user_info, log_user_error, log_technical_detail, timed_stage
+from utils.transaction_csv import Transaction, TransactionSplit
+
+from .transactions_export import ChunkedTransactionWriter
+
+# Default rows per chunk file (extra_config['transactions_chunk_rows'] overrides)
+TRANSACTION_CHUNK_ROWS = 50000
+
+# extra_config key carrying the next chunk number across dispatches of one run
+_NEXT_CHUNK_KEY = 'transactions_next_chunk'
+
+# Errors listed in the exception message; the total count is always reported
+MAX_REPORTED_ERRORS = 20
+
+class TransactionErrors:
+    """Counts every transaction problem but keeps only the first few messages."""
+
+    def __init__(self, limit: int = MAX_REPORTED_ERRORS):
+        self.limit = limit
+        self.count = 0
+        self.messages: List[str] = []
+
+    def add(self, message: str) -> None:
+        self.count += 1
+        if len(self.messages) < self.limit:
+            self.messages.append(message)
+
+    def summary(self) -> str:
+        more = f"\n... and {self.count - len(self.messages)} more" if self.count > len(self.messages) else ""
+        return f"{self.count} transaction errors:\n" + "\n".join(self.messages) + more
+
+def _convert_transaction(position: int, record: Dict[str, Any], index: AccountIndex) -> Tuple[Optional[Transaction], List[str]]:
+    """Convert one TRNS record and its splits.
+
+    Returns:
+        (Transaction, []) when valid, otherwise (None, problem messages)
+    """
+    transaction_id = record.get('TRNSID', '') or str(position)
+    label = f"Transaction {transaction_id} (#{position})"
+    problems = []
+
+    try:
+        posted = parse_iif_date(record.get('DATE', ''))
+        if posted is None:
+            problems.append(f"{label}: missing DATE")
+    except ValueError as e:
+        problems.append(f"{label}: {str(e)}")
+
+    # The TRNS line is the first split; SPL lines follow
+    splits = []
+    total = 0
+    for line in [record] + record.get(SPLITS_KEY, []):
+        account_name = line.get('ACCNT', '')
+        full_name = index.resolve(account_name)
+        if full_name is None:
+            problems.append(f"{label}: account '{account_name}' not found in converted accounts")
+        try:
+            cents = parse_amount_cents(line.get('AMOUNT', ''))
+        except ValueError as e:
+            problems.append(f"{label}: {str(e)}")
+            cents = 0
+        total += cents
+        reconcile = 'c' if line.get('CLEAR', '').upper() == 'Y' else 'n'
+        splits.append(TransactionSplit(full_name, cents, line.get('MEMO', ''),
+                                       line.get('TRNSTYPE', ''), reconcile))
+
+    if total != 0:
+        problems.append(f"{label}: splits do not balance (off by {format_cents(total)})")
+    if problems:
+        return None, problems
+
+    return Transaction(transaction_id, posted.isoformat(), record.get('DOCNUM', ''),
+                       record.get('NAME', '') or record.get('MEMO', ''), record.get('MEMO', ''), splits), problems
+
+def iter_transactions(records: Iterable[Dict[str, Any]], index: AccountIndex,
+                      errors: TransactionErrors) -> Iterator[Transaction]:
+    """Yield balanced, resolved transactions; invalid ones are reported in errors."""
+    for position, record in enumerate(records, start=1):
+        transaction, problems = _convert_transaction(position, record, index)
+        if transaction is not None:
+            yield transaction
+        else:
+            for problem in problems:
+                errors.add(problem)
+
+def run_transactions_pipeline(payload: Dict[str, Any]) -> bool:
+    """Main entry point for transactions processing pipeline.
+
+    Args:
+        payload: Dispatch payload containing:
+            - section: Section identifier ('TRNS')
+            - records: Iterable of TRNS records, each with its SPL records under 'SPL'
+              (a StreamedSection; iterated once)
+            - output_dir: Directory for generated output files
+            - extra_config: Run-wide shared configuration; must hold the accounts
+              module's 'account_index'; optional 'transactions_chunk_rows'
+
+    Returns:
+        bool: True for successful completion
+
+    Raises:
+        DomainDependencyError: If the account index is not available
+        DomainValidationError: If any transaction is unbalanced or references unknown accounts
+    """
+    try:
+        records = payload.get('records', [])
+        output_dir = payload.get('output_dir', 'output')
+        extra_config = payload.get('extra_config', {})
+        log_user_info(f"[TRANSACTIONS-PIPELINE] Starting transactions processing with {len(records)} transactions")
+
+        index = extra_config.get(ACCOUNT_INDEX_KEY)
+        if index is None:
+            raise DomainDependencyError("Account index not available: the ACCNT section must be converted "
+                                        "before TRNS (place the account list before transactions)")
+
+        chunk_rows = extra_config.get('transactions_chunk_rows', TRANSACTION_CHUNK_ROWS)
+        writer = ChunkedTransactionWriter(output_dir, chunk_rows, index.commodity,
+                                          first_chunk=extra_config.get(_NEXT_CHUNK_KEY, 1))
+        errors = TransactionErrors()
+
+        with timed_stage('TRANSACTIONS-PIPELINE', 'convert', {'transactions': len(records)}) as counts:
+            try:
+                for transaction in iter_transactions(records, index, errors):
+                    # After the first error keep validating, but stop producing output
+                    if not errors.count:
+                        writer.write(transaction)
+            except Exception:
+                writer.discard()
+                raise
+            counts.update(splits=writer.row_count, errors=errors.count)
+
+        if errors.count:
+            writer.discard()
+            raise DomainValidationError(errors.summary())
+
+        extra_config[_NEXT_CHUNK_KEY] = writer.next_chunk
+        results = writer.commit()
+        changed = sum(1 for result in results if result.changed)
+        log_technical_detail(f"[TRANSACTIONS-PIPELINE] {writer.transaction_count} transactions, {writer.row_count} splits "
+                             f"in {len(results)} chunk files ({changed} changed)")
+        log_user_info(f"[TRANSACTIONS-PIPELINE] Generated {len(results)} transaction files "
+                      f"({writer.transaction_count} transactions, {writer.row_count} splits)")
+        return True
+
+    except Exception as e:
+        log_user_error(f"[TRANSACTIONS-PIPELINE] Transactions processing failed: {str(e)}")
+        raise
@@ -0,0 +1,85 @@
+"""Transaction export to GnuCash multi-split CSV in chunk files.
+
+Rows follow the GnuCash multi-split layout of utils.transaction_csv. Output
+rotates to a new chunk file once a file holds the configured number of rows;
+a transaction is never split across files.
+
+Chunks are written as pending AtomicOutputFile temp files and only committed
+together once the whole section has been converted, so a failed conversion
+never leaves a partial set of chunks behind.
+"""
+
+import csv
+import os
+import re
+from typing import List
+
+from utils.logging import log_technical_lazy
+from utils.output_writer import AtomicOutputFile, OutputWriteResult
+from utils.transaction_csv import TRANSACTION_CSV_COLUMNS, Transaction, transaction_rows
+
+# Chunk file naming: transactions_0001.csv, transactions_0002.csv, ...
+CHUNK_FILENAME_FORMAT = "transactions_{:04d}.csv"
+_CHUNK_FILENAME_RE = re.compile(r"^transactions_(\d{4,})\.csv$")
+
+class ChunkedTransactionWriter:
+    """Stream transactions into rotating chunk files of at most chunk_rows rows.
+
+    Only the open chunk's write buffer is held in memory; finished chunks wait
+    on disk as temp files until commit() or discard().
+    """
+
+    def __init__(self, output_dir: str, chunk_rows: int, commodity: str, first_chunk: int = 1):
+        self.output_dir = output_dir
+        self.chunk_rows = chunk_rows
+        self.commodity_label = f"CURRENCY::{commodity}"
+        self.next_chunk = first_chunk
+        self.transaction_count = 0
+        self.row_count = 0
+        self._pending: List[AtomicOutputFile] = []
+        self._current = None
+        self._writer = None
+        self._current_rows = 0
+
+    def _rotate(self) -> None:
+        if self._current is not None:
+            self._current.close()
+        path = os.path.join(self.output_dir, CHUNK_FILENAME_FORMAT.format(self.next_chunk))
+        self.next_chunk += 1
+        self._current = AtomicOutputFile(path)
+        self._current.open()
+        self._pending.append(self._current)
+        self._writer = csv.writer(self._current)
+        self._writer.writerow(TRANSACTION_CSV_COLUMNS)
+        self._current_rows = 0
+
+    def write(self, transaction: Transaction) -> None:
+        """Append one transaction, starting a new chunk first if it would not fit."""
+        split_count = len(transaction.splits)
+        if self._current is None or (self._current_rows and self._current_rows + split_count > self.chunk_rows):
+            self._rotate()
+        self._writer.writerows(transaction_rows(transaction, self.commodity_label))
+        self._current_rows += split_count
+        self.row_count += split_count
+        self.transaction_count += 1
+
+    def commit(self, remove_stale: bool = True) -> List[OutputWriteResult]:
+        """Commit every pending chunk; optionally delete higher-numbered chunks left by earlier runs."""
+        results = [chunk.commit() for chunk in self._pending]
+        self._pending = []
+        self._current = None
+        if remove_stale:
+            last_chunk = self.next_chunk - 1
+            for name in os.listdir(self.output_dir):
+                match = _CHUNK_FILENAME_RE.match(name)
+                if match and int(match.group(1)) > last_chunk:
+                    os.remove(os.path.join(self.output_dir, name))
+                    log_technical_lazy("[TRANSACTIONS-EXPORT] Removed stale chunk file %s", name)
+        return results
+
+    def discard(self) -> None:
+        """Drop every pending chunk; existing outputs stay as they were."""
+        for chunk in self._pending:
+            chunk.discard()
+        self._pending = []
+        self._current = None
@@ -0,0 +1,310 @@
+"""End-to-end benchmark suite with scaling curves.
+
+For each corpus size a synthetic IIF file is generated (tools.iif_generator,
+`size` records per large section) and every benchmark case is run on it in a
+fresh child process with its own output/ directory, so caches, snapshots and
+peak memory of one case never leak into another:
+
+- parse: IIFParser.parse of the whole file
+- load_mapping: load_mapping with a cold mapping cache (baseline mapping only, so
+  its cost does not depend on the corpus size and it is left out of the scaling analysis)
+- mapping_questions: HALT questions file for one unmapped account type per ACCNT
+  record (`size` entries): generated, every answer filled in, then parsed back
+- build_tree: build_accounts_tree over the ACCNT records
+- export_accounts: export_accounts of the built tree
+- pipeline: run_conversion_pipeline with every module registered as in main.py
+
+Each case records wall time and the child's peak RSS (which includes the
+untimed setup, e.g. parsing for build_tree); a second run under tracemalloc
+records the Python heap peak of the timed call alone (tracemalloc slows
+execution, so it never shares a run with the timing). Results go to a JSON file together with the scaling
+exponent between consecutive sizes, log(t2/t1) / log(n2/n1): about 1 for
+linear work, flagged as super-linear above --max-exponent. The pipeline at
+10,000 records is also checked against the core PRD budget of 60 seconds.
+
+Usage (from src/):
+    python -m tools.benchmark --sizes 1000,10000,100000 --results ../benchmark_results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: peak RSS is reported as null
+    resource = None
+
+from tools.iif_generator import CorpusSizes, generate_corpus
+
+BENCHMARK_CASES = ('parse', 'load_mapping', 'mapping_questions', 'build_tree', 'export_accounts', 'pipeline')
+
+# Cases whose work does not grow with the corpus: timed, but no scaling exponent
+SIZE_INDEPENDENT_CASES = ('load_mapping',)
+
+# Answer written into every question of the mapping_questions case
+QUESTIONS_ANSWER = 'Expenses:Benchmark:Unmapped'
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+
+# Exponent above which growth between two sizes is flagged as super-linear
+DEFAULT_MAX_EXPONENT = 1.3
+
+# Measurements below this are dominated by noise and never flagged
+MIN_FLAGGED_SECONDS = 0.05
+MIN_FLAGGED_MB = 1.0
+
+# Core PRD section 13.1: 10,000 records per section in under 60 seconds
+PRD_BUDGET_RECORDS = 10000
+PRD_BUDGET_SECONDS = 60.0
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def _parse(input_path: str) -> Dict[str, Any]:
+    from utils.iif_parser import IIFParser
+    return IIFParser(input_path).parse()
+
+def _mapping():
+    from modules.accounts.accounts_mapping import compile_mapping_resolution, load_mapping
+    mapping = load_mapping()
+    return mapping, compile_mapping_resolution(mapping)
+
+def _prepare_case(case: str, input_path: str) -> Callable[[], Optional[int]]:
+    """Untimed setup of one case; returns the timed callable (which returns its record count, if any)."""
+    if case == 'parse':
+        return lambda: sum(len(records) for records in _parse(input_path).values())
+    if case == 'load_mapping':
+        return lambda: len(_mapping()[0]['account_types'])
+    if case == 'mapping_questions':
+        from modules.accounts.accounts_mapping import (
+            ANSWER_PROMPT, generate_text_mapping_questions, parse_text_mapping_file
+        )
+        accounts = [dict(record, ACCNTTYPE=f"UNMAPPED{position}")
+                    for position, record in enumerate(_parse(input_path).get('ACCNT', []))]
+        unmapped = [record['ACCNTTYPE'] for record in accounts]
+        questions_path = os.path.join('output', 'accounts_mapping_questions.txt')
+
+        def mapping_questions() -> int:
+            generate_text_mapping_questions(unmapped, accounts, 'output')
+            # The user's part: answer every question (one linear replace)
+            with open(questions_path, encoding='utf-8') as f:
+                content = f.read()
+            with open(questions_path, 'w', encoding='utf-8') as f:
+                f.write(content.replace(f"{ANSWER_PROMPT}: \n", f"{ANSWER_PROMPT}: {QUESTIONS_ANSWER}\n"))
+            return len(parse_text_mapping_file(questions_path)['account_types'])
+        return mapping_questions
+
+    from modules.accounts.accounts_tree import build_accounts_tree
+    if case in ('build_tree', 'export_accounts'):
+        accounts = _parse(input_path).get('ACCNT', [])
+        mapping, resolution = _mapping()
+        if case == 'build_tree':
+            def build_tree() -> int:
+                build_accounts_tree(accounts, mapping, resolution)
+                return len(accounts)
+            return build_tree
+
+        from modules.accounts.accounts_export import export_accounts
+        root = build_accounts_tree(accounts, mapping, resolution)
+
+        def export() -> int:
+            export_accounts(root, mapping, 'output', resolution)
+            return len(accounts)
+        return export
+
+    if case == 'pipeline':
+        from core import run_conversion_pipeline
+        from main import register_modules
+        from utils.logging import setup_logging
+        setup_logging(profile=os.environ.get('QBD_LOG_PROFILE', 'standard'))
+        register_modules()
+        config = {'iif_files': [input_path], 'input_dir': os.path.dirname(input_path), 'output_dir': 'output'}
+
+        def run_pipeline() -> None:
+            exit_code = run_conversion_pipeline(config)
+            if exit_code != 0:
+                raise RuntimeError(f"run_conversion_pipeline exited with {exit_code}")
+        return run_pipeline
+    raise ValueError(f"unknown benchmark case '{case}'")
+
+def run_case(case: str, input_path: str, with_tracemalloc: bool) -> Dict[str, Any]:
+    """Run one case in this process (the child side of run_case_isolated)."""
+    os.makedirs('output', exist_ok=True)
+    timed = _prepare_case(case, input_path)
+    if with_tracemalloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+    records = timed()
+    wall_seconds = time.perf_counter() - start
+    result = {'wall_seconds': round(wall_seconds, 4), 'peak_rss_mb': _peak_rss_mb(), 'records': records}
+    if with_tracemalloc:
+        result['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    return result
+
+def run_case_isolated(case: str, input_path: str, work_dir: str, with_tracemalloc: bool,
+                      timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+    """Run one case in a child process with a fresh working directory; None when it timed out."""
+    if os.path.exists(work_dir):
+        shutil.rmtree(work_dir)
+    os.makedirs(work_dir)
+    result_path = os.path.join(work_dir, 'result.json')
+    command = [sys.executable, '-m', 'tools.benchmark', '--run-case', case, '--input', input_path,
+               '--case-result', result_path] + (['--tracemalloc'] if with_tracemalloc else [])
+    environment = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    try:
+        completed = subprocess.run(command, cwd=work_dir, env=environment, timeout=timeout,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    except subprocess.TimeoutExpired:
+        return None
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark case '{case}' failed:\n{completed.stderr[-2000:]}")
+    with open(result_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def scaling_exponent(size_1: int, value_1: float, size_2: int, value_2: float) -> Optional[float]:
+    """Growth exponent between two measurements; None when either value is missing or zero."""
+    if not value_1 or not value_2:
+        return None
+    return round(math.log(value_2 / value_1) / math.log(size_2 / size_1), 2)
+
+def analyze_scaling(results: List[Dict[str, Any]], max_exponent: float) -> List[Dict[str, Any]]:
+    """Scaling exponents between consecutive sizes of every case, with super-linear flags."""
+    scaling = []
+    for case in BENCHMARK_CASES:
+        if case in SIZE_INDEPENDENT_CASES:
+            continue
+        points = sorted((result for result in results if result['case'] == case and not result.get('timed_out')),
+                        key=lambda result: result['size'])
+        for first, second in zip(points, points[1:]):
+            entry = {'case': case, 'from_size': first['size'], 'to_size': second['size']}
+            flags = []
+            for metric, floor in (('wall_seconds', MIN_FLAGGED_SECONDS), ('tracemalloc_peak_mb', MIN_FLAGGED_MB)):
+                exponent = scaling_exponent(first['size'], first.get(metric), second['size'], second.get(metric))
+                entry[f"{metric}_exponent"] = exponent
+                if exponent is not None and exponent > max_exponent and second.get(metric, 0) >= floor:
+                    flags.append(metric)
+            entry['super_linear'] = flags
+            scaling.append(entry)
+    return scaling
+
+def run_benchmarks(sizes: List[int], cases: List[str], seed: int, work_root: str, max_exponent: float,
+                   timeout: Optional[float], with_tracemalloc: bool) -> Dict[str, Any]:
+    """Generate one corpus per size, run every case on it and analyze scaling."""
+    results: List[Dict[str, Any]] = []
+    timed_out_cases = set()
+    for size in sorted(sizes):
+        size_dir = os.path.join(work_root, str(size))
+        os.makedirs(size_dir, exist_ok=True)
+        input_path = os.path.join(size_dir, 'corpus.IIF')
+        start = time.perf_counter()
+        corpus_records = generate_corpus(input_path, CorpusSizes.scaled(size), seed)
+        print(f"[BENCHMARK] {size}: generated {corpus_records} records "
+              f"({os.path.getsize(input_path)} bytes) in {time.perf_counter() - start:.1f}s")
+
+        for case in cases:
+            if case in timed_out_cases:
+                # A case that timed out at a smaller size would only time out again
+                results.append({'case': case, 'size': size, 'timed_out': True, 'skipped': True})
+                continue
+            result = run_case_isolated(case, input_path, os.path.join(size_dir, case), False, timeout)
+            if result is None:
+                timed_out_cases.add(case)
+                results.append({'case': case, 'size': size, 'timed_out': True})
+                print(f"[BENCHMARK] {size} {case}: timed out after {timeout}s")
+                continue
+            if with_tracemalloc:
+                traced = run_case_isolated(case, input_path, os.path.join(size_dir, case), True, timeout)
+                result['tracemalloc_peak_mb'] = traced['tracemalloc_peak_mb'] if traced else None
+            result.update(case=case, size=size)
+            results.append(result)
+            traced_peak = f", tracemalloc peak {result['tracemalloc_peak_mb']} MB" if with_tracemalloc else ""
+            print(f"[BENCHMARK] {size} {case}: {result['wall_seconds']:.3f}s, peak RSS {result['peak_rss_mb']} MB{traced_peak}")
+        os.remove(input_path)
+
+    scaling = analyze_scaling(results, max_exponent)
+    budget = [result for result in results
+              if result['case'] == 'pipeline' and result['size'] == PRD_BUDGET_RECORDS and not result.get('timed_out')]
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'max_exponent': max_exponent,
+        'results': results,
+        'scaling': scaling,
+        'super_linear': [entry for entry in scaling if entry['super_linear']],
+        'prd_budget': {'records': PRD_BUDGET_RECORDS, 'limit_seconds': PRD_BUDGET_SECONDS,
+                       'wall_seconds': budget[0]['wall_seconds'] if budget else None,
+                       'met': (budget[0]['wall_seconds'] < PRD_BUDGET_SECONDS) if budget else None},
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the conversion stages at growing corpus sizes")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated records per section (default 1000,10000,100000,1000000)")
+    parser.add_argument('--cases', default=','.join(BENCHMARK_CASES), help="comma-separated benchmark cases")
+    parser.add_argument('--results', default='benchmark_results.json', help="JSON results file")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-exponent', type=float, default=DEFAULT_MAX_EXPONENT,
+                        help="scaling exponent flagged as super-linear (default 1.3)")
+    parser.add_argument('--timeout', type=float, help="seconds per case run; larger sizes of a timed-out case are skipped")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="skip the tracemalloc runs")
+    parser.add_argument('--work-dir', help="keep corpora and outputs here instead of a temporary directory")
+    # Child-process mode used by run_case_isolated
+    parser.add_argument('--run-case', choices=BENCHMARK_CASES, help=argparse.SUPPRESS)
+    parser.add_argument('--input', help=argparse.SUPPRESS)
+    parser.add_argument('--case-result', help=argparse.SUPPRESS)
+    parser.add_argument('--tracemalloc', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        result = run_case(args.run_case, args.input, args.tracemalloc)
+        with open(args.case_result, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    unknown = [case for case in cases if case not in BENCHMARK_CASES]
+    if unknown:
+        parser.error(f"unknown benchmark cases: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    work_root = args.work_dir or tempfile.mkdtemp(prefix='qbd-benchmark-')
+    try:
+        report = run_benchmarks(sizes, cases, args.seed, work_root, args.max_exponent, args.timeout,
+                                not args.no_tracemalloc)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    with open(args.results, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    for entry in report['super_linear']:
+        print(f"[BENCHMARK] SUPER-LINEAR {entry['case']} {entry['from_size']} -> {entry['to_size']}: "
+              f"time exponent {entry['wall_seconds_exponent']}, memory exponent {entry['tracemalloc_peak_mb_exponent']}")
+    budget = report['prd_budget']
+    if budget['met'] is not None:
+        print(f"[BENCHMARK] PRD budget ({PRD_BUDGET_RECORDS} records/section < {PRD_BUDGET_SECONDS:.0f}s): "
+              f"{'met' if budget['met'] else 'MISSED'} ({budget['wall_seconds']}s)")
+    print(f"[BENCHMARK] Results written to {args.results}")
+    # Non-zero exit when scaling regressed, for use in CI
+    return 1 if report['super_linear'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
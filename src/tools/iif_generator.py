@@ -0,0 +1,404 @@
+"""Deterministic synthetic IIF corpus generator for scale testing.
+
+Writes a QuickBooks Desktop style IIF file of arbitrary size: an ACCNT list
+with every ACCNTTYPE of the baseline mapping in deep A:B:C hierarchies and
+opening balances that sum to zero, the reference lists (CLASS, TERMS, ...),
+customers with jobs, vendors, other names, items in both INVITEM layouts,
+budgets and TRNS/SPL transaction blocks. Amounts of 1,000 and more are
+written quoted with thousands separators, as QuickBooks exports them.
+
+Records are written as they are generated, so memory stays flat whatever the
+file size; only a bounded sample of account, customer and item names is kept
+for the references later sections make. The same seed and sizes always
+produce the same bytes.
+
+Usage (from src/):
+    python -m tools.iif_generator input/synthetic.IIF --records 100000 --seed 7
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO
+
+from modules.accounts.accounts_trial_balance import GNUCASH_TYPE_CLASSES, NORMAL_SIGNS
+
+BASELINE_MAPPING_PATH = os.path.join(os.path.dirname(__file__), '..', 'modules', 'accounts',
+                                     'accounts_mapping_baseline.json')
+
+# Names kept per kind for references from later sections (reservoir sample)
+REFERENCE_POOL_SIZE = 5000
+
+# TIMESTAMP of the first generated record; later records count up from it
+BASE_TIMESTAMP = 1700000000
+
+# ACCNTTYPEs the accounts module allows exactly one account of, with their QuickBooks names
+SINGLE_ACCOUNT_TYPES = {'AR': 'Accounts Receivable', 'AP': 'Accounts Payable'}
+
+# Fixed-size reference lists
+LIST_SIZES = {'CLASS': 12, 'CTYPE': 6, 'VTYPE': 6, 'JOBTYPE': 8, 'PAYMETH': 6, 'SHIPMETH': 6, 'INVMEMO': 6}
+
+ACCOUNT_WORDS = ('Operations', 'Travel', 'Supplies', 'Rent', 'Utilities', 'Payroll', 'Equipment', 'Vehicles',
+                 'Insurance', 'Services', 'Materials', 'Marketing', 'Taxes', 'Interest', 'Reserve', 'Projects')
+NAME_WORDS = ('Anderson', 'Baker', 'Chen', 'Diaz', 'Evans', 'Fischer', 'Garcia', 'Hughes', 'Ito', 'Jones',
+              'Kowalski', 'Larsen', 'Moreau', 'Nakamura', 'Okafor', 'Patel', 'Quinn', 'Rossi', 'Singh', 'Tanaka')
+COMPANY_SUFFIXES = ('Inc.', 'LLC', 'Co.', 'Ltd', 'Supply', 'Landscaping', 'Construction', 'Services')
+
+ACCNT_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'ACCNTTYPE', 'OBAMOUNT', 'DESC', 'ACCNUM', 'SCD', 'BANKNUM',
+                'EXTRA', 'HIDDEN', 'DELCOUNT', 'USEID')
+NAME_LIST_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'HIDDEN')
+TERMS_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'DISCPER', 'STDDUEDAYS', 'STDDISCDAYS', 'DAYOFMONTHDUE',
+                'DISCDAYOFMONTH', 'DATEMINDAYS', 'TERMSTYPE', 'HIDDEN')
+CUSTNAMEDICT_HEADER = ('INDEX', 'LABEL', 'CUSTOMER', 'VENDOR', 'EMPLOYEE')
+CUST_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'BADDR1', 'BADDR2', 'BADDR3', 'BADDR4', 'BADDR5', 'SADDR1',
+               'SADDR2', 'SADDR3', 'SADDR4', 'SADDR5', 'PHONE1', 'PHONE2', 'FAXNUM', 'EMAIL', 'NOTE', 'CONT1',
+               'CONT2', 'CTYPE', 'TERMS', 'TAXABLE', 'SALESTAXCODE', 'LIMIT', 'RESALENUM', 'REP', 'TAXITEM',
+               'NOTEPAD', 'SALUTATION', 'COMPANYNAME', 'FIRSTNAME', 'MIDINIT', 'LASTNAME', 'CUSTFLD1',
+               'CUSTFLD2', 'CUSTFLD3', 'JOBDESC', 'JOBTYPE', 'JOBSTATUS', 'JOBSTART', 'JOBPROJEND', 'JOBEND',
+               'HIDDEN', 'DELCOUNT', 'PRICELEVEL')
+VEND_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'PRINTAS', 'ADDR1', 'ADDR2', 'ADDR3', 'ADDR4', 'ADDR5', 'VTYPE',
+               'CONT1', 'CONT2', 'PHONE1', 'PHONE2', 'FAXNUM', 'EMAIL', 'NOTE', 'TAXID', 'LIMIT', 'TERMS',
+               'NOTEPAD', 'SALUTATION', 'COMPANYNAME', 'FIRSTNAME', 'MIDINIT', 'LASTNAME', 'CUSTFLD1',
+               'CUSTFLD2', 'CUSTFLD3', '1099', 'HIDDEN', 'DELCOUNT')
+OTHERNAME_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'BADDR1', 'BADDR2', 'BADDR3', 'BADDR4', 'BADDR5', 'PHONE1',
+                    'PHONE2', 'FAXNUM', 'EMAIL', 'NOTE', 'CONT1', 'CONT2', 'NOTEPAD', 'SALUTATION',
+                    'COMPANYNAME', 'FIRSTNAME', 'MIDINIT', 'LASTNAME', 'HIDDEN', 'DELCOUNT')
+CUSTITEMDICT_HEADER = ('INDEX', 'LABEL', 'INUSE')
+INVITEM_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'INVITEMTYPE', 'DESC', 'PURCHASEDESC', 'ACCNT', 'ASSETACCNT',
+                  'COGSACCNT', 'QNTY', 'VALUE', 'PRICE', 'COST', 'TAXABLE', 'SALESTAXCODE', 'PAYMETH', 'TAXVEND',
+                  'PREFVEND', 'REORDERPOINT', 'EXTRA', 'CUSTFLD1', 'CUSTFLD2', 'CUSTFLD3', 'HIDDEN', 'DELCOUNT')
+INVITEM_GROUP_HEADER = ('NAME', 'REFNUM', 'TIMESTAMP', 'INVITEMTYPE', 'DESC', 'TOPRINT', 'EXTRA', 'QNTY',
+                        'HIDDEN', 'DELCOUNT')
+BUD_HEADER = ('ACCNT', 'PERIOD') + ('AMOUNT',) * 12 + ('STARTDATE', 'CLASS', 'CUSTOMER')
+TRNS_HEADER = ('TRNSID', 'TRNSTYPE', 'DATE', 'ACCNT', 'NAME', 'CLASS', 'AMOUNT', 'DOCNUM', 'MEMO', 'CLEAR')
+SPL_HEADER = ('SPLID', 'TRNSTYPE', 'DATE', 'ACCNT', 'NAME', 'CLASS', 'AMOUNT', 'DOCNUM', 'MEMO', 'CLEAR')
+
+class CorpusSizes(NamedTuple):
+    """Record counts per generated section."""
+    accounts: int
+    customers: int
+    vendors: int
+    other_names: int
+    items: int
+    item_groups: int
+    budget_lines: int
+    transactions: int
+
+    @classmethod
+    def scaled(cls, records: int) -> 'CorpusSizes':
+        """Sizes for a corpus of about `records` records per large section."""
+        return cls(accounts=records, customers=records, vendors=max(records // 2, 1),
+                   other_names=max(records // 10, 1), items=max(records // 2, 1),
+                   item_groups=max(records // 50, 1), budget_lines=max(records // 10, 1), transactions=records)
+
+def format_iif_amount(cents: int) -> str:
+    """Cents as QuickBooks writes them: '225.23', '-45.00', '"99,250.02"'."""
+    text = f"{'-' if cents < 0 else ''}{abs(cents) // 100:,}.{abs(cents) % 100:02d}"
+    return f'"{text}"' if ',' in text else text
+
+def quote_iif(text: str) -> str:
+    """Quote values with commas or quotes the way QuickBooks does."""
+    if ',' in text or '"' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+class ReferencePool:
+    """Bounded, seed-determined sample of generated names (reservoir sampling)."""
+
+    def __init__(self, rng: random.Random, size: int = REFERENCE_POOL_SIZE):
+        self.rng = rng
+        self.size = size
+        self.names: List[str] = []
+        self.seen = 0
+
+    def add(self, name: str) -> None:
+        self.seen += 1
+        if len(self.names) < self.size:
+            self.names.append(name)
+        else:
+            slot = self.rng.randrange(self.seen)
+            if slot < self.size:
+                self.names[slot] = name
+
+    def choice(self) -> str:
+        return self.rng.choice(self.names)
+
+class IIFCorpusWriter:
+    """Streams one synthetic IIF file section by section."""
+
+    def __init__(self, out: TextIO, seed: int, depth: int = 4, fanout: int = 4):
+        self.out = out
+        self.rng = random.Random(seed)
+        self.depth = depth
+        self.fanout = fanout
+        self.refnum = 0
+        self.records = 0
+        with open(BASELINE_MAPPING_PATH, encoding='utf-8') as f:
+            self.account_types: Dict[str, str] = {qbd_type: spec['gnucash_type']
+                                                  for qbd_type, spec in json.load(f)['account_types'].items()}
+        self.accounts: Dict[str, ReferencePool] = {}
+        self.customers = ReferencePool(self.rng)
+        self.vendors = ReferencePool(self.rng)
+        self.items = ReferencePool(self.rng)
+        self.list_names: Dict[str, List[str]] = {}
+
+    def _header(self, section: str, fields) -> None:
+        self.out.write('!' + '\t'.join((section,) + tuple(fields)) + '\n')
+
+    def _row(self, section: str, values) -> None:
+        self.out.write('\t'.join((section,) + tuple(values)) + '\n')
+        self.records += 1
+
+    def _next_ref(self) -> str:
+        self.refnum += 1
+        return str(self.refnum)
+
+    def _timestamp(self) -> str:
+        return str(BASE_TIMESTAMP + self.refnum)
+
+    def _person(self) -> str:
+        return f"{self.rng.choice(NAME_WORDS)} {self.rng.choice(NAME_WORDS)}"
+
+    def _company(self, serial: int) -> str:
+        # Every fifth company is 'Last, First' style and needs quoting
+        if serial % 5 == 0:
+            return f"{self.rng.choice(NAME_WORDS)}, {self.rng.choice(NAME_WORDS)} {serial}"
+        return f"{self.rng.choice(NAME_WORDS)} {self.rng.choice(COMPANY_SUFFIXES)} {serial}"
+
+    def _posting_account(self, *qbd_types: str) -> str:
+        pools = [self.accounts[qbd_type] for qbd_type in qbd_types if self.accounts.get(qbd_type)
+                 and self.accounts[qbd_type].names]
+        return self.rng.choice(pools).choice()
+
+    # ACCNT -------------------------------------------------------------------
+
+    def _account_paths(self, qbd_type: str, count: int) -> Iterator[str]:
+        """Depth-first full names for `count` accounts of one type, parents before children."""
+        if qbd_type in SINGLE_ACCOUNT_TYPES:
+            yield SINGLE_ACCOUNT_TYPES[qbd_type]
+            return
+        label = qbd_type.title()
+        serial = 0
+        while count > 0:
+            serial += 1
+            stack = [(f"{label} {self.rng.choice(ACCOUNT_WORDS)} {serial}", 1)]
+            while stack and count > 0:
+                path, level = stack.pop()
+                count -= 1
+                yield path
+                if level < self.depth:
+                    children = self.rng.randint(0, self.fanout)
+                    for child in range(children, 0, -1):
+                        serial += 1
+                        stack.append((f"{path}:{self.rng.choice(ACCOUNT_WORDS)} {serial}", level + 1))
+
+    def write_accounts(self, count: int) -> None:
+        """ACCNT rows for every baseline ACCNTTYPE; OBAMOUNT sums to zero via Opening Bal Equity."""
+        self._header('ACCNT', ACCNT_HEADER)
+        # Single-account types get one account; the rest share the remaining count evenly
+        shared_types = [qbd_type for qbd_type in self.account_types if qbd_type not in SINGLE_ACCOUNT_TYPES]
+        remaining = max(count - len(SINGLE_ACCOUNT_TYPES), 0)
+        shares = {qbd_type: remaining // len(shared_types) + (1 if position < remaining % len(shared_types) else 0)
+                  for position, qbd_type in enumerate(shared_types)}
+        total = 0
+        for qbd_type in self.account_types:
+            share = shares.get(qbd_type, 1)
+            gnucash_class = GNUCASH_TYPE_CLASSES.get(self.account_types[qbd_type], len(NORMAL_SIGNS) - 1)
+            sign = NORMAL_SIGNS[gnucash_class] if qbd_type != 'NONPOSTING' else 0
+            pool = self.accounts.setdefault(qbd_type, ReferencePool(self.rng))
+            for full_name in self._account_paths(qbd_type, share):
+                # Mostly normal-sign balances, some zero, a few contra balances
+                roll = self.rng.random()
+                cents = 0 if roll < 0.2 or not sign else self.rng.randint(1, 5000000) * sign * (-1 if roll > 0.95 else 1)
+                total += cents
+                pool.add(full_name)
+                self._row('ACCNT', (full_name, self._next_ref(), self._timestamp(), qbd_type,
+                                    format_iif_amount(cents), f"Synthetic {qbd_type.lower()} account", '',
+                                    '0', '', '', 'N', '0', 'N'))
+        self._row('ACCNT', ('Opening Bal Equity', self._next_ref(), self._timestamp(), 'EQUITY',
+                            format_iif_amount(-total), 'Opening balance offset', '', '0', '', 'OPENBAL',
+                            'N', '0', 'N'))
+
+    # Reference lists -----------------------------------------------------------
+
+    def write_reference_lists(self) -> None:
+        for section, size in LIST_SIZES.items():
+            self._header(section, NAME_LIST_HEADER)
+            names = self.list_names.setdefault(section, [])
+            for serial in range(1, size + 1):
+                name = f"{section.title()} {self.rng.choice(ACCOUNT_WORDS)} {serial}"
+                names.append(name)
+                self._row(section, (name, self._next_ref(), self._timestamp(), 'N'))
+        self._header('TERMS', TERMS_HEADER)
+        for days in (10, 15, 30, 45, 60):
+            self._row('TERMS', (f"Net {days}", self._next_ref(), self._timestamp(), '0.0%', str(days), '0',
+                                '31', '0', '5', '0', 'N'))
+            self._row('TERMS', (f"2% 10 Net {days}", self._next_ref(), self._timestamp(), '2.0%', str(days),
+                                '10', '31', '10', '5', '0', 'N'))
+
+    # Names ---------------------------------------------------------------------
+
+    def write_names(self, customers: int, vendors: int, other_names: int) -> None:
+        self._header('CUSTNAMEDICT', CUSTNAMEDICT_HEADER)
+        for index, label in enumerate(('Region', 'Contract', 'Priority')):
+            self._row('CUSTNAMEDICT', (str(index), label, 'Y', 'Y' if index < 2 else 'N', 'N'))
+        self.out.write('!ENDCUSTNAMEDICT\n')
+
+        self._header('CUST', CUST_HEADER)
+        written = 0
+        serial = 0
+        while written < customers:
+            serial += 1
+            name = self._company(serial)
+            for job in range(min(self.rng.choice((0, 0, 0, 1, 2)), customers - written - 1) + 1):
+                full_name = name if not job else f"{name}:Job {job}"
+                self._write_customer(full_name, job)
+                written += 1
+
+        self._header('VEND', VEND_HEADER)
+        for serial in range(1, vendors + 1):
+            name = self._company(serial + customers)
+            self.vendors.add(name)
+            first, last = self._person().split()
+            self._row('VEND', (quote_iif(name), self._next_ref(), self._timestamp(), quote_iif(name),
+                               quote_iif(name), f"{serial} Market St", quote_iif(f"Springfield, IL 6{serial % 10000:04d}"),
+                               '', '', '', self._person(), '', f"555-{serial % 10000:04d}", '', '', '', '', '',
+                               format_iif_amount(self.rng.randint(0, 2000000)), 'Net 30', '', '', quote_iif(name),
+                               first, '', last, self.rng.choice(('North', 'South')), '', '', 'N', 'N', '0'))
+
+        self._header('OTHERNAME', OTHERNAME_HEADER)
+        for serial in range(1, other_names + 1):
+            self._row('OTHERNAME', (f"Other {self._person()} {serial}", self._next_ref(), self._timestamp())
+                      + ('',) * 18 + ('N', '0'))
+
+    def _write_customer(self, full_name: str, job: int) -> None:
+        self.customers.add(full_name)
+        first, last = self._person().split()
+        address = quote_iif(f"Springfield, IL 6{self.refnum % 10000:04d}")
+        job_fields = (f"Job {job}", self.rng.choice(self.list_names['JOBTYPE']), '1', '1/15/2024', '', '') \
+            if job else ('',) * 6
+        self._row('CUST', (quote_iif(full_name), self._next_ref(), self._timestamp(), quote_iif(full_name),
+                           f"{self.refnum} Oak Ave", address, '', '', quote_iif(full_name), f"{self.refnum} Oak Ave",
+                           address, '', '', f"555-{self.refnum % 10000:04d}", '', '', '', '', f"{first} {last}", '',
+                           self.rng.choice(self.list_names['CTYPE']), 'Net 30', self.rng.choice('YN'), 'Tax', format_iif_amount(self.rng.randint(0, 5000000)),
+                           '', '', '', '', '', quote_iif(full_name.split(':')[0]), first, '', last,
+                           self.rng.choice(('North', 'South', 'East', 'West')), 'Annual', '')
+                  + job_fields + ('N', '0', ''))
+
+    # Items -----------------------------------------------------------------------
+
+    def write_items(self, items: int, groups: int) -> None:
+        self._header('CUSTITEMDICT', CUSTITEMDICT_HEADER)
+        for index, label in enumerate(('Color', 'Size', 'Supplier code')):
+            self._row('CUSTITEMDICT', (str(index), label, 'Y'))
+        self.out.write('!ENDCUSTITEMDICT\n')
+
+        self._header('INVITEM', INVITEM_HEADER)
+        for serial in range(1, items + 1):
+            item_type = self.rng.choice(('SERV', 'SERV', 'INVENTORY', 'PART', 'OTHC'))
+            name = f"{self.rng.choice(ACCOUNT_WORDS)} item {serial}"
+            self.items.add(name)
+            income = self._posting_account('INC', 'EXINC')
+            asset = cogs = ''
+            if item_type == 'INVENTORY':
+                asset, cogs = self._posting_account('OCASSET'), self._posting_account('COGS')
+            elif item_type == 'OTHC':
+                cogs = self._posting_account('EXP')
+            price = self.rng.randint(100, 500000)
+            self._row('INVITEM', (name, self._next_ref(), self._timestamp(), item_type, f"Synthetic {item_type.lower()}",
+                                  f"Purchased {item_type.lower()}", income, asset, cogs, '0', '0.00',
+                                  format_iif_amount(price), format_iif_amount(price * 6 // 10), self.rng.choice('YN'),
+                                  'Tax', '', '', '', '', '', self.rng.choice(('Red', 'Blue', '')), '', '', 'N', '0'))
+
+        self._header('INVITEM', INVITEM_GROUP_HEADER)
+        for serial in range(1, groups + 1):
+            self._row('INVITEM', (f"Bundle {serial}", self._next_ref(), self._timestamp(), 'GRP',
+                                  f"Bundle of items {serial}", 'N', '', '0', 'N', '0'))
+            for _ in range(self.rng.randint(2, 5)):
+                self._row('INVITEM', (self.items.choice(), self._next_ref(), self._timestamp(), 'SERV', '', 'N', '',
+                                      str(self.rng.randint(1, 4)), 'N', '0'))
+        self.out.write('!ENDGRP\n')
+
+    # Budgets and transactions ------------------------------------------------------
+
+    def write_budgets(self, lines: int) -> None:
+        self._header('BUD', BUD_HEADER)
+        for serial in range(lines):
+            account = self._posting_account('INC', 'EXP', 'COGS')
+            sign = -1 if account.startswith('Inc') else 1
+            period = self.rng.choice(('MONTH', 'MONTH', 'MONTH', 'QUARTER', 'YEAR'))
+            used = {'MONTH': 12, 'QUARTER': 4, 'YEAR': 1}[period]
+            amounts = [format_iif_amount(sign * self.rng.randint(0, 1000000)) if period_index < used else ''
+                       for period_index in range(12)]
+            class_name = self.rng.choice(self.list_names['CLASS']) if serial % 3 == 0 else ''
+            self._row('BUD', (account, period, *amounts, f"{2022 + serial % 3}-01-01", class_name, ''))
+
+    def write_transactions(self, count: int) -> None:
+        self._header('TRNS', TRNS_HEADER)
+        self._header('SPL', SPL_HEADER)
+        self.out.write('!ENDTRNS\n')
+        for serial in range(1, count + 1):
+            posted = f"{self.rng.randint(1, 12)}/{self.rng.randint(1, 28)}/{2023 + serial % 2}"
+            kind = self.rng.choice(('CHECK', 'DEPOSIT', 'GENERAL JOURNAL'))
+            payee = quote_iif(self.vendors.choice() if kind == 'CHECK' else self.customers.choice())
+            splits = [self.rng.randint(1, 2500000) for _ in range(self.rng.randint(1, 4))]
+            bank = self._posting_account('BANK')
+            sign = -1 if kind == 'CHECK' else 1
+            clear = self.rng.choice('YN')
+            self._row('TRNS', (str(serial), kind, posted, bank, payee, '', format_iif_amount(sign * sum(splits)),
+                               str(1000 + serial), f"Synthetic {kind.lower()} {serial}", clear))
+            for cents in splits:
+                account = self._posting_account('EXP', 'COGS') if sign < 0 else self._posting_account('INC', 'AR')
+                self._row('SPL', (str(serial), kind, posted, account, payee, '', format_iif_amount(-sign * cents),
+                                  '', 'Synthetic split', clear))
+            self.out.write('ENDTRNS\n')
+
+    def write_corpus(self, sizes: CorpusSizes) -> None:
+        self._header('HDR', ('PROD', 'VER', 'REL', 'IIFVER', 'DATE', 'TIME', 'ACCNTNT', 'ACCNTNTSPLITTIME'))
+        self._row('HDR', ('QuickBooks Enterprise Solutions', 'Version 34.0D', 'Release R15P', '1', '2024-12-31',
+                          str(BASE_TIMESTAMP), 'N', '0'))
+        self.write_accounts(sizes.accounts)
+        self.write_reference_lists()
+        self.write_names(sizes.customers, sizes.vendors, sizes.other_names)
+        self.write_items(sizes.items, sizes.item_groups)
+        self.write_budgets(sizes.budget_lines)
+        self.write_transactions(sizes.transactions)
+
+def generate_corpus(output_path: str, sizes: CorpusSizes, seed: int = 1, depth: int = 4, fanout: int = 4) -> int:
+    """Write one synthetic IIF file.
+
+    Args:
+        output_path: IIF file to create (overwritten)
+        sizes: Record counts per section
+        seed: Random seed; equal seeds and sizes give identical files
+        depth: Maximum account hierarchy depth (A:B:C:D for 4)
+        fanout: Maximum children per account
+
+    Returns:
+        Number of data records written
+    """
+    with open(output_path, 'w', encoding='utf-8', newline='\n', buffering=1 << 20) as out:
+        writer = IIFCorpusWriter(out, seed, depth, fanout)
+        writer.write_corpus(sizes)
+    return writer.records
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic QuickBooks IIF file")
+    parser.add_argument('output', help="IIF file to write")
+    parser.add_argument('--records', type=int, default=1000, help="records per large section (default 1000)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--depth', type=int, default=4, help="maximum account hierarchy depth")
+    parser.add_argument('--fanout', type=int, default=4, help="maximum children per account")
+    for field in CorpusSizes._fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, help=f"override the {field.replace('_', ' ')} count")
+    args = parser.parse_args(argv)
+
+    scaled = CorpusSizes.scaled(args.records)
+    sizes = scaled._replace(**{field: getattr(args, field) for field in CorpusSizes._fields
+                               if getattr(args, field) is not None})
+    records = generate_corpus(args.output, sizes, args.seed, args.depth, args.fanout)
+    print(f"Wrote {records} records ({os.path.getsize(args.output)} bytes) to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Shared account reference index for cross-section integrity checks.
+
+The accounts module builds one AccountIndex from the finished account tree and
+publishes it in the dispatch payload's extra_config under ACCOUNT_INDEX_KEY.
+Modules dispatched later (items, customers, transactions, ...) resolve ACCNT
+references through it with O(1) lookups instead of rescanning ACCNT records.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# extra_config key under which the accounts module publishes the index
+ACCOUNT_INDEX_KEY = 'account_index'
+
+class AccountIndex:
+    """Hash index of GnuCash account full names and original QBD account names."""
+
+    def __init__(self, commodity: str = 'USD'):
+        self.commodity = commodity  # Book currency of every indexed account
+        self.full_names: Set[str] = set()
+        self.by_qbd_name: Dict[str, str] = {}
+        self.types: Dict[str, str] = {}
+
+    def add(self, full_name: str, gnucash_type: str, qbd_name: Optional[str] = None) -> None:
+        """Register one GnuCash account and, if it came from an ACCNT record, its QBD name."""
+        self.full_names.add(full_name)
+        self.types[full_name] = gnucash_type
+        if qbd_name:
+            self.by_qbd_name[qbd_name] = full_name
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Return the GnuCash full name for a QBD account name or GnuCash full name."""
+        full_name = self.by_qbd_name.get(name)
+        if full_name is not None:
+            return full_name
+        return name if name in self.full_names else None
+
+    def account_type(self, name: str) -> Optional[str]:
+        """Return the GnuCash account type for a QBD name or full name."""
+        full_name = self.resolve(name)
+        return self.types.get(full_name) if full_name is not None else None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.by_qbd_name or name in self.full_names
+
+    def __len__(self) -> int:
+        return len(self.full_names)
+
+    def find_unresolved(self, rows: Iterable[Dict[str, str]], fields: Sequence[str]) -> List[Tuple[int, str, str]]:
+        """Check account reference columns of many rows in one pass.
+
+        Args:
+            rows: Records from any IIF section
+            fields: Column names holding account references (empty values are ignored)
+
+        Returns:
+            List of (row index, field, value) for every reference that does not resolve
+        """
+        by_qbd_name = self.by_qbd_name
+        full_names = self.full_names
+        unresolved = []
+        for index, row in enumerate(rows):
+            for field in fields:
+                value = row.get(field)
+                if value and value not in by_qbd_name and value not in full_names:
+                    unresolved.append((index, field, value))
+        return unresolved
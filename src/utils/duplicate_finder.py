@@ -0,0 +1,95 @@
+"""Near-duplicate name detection with blocking.
+
+Comparing every pair of names is quadratic, so candidates are generated by a
+sorted-neighbourhood scan instead: names are reduced to a match key (case
+folded, punctuation and legal-form words such as 'Inc' or 'LLC' removed), sorted,
+and each name is compared only with the next few names in sort order. The scan
+runs twice, on the match key and on its tokens in sorted order, so both
+"Acme Supply" / "Acme Suply" (same prefix) and "Supply Acme" / "Acme Supply"
+(reordered words) land next to each other. Work is O(n log n) for the sorts plus
+O(n * window) comparisons.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Iterable, List, NamedTuple, Set, Tuple
+
+# Each name is compared with this many following names in sort order
+DUPLICATE_WINDOW = 5
+
+# Minimum similarity ratio reported as a candidate
+DUPLICATE_THRESHOLD = 0.88
+
+# Words that do not distinguish one business from another
+LEGAL_FORM_WORDS = frozenset({
+    'the', 'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'lp', 'llp', 'pc',
+})
+
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+
+class NameCandidate(NamedTuple):
+    """One name offered to the finder."""
+    group: str          # Names are only compared within a group (e.g. 'names', 'accounts')
+    section: str        # Source list, e.g. 'CUST'
+    name: str           # Name as reported
+    match_text: str = ''  # Text compared instead of the name (e.g. an account's leaf name)
+
+class DuplicatePair(NamedTuple):
+    """A pair of names that are probably the same entity."""
+    score: float
+    first: NameCandidate
+    second: NameCandidate
+
+def match_key(name: str) -> str:
+    """Normalized comparison key: 'ACME, Inc.' and 'Acme Inc' -> 'acme'."""
+    tokens = _NON_WORD_RE.sub(' ', name.casefold().replace('&', ' and ')).split()
+    kept = [token for token in tokens if token not in LEGAL_FORM_WORDS]
+    return ' '.join(kept or tokens)
+
+def find_duplicate_candidates(candidates: Iterable[NameCandidate], window: int = DUPLICATE_WINDOW,
+                              threshold: float = DUPLICATE_THRESHOLD) -> List[DuplicatePair]:
+    """Find likely duplicate names with two sorted-neighbourhood passes.
+
+    Args:
+        candidates: Names to check; identical (group, section, name) entries are checked once
+        window: Neighbourhood size of the sorted scans
+        threshold: Minimum SequenceMatcher ratio of the keys the pass is sorted on
+
+    Returns:
+        Candidate pairs, highest score first
+    """
+    unique = list(dict.fromkeys(candidates))
+    keys = [match_key(candidate.match_text or candidate.name) for candidate in unique]
+    token_keys = [' '.join(sorted(key.split())) for key in keys]
+
+    # A pair meets at most once per pass; the second pass may still report a pair the first rejected
+    reported: Set[Tuple[int, int]] = set()
+    pairs: List[DuplicatePair] = []
+    matcher = SequenceMatcher(autojunk=False)
+    for sort_keys in (keys, token_keys):
+        order = sorted(range(len(unique)), key=lambda position: (unique[position].group, sort_keys[position]))
+        for offset, position in enumerate(order):
+            group = unique[position].group
+            matcher.set_seq2(sort_keys[position])
+            for other in order[offset + 1:offset + window + 1]:
+                if unique[other].group != group:
+                    break
+                pair = (position, other) if position < other else (other, position)
+                if pair in reported:
+                    continue
+                if sort_keys[position] == sort_keys[other]:
+                    score = 1.0
+                else:
+                    matcher.set_seq1(sort_keys[other])
+                    # Cheap upper bounds first; the full ratio only for plausible pairs
+                    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                        continue
+                    score = matcher.ratio()
+                    if score < threshold:
+                        continue
+                reported.add(pair)
+                pairs.append(DuplicatePair(round(score, 3), unique[pair[0]], unique[pair[1]]))
+
+    pairs.sort(key=lambda item: (-item.score, item.first.name, item.second.name))
+    return pairs
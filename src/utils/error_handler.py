@@ -45,6 +45,16 @@ class OutputWriteError(ConversionError):
     def __init__(self, message: str):
         super().__init__(message, error_code="E0104", exit_code=1)
 
+class DomainValidationError(ConversionError):
+    """Domain-specific validation failed. Error Code: E1190"""
+    def __init__(self, message: str):
+        super().__init__(message, error_code="E1190", exit_code=2)
+
+class DomainDependencyError(ConversionError):
+    """Required domain dependency missing or failed to load. Error Code: E1191"""
+    def __init__(self, message: str):
+        super().__init__(message, error_code="E1191", exit_code=1)
+
 class RegistryKeyConflictError(ConversionError):
     """Raised when duplicate registry key detected. Error Code: E0103"""
     def __init__(self, message: str):
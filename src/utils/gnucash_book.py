@@ -0,0 +1,141 @@
+"""Shared helpers for writing native GnuCash books.
+
+Provides deterministic GUIDs for book objects and a streaming writer for
+gzip-compressed GnuCash XML books. The writer emits each account element as
+soon as it is given one, so nothing is buffered beyond the gzip window and
+memory stays flat regardless of book size.
+"""
+
+import gzip
+import io
+import os
+import uuid
+from typing import Optional
+from xml.sax.saxutils import escape
+
+# Namespace for deterministic GUIDs of book objects
+_GUID_NAMESPACE = uuid.UUID('7d1c3e52-5b8e-4c7f-9a51-3f0a8a4e6b21')
+
+# Commodity smallest unit for currencies (cents)
+CURRENCY_FRACTION = 100
+
+_XML_NAMESPACES = ('gnc', 'act', 'book', 'cd', 'cmdty', 'slot')
+
+def book_guid(kind: str, key: str) -> str:
+    """Return the deterministic 32-character GUID for a book object.
+
+    Args:
+        kind: Object kind, e.g. 'account', 'commodity', 'book'
+        key: Stable identity within the kind, e.g. the account full name
+    """
+    return uuid.uuid5(_GUID_NAMESPACE, f"{kind}:{key}").hex
+
+def book_flag(value: Optional[str]) -> bool:
+    """Read a source flag: QuickBooks writes Y/N, GnuCash CSV T/F; 'Y' or 'T' in any case is true."""
+    return (value or '').strip().upper() in ('Y', 'T')
+
+def _text(tag: str, value: str) -> str:
+    return f"<{tag}>{escape(value)}</{tag}>\n"
+
+class GnuCashXmlBookWriter:
+    """Incremental writer for a gzip-compressed GnuCash XML book.
+
+    Usage::
+
+        with GnuCashXmlBookWriter(path, 'USD', account_count=n) as book:
+            book.write_account(...)
+
+    Accounts must be written parents first. The account count hint is optional;
+    GnuCash only uses it for load progress.
+    """
+
+    def __init__(self, path: str, currency: str, account_count: Optional[int] = None,
+                 compresslevel: int = 6):
+        self.path = path
+        self.currency = currency
+        self.account_count = account_count
+        self.compresslevel = compresslevel
+        self.accounts_written = 0
+        self._file = None
+        self._commodity_ref = (f"<cmdty:space>CURRENCY</cmdty:space>\n"
+                               f"<cmdty:id>{escape(currency)}</cmdty:id>\n")
+
+    def __enter__(self) -> 'GnuCashXmlBookWriter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def open(self) -> None:
+        """Create the file and write the book header and currency commodity."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Fixed gzip header mtime keeps identical books byte-identical across runs
+        compressed = gzip.GzipFile(self.path, 'wb', compresslevel=self.compresslevel, mtime=0)
+        self._file = io.TextIOWrapper(compressed, encoding='utf-8')
+        namespaces = "\n".join(f'     xmlns:{prefix}="http://www.gnucash.org/XML/{prefix}"'
+                               for prefix in _XML_NAMESPACES)
+        header = [
+            '<?xml version="1.0" encoding="utf-8" ?>\n',
+            f"<gnc-v2\n{namespaces}>\n",
+            '<gnc:count-data cd:type="book">1</gnc:count-data>\n',
+            '<gnc:book version="2.0.0">\n',
+            f'<book:id type="guid">{book_guid("book", "book")}</book:id>\n',
+            '<gnc:count-data cd:type="commodity">1</gnc:count-data>\n',
+        ]
+        if self.account_count is not None:
+            header.append(f'<gnc:count-data cd:type="account">{self.account_count}</gnc:count-data>\n')
+        header.extend([
+            '<gnc:commodity version="2.0.0">\n',
+            self._commodity_ref,
+            '<cmdty:get_quotes/>\n',
+            _text('cmdty:quote_source', 'currency'),
+            '<cmdty:quote_tz/>\n',
+            '</gnc:commodity>\n',
+        ])
+        self._file.write(''.join(header))
+
+    def write_account(self, guid: str, name: str, account_type: str, parent_guid: Optional[str] = None,
+                      code: str = '', description: str = '', hidden: bool = False,
+                      placeholder: bool = False, notes: str = '', color: str = '') -> None:
+        """Write one account element (the root account has no parent)."""
+        parts = [
+            '<gnc:account version="2.0.0">\n',
+            _text('act:name', name),
+            f'<act:id type="guid">{guid}</act:id>\n',
+            _text('act:type', account_type),
+            '<act:commodity>\n', self._commodity_ref, '</act:commodity>\n',
+            f"<act:commodity-scu>{CURRENCY_FRACTION}</act:commodity-scu>\n",
+        ]
+        if code:
+            parts.append(_text('act:code', code))
+        if description:
+            parts.append(_text('act:description', description))
+        slots = [(key, value) for key, value in (
+            ('color', color), ('hidden', 'true' if hidden else ''), ('notes', notes),
+            ('placeholder', 'true' if placeholder else '')) if value]
+        if slots:
+            parts.append('<act:slots>\n')
+            for key, value in slots:
+                parts.append(f'<slot>\n{_text("slot:key", key)}'
+                             f'<slot:value type="string">{escape(value)}</slot:value>\n</slot>\n')
+            parts.append('</act:slots>\n')
+        if parent_guid:
+            parts.append(f'<act:parent type="guid">{parent_guid}</act:parent>\n')
+        parts.append('</gnc:account>\n')
+        self._file.write(''.join(parts))
+        self.accounts_written += 1
+
+    def close(self) -> None:
+        """Close the book and gnc-v2 elements and flush the gzip stream."""
+        if self._file is None:
+            return
+        self._file.write('</gnc:book>\n</gnc-v2>\n')
+        self._file.close()
+        self._file = None
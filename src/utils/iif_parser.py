@@ -5,79 +5,184 @@ with domain-tagged console and debug logging following established standards.
 """
 
 import csv
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .error_handler import IIFParseError
-from .logging import log_technical_detail, log_field_mismatch
+from .logging import log_technical_lazy, log_field_mismatch
+
+# Transaction blocks: TRNS line, SPL lines, ENDTRNS. Each TRNS record carries its
+# split records in a list under SPLITS_KEY; SPL and ENDTRNS get no section of their own.
+TRANSACTION_SECTION = 'TRNS'
+SPLIT_SECTION = 'SPL'
+END_TRANSACTION_SECTION = 'ENDTRNS'
+SPLITS_KEY = 'SPL'
+
+# Sections parse() does not hold in memory: a ledger can run to millions of splits,
+# so its records are re-read from the file one transaction at a time when iterated
+STREAMED_SECTIONS = (TRANSACTION_SECTION,)
+
+# Placeholder for a record of a section the current pass does not build
+_SKIPPED: Dict[str, Any] = {}
+
+class StreamedSection:
+    """Records of one section read lazily from the IIF file instead of held in memory.
+
+    len() is the record count found by parse(); each iteration re-reads the file
+    and yields the records one at a time, a TRNS record once its block is complete.
+    """
+
+    def __init__(self, parser: 'IIFParser', section: str):
+        self.parser = parser
+        self.section = section
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.parser.iter_section(self.section)
 
 class IIFParser:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, streamed_sections: Iterable[str] = STREAMED_SECTIONS):
         self.file_path = file_path
-        self.sections: Dict[str, List[Dict[str, str]]] = {}
-        self.current_section: Optional[str] = None
+        self.streamed_sections = frozenset(streamed_sections)
+        self.sections: Dict[str, Any] = {}
         self.headers: Dict[str, List[str]] = {}
+        self.line_count = 0
     
-    def parse(self) -> Dict[str, List[Dict[str, str]]]:
+    def parse(self) -> Dict[str, Any]:
         """Parse the IIF file and return structured data by module key.
         
         Returns:
             Dict mapping module key names to lists of module key records.
-            Each record is a dict mapping field names to values.
+            Each record is a dict mapping field names to values. Streamed
+            sections (TRNS) map to a StreamedSection instead of a list.
             
         Raises:
             IIFParseError: If the file cannot be parsed or has invalid structure.
         """
         try:
-            log_technical_detail(f"[IIF-PARSER] Beginning IIF file parsing: {self.file_path}")
+            log_technical_lazy("[IIF-PARSER] Beginning IIF file parsing: %s", self.file_path)
             
-            with open(self.file_path, 'r', encoding='utf-8-sig') as f:
-                line_count = 0
-                for line in f:
-                    line_count += 1
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    if line.startswith('!'):
-                        # New module key header
-                        self._process_header(line, line_count)
-                    else:
-                        # Data row
-                        self._process_data(line, line_count)
+            stored = lambda section: section not in self.streamed_sections
+            for section, record in self._iter_records(stored):
+                if record is None:
+                    # Header: a repeated one (e.g. a second !INVITEM layout) changes the fields, not the records so far
+                    if section not in self.sections:
+                        self.sections[section] = StreamedSection(self, section) if section in self.streamed_sections else []
+                elif record is _SKIPPED:
+                    self.sections[section].count += 1
+                else:
+                    self.sections[section].append(record)
             
-            log_technical_detail(f"[IIF-PARSER] IIF parsing completed: {len(self.sections)} module keys, {line_count} lines processed")
+            log_technical_lazy("[IIF-PARSER] IIF parsing completed: %d module keys, %d lines processed", len(self.sections), self.line_count)
             return self.sections
             
         except (IOError, UnicodeError) as e:
-            log_technical_detail(f"[IIF-PARSER] Failed to read IIF file {self.file_path}: {str(e)}")
+            log_technical_lazy("[IIF-PARSER] Failed to read IIF file %s: %s", self.file_path, e)
+            raise IIFParseError(f"Failed to read IIF file {self.file_path}: {str(e)}")
+    
+    def iter_section(self, section: str) -> Iterator[Dict[str, Any]]:
+        """Re-read the file and yield the records of one section, building no others.
+        
+        Raises:
+            IIFParseError: If the file cannot be read or has invalid structure.
+        """
+        try:
+            for record_section, record in self._iter_records(lambda wanted: wanted == section):
+                if record_section == section and record is not None and record is not _SKIPPED:
+                    yield record
+        except (IOError, UnicodeError) as e:
+            log_technical_lazy("[IIF-PARSER] Failed to read IIF file %s: %s", self.file_path, e)
             raise IIFParseError(f"Failed to read IIF file {self.file_path}: {str(e)}")
     
-    def _process_header(self, line: str, line_number: int) -> None:
-        """Process a module key header line starting with '!'."""
+    def _iter_records(self, build: Callable[[str], bool]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """One pass over the file yielding (section, record) in file order.
+        
+        Headers yield (section, None); records of sections `build` rejects yield
+        (section, _SKIPPED) without being split into fields. A TRNS record is
+        yielded with its SPL records once the block ends (ENDTRNS, the next
+        record or end of file).
+        """
+        self.headers = {}
+        current_section = None
+        transaction = None   # Open TRNS record collecting SPL lines
+        line_number = 0
+        with open(self.file_path, 'r', encoding='utf-8-sig') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                
+                if line.startswith('!'):
+                    # New module key header
+                    current_section = self._process_header(line, line_number)
+                    if current_section not in (SPLIT_SECTION, END_TRANSACTION_SECTION):
+                        yield current_section, None
+                    continue
+                
+                if not current_section:
+                    log_technical_lazy("[IIF-PARSER] Data line found before module key header at line %d", line_number)
+                    raise IIFParseError(f"Data line found before module key header at line {line_number}")
+                
+                # Data lines name their record type in the first field (e.g. TRNS, SPL)
+                record_type = line.split('\t', 1)[0]
+                section = record_type if record_type in self.headers else current_section
+                
+                if section == SPLIT_SECTION:
+                    if transaction is None:
+                        raise IIFParseError(f"SPL line outside a transaction at line {line_number}")
+                    if transaction is not _SKIPPED:
+                        transaction[SPLITS_KEY].append(self._build_record(line, section, line_number))
+                    continue
+                
+                if transaction is not None:
+                    yield TRANSACTION_SECTION, transaction
+                    transaction = None
+                if section == END_TRANSACTION_SECTION:
+                    continue
+                
+                record = self._build_record(line, section, line_number) if build(section) else _SKIPPED
+                if section == TRANSACTION_SECTION:
+                    if record is not _SKIPPED:
+                        record[SPLITS_KEY] = []
+                    transaction = record
+                else:
+                    yield section, record
+        
+        if transaction is not None:
+            yield TRANSACTION_SECTION, transaction
+        self.line_count = line_number
+    
+    def _process_header(self, line: str, line_number: int) -> str:
+        """Process a module key header line starting with '!'; returns the module key."""
         try:
-            self.current_section = line.split()[0][1:]  # Remove ! and get module key name
+            section = line.split()[0][1:]  # Remove ! and get module key name
             fields = line.split('\t')
-            self.headers[self.current_section] = fields
-            self.sections[self.current_section] = []
-            log_technical_detail(f"[IIF-PARSER] Found module key: {self.current_section} at line {line_number}")
+            # Repeated field names (e.g. !BUD's twelve AMOUNT columns) become AMOUNT, AMOUNT_2, ...
+            # so no value is lost when records are built as dicts
+            occurrences: Dict[str, int] = {}
+            for position, field in enumerate(fields):
+                occurrences[field] = occurrences.get(field, 0) + 1
+                if occurrences[field] > 1:
+                    fields[position] = f"{field}_{occurrences[field]}"
+            self.headers[section] = fields
+            log_technical_lazy("[IIF-PARSER] Found module key: %s at line %d", section, line_number)
+            return section
             
         except IndexError as e:
-            log_technical_detail(f"[IIF-PARSER] Invalid header line at {line_number}: {line}")
+            log_technical_lazy("[IIF-PARSER] Invalid header line at %d: %s", line_number, line)
             raise IIFParseError(f"Invalid header line at {line_number}: {line}")
     
-    def _process_data(self, line: str, line_number: int) -> None:
-        """Process a data line within the current module key section."""
-        if not self.current_section:
-            log_technical_detail(f"[IIF-PARSER] Data line found before module key header at line {line_number}")
-            raise IIFParseError(f"Data line found before module key header at line {line_number}")
-            
+    def _build_record(self, line: str, section: str, line_number: int) -> Dict[str, Any]:
+        """Build the record of a data line within the given module key section."""
         try:
             values = line.split('\t')
-            headers = self.headers[self.current_section]
+            headers = self.headers[section]
             
             if len(values) != len(headers):
                 # Log field mismatch to file only (not console)
-                log_field_mismatch(line_number, self.current_section, len(headers), len(values))
+                log_field_mismatch(line_number, section, len(headers), len(values))
                 
                 # Pad or truncate to match headers length
                 if len(values) < len(headers):
@@ -85,9 +190,8 @@ class IIFParser:
                 else:
                     values = values[:len(headers)]
             
-            record = dict(zip(headers, values))
-            self.sections[self.current_section].append(record)
+            return dict(zip(headers, values))
             
         except (KeyError, IndexError) as e:
-            log_technical_detail(f"[IIF-PARSER] Failed to process data line at {line_number}: {line}")
-            raise IIFParseError(f"Failed to process data line at {line_number}: {line}")
\ No newline at end of file
+            log_technical_lazy("[IIF-PARSER] Failed to process data line at %d: %s", line_number, line)
+            raise IIFParseError(f"Failed to process data line at {line_number}: {line}")
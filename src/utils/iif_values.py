@@ -0,0 +1,73 @@
+"""Exact conversion of IIF amount and date fields.
+
+Amounts are handled as integer cents so sums and balance checks are exact;
+QuickBooks writes them with optional thousands separators and quotes, e.g.
+"99,250.02", -1500 or 12.5.
+"""
+
+from datetime import date
+from typing import Optional
+
+def parse_amount_cents(text: str) -> int:
+    """Convert an IIF amount to integer cents without going through float.
+
+    Args:
+        text: Raw field value; blank means zero
+
+    Returns:
+        Amount in cents
+
+    Raises:
+        ValueError: If the value is not a decimal amount with at most two decimals
+    """
+    value = text.strip().strip('"').replace(',', '')
+    if not value:
+        return 0
+    negative = value.startswith('-')
+    if negative or value.startswith('+'):
+        value = value[1:]
+    whole, _, fraction = value.partition('.')
+    if (not whole and not fraction) or not (whole or '0').isdigit() or (fraction and not fraction.isdigit()):
+        raise ValueError(f"invalid amount '{text}'")
+    if len(fraction) > 2:
+        # QuickBooks pads some exports with zeros beyond cents
+        if fraction[2:].strip('0'):
+            raise ValueError(f"amount '{text}' has more than two decimal places")
+        fraction = fraction[:2]
+    cents = int(whole or '0') * 100 + int(fraction.ljust(2, '0') or '0')
+    return -cents if negative else cents
+
+def format_cents(cents: int) -> str:
+    """Format integer cents as a plain decimal string, e.g. -1234 -> '-12.34'."""
+    sign = '-' if cents < 0 else ''
+    whole, fraction = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{fraction:02d}"
+
+def parse_iif_date(text: str) -> Optional[date]:
+    """Parse an IIF date (M/D/YYYY, M/D/YY or, as in !BUD, YYYY-MM-DD); returns None for blank values.
+
+    Raises:
+        ValueError: If the value is not a valid date
+    """
+    value = text.strip().strip('"')
+    if not value:
+        return None
+    if '-' in value:
+        return date.fromisoformat(value)
+    parts = value.split('/')
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        raise ValueError(f"invalid date '{text}'")
+    month, day, year = (int(part) for part in parts)
+    if len(parts[2]) <= 2:
+        # Two-digit years: QuickBooks pivots at 1950
+        year += 1900 if year >= 50 else 2000
+    return date(year, month, day)
+
+def unquote_iif(text: str) -> str:
+    """Remove the CSV-style quotes QuickBooks puts around values with commas or quotes.
+
+    '"Balak, Mike"' -> 'Balak, Mike'; doubled inner quotes are undone.
+    """
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1].replace('""', '"')
+    return text
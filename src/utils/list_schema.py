@@ -0,0 +1,173 @@
+"""Declarative list modules: a field mapping compiled once into a row transformer.
+
+Most QBD lists (CLASS, TERMS, PAYMETH, ...) convert one IIF record into one
+output row with at most a small per-field transform. Instead of a hand-written
+module per list, a list is declared as a ListModuleSchema and compiled into a
+specialized pipeline function for register_global_module:
+
+- the source fields are fetched with a single operator.itemgetter call per record
+- the output row is built by a generated function with the column order,
+  transforms, defaults and constants inlined, so there is no per-field loop and
+  no intermediate dict per record
+- rows are streamed straight into an AtomicOutputFile CSV
+
+Records from a differently laid out header of the same section may lack some
+source fields; those (and only those) fall back to dict.get lookups.
+"""
+
+import csv
+import os
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .error_handler import DomainValidationError, OutputWriteError
+from .logging import log_user_info, log_user_error, log_technical_lazy, timed_stage
+from .output_writer import AtomicOutputFile
+
+# Records listed in the validation error message; the total count is always reported
+MAX_REPORTED_ROWS = 20
+
+class ListField(NamedTuple):
+    """One output column of a list module.
+
+    Attributes:
+        column: Output CSV column header
+        source: IIF field name, or None for a constant column
+        transform: Optional function applied to the raw value
+        default: Value used when the source value is blank (the constant when source is None)
+    """
+    column: str
+    source: Optional[str]
+    transform: Optional[Callable[[str], str]] = None
+    default: str = ''
+
+class ListModuleSchema(NamedTuple):
+    """Declaration of a list module.
+
+    Attributes:
+        section: IIF module key (without '!'), e.g. 'CLASS'
+        output_filename: File written to the payload output_dir
+        fields: Output columns, in order
+        required: Source fields that must be non-blank in every record
+    """
+    section: str
+    output_filename: str
+    fields: Tuple[ListField, ...]
+    required: Tuple[str, ...] = ('NAME',)
+
+RowTransformer = Callable[[Dict[str, str]], Tuple[str, ...]]
+
+def _compile_row_function(schema: ListModuleSchema, getter: Callable[[Dict[str, str]], Any],
+                          sources: List[str]) -> RowTransformer:
+    """Generate the row builder for one field getter."""
+    namespace: Dict[str, Any] = {'_get': getter}
+    position = {source: index for index, source in enumerate(sources)}
+    expressions = []
+    for index, field in enumerate(schema.fields):
+        if field.source is None:
+            namespace[f'_c{index}'] = field.default
+            expressions.append(f'_c{index}')
+            continue
+        value = f'v[{position[field.source]}]'
+        if field.default:
+            namespace[f'_d{index}'] = field.default
+            value = f'({value} or _d{index})'
+        if field.transform is not None:
+            namespace[f'_t{index}'] = field.transform
+            value = f'_t{index}({value})'
+        expressions.append(value)
+
+    fetch = 'v = _get(r)' if len(sources) > 1 else 'v = (_get(r),)'
+    code = f"def row(r):\n    {fetch}\n    return ({', '.join(expressions)},)\n"
+    exec(compile(code, f'<list module {schema.section}>', 'exec'), namespace)
+    return namespace['row']
+
+def compile_row_transformers(schema: ListModuleSchema) -> Tuple[RowTransformer, RowTransformer]:
+    """Compile a schema into its row transformers.
+
+    Returns:
+        (fast, tolerant): fast uses operator.itemgetter and raises KeyError when a
+        record lacks a source field; tolerant reads missing fields as blank
+    """
+    sources: List[str] = []
+    for field in schema.fields:
+        if field.source is not None and field.source not in sources:
+            sources.append(field.source)
+    if not sources:
+        raise ValueError(f"List module {schema.section} declares no source fields")
+
+    def tolerant_get(record: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(record.get(source, '') for source in sources)
+
+    tolerant_getter = tolerant_get if len(sources) > 1 else (lambda record: record.get(sources[0], ''))
+    return (_compile_row_function(schema, itemgetter(*sources), sources),
+            _compile_row_function(schema, tolerant_getter, sources))
+
+def compile_row_transformer(schema: ListModuleSchema) -> RowTransformer:
+    """Compile a schema into one row function that tries the itemgetter path first."""
+    fast, tolerant = compile_row_transformers(schema)
+
+    def transform(record: Dict[str, str]) -> Tuple[str, ...]:
+        try:
+            return fast(record)
+        except KeyError:
+            return tolerant(record)
+    return transform
+
+def _iter_rows(records: Iterable[Dict[str, str]], fast: RowTransformer,
+               tolerant: RowTransformer) -> Iterable[Tuple[str, ...]]:
+    for record in records:
+        try:
+            yield fast(record)
+        except KeyError:
+            yield tolerant(record)
+
+def compile_list_module(schema: ListModuleSchema) -> Callable[[Dict[str, Any]], bool]:
+    """Compile a list schema into a pipeline function for register_global_module.
+
+    Args:
+        schema: List module declaration
+
+    Returns:
+        Pipeline function taking the core dispatch payload and returning True on success
+    """
+    fast, tolerant = compile_row_transformers(schema)
+    columns = tuple(field.column for field in schema.fields)
+    domain = f"{schema.section}-PIPELINE"
+
+    def run_list_pipeline(payload: Dict[str, Any]) -> bool:
+        try:
+            records = payload.get('records', [])
+            output_dir = payload.get('output_dir', 'output')
+            log_user_info(f"[{domain}] Starting {schema.section} list processing with {len(records)} records")
+
+            missing = [position for position, record in enumerate(records, start=1)
+                       if not all(record.get(source, '').strip() for source in schema.required)]
+            if missing:
+                listed = ', '.join(str(position) for position in missing[:MAX_REPORTED_ROWS])
+                more = f" and {len(missing) - MAX_REPORTED_ROWS} more" if len(missing) > MAX_REPORTED_ROWS else ""
+                raise DomainValidationError(f"{len(missing)} {schema.section} records lack required fields "
+                                            f"{', '.join(schema.required)}: records {listed}{more}")
+
+            output_path = os.path.join(output_dir, schema.output_filename)
+            with timed_stage(domain, 'export', {'records': len(records)}):
+                try:
+                    with AtomicOutputFile(output_path) as f:
+                        writer = csv.writer(f)
+                        writer.writerow(columns)
+                        writer.writerows(_iter_rows(records, fast, tolerant))
+                except OSError as e:
+                    raise OutputWriteError(f"Failed to write {schema.section} CSV to {output_path}: {str(e)}")
+
+            log_technical_lazy("[%s] Output file: %s with %d columns (sha256 %s, %s)", domain, output_path,
+                               len(columns), f.result.digest[:12], 'updated' if f.result.changed else 'unchanged')
+            log_user_info(f"[{domain}] Generated {schema.output_filename} ({len(records)} records)")
+            return True
+
+        except Exception as e:
+            log_user_error(f"[{domain}] {schema.section} list processing failed: {str(e)}")
+            raise
+
+    run_list_pipeline.__name__ = f"run_{schema.section.lower()}_pipeline"
+    run_list_pipeline.__qualname__ = run_list_pipeline.__name__
+    return run_list_pipeline
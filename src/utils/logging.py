@@ -4,20 +4,224 @@ This module provides user-focused console logging with technical details in file
 Updated to remove 'root:' logger names and 'AUDIT:' prefixes per logging specification.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from .error_handler import ConversionError
 
-def setup_logging(log_file: Optional[str] = None) -> None:
+# Logger for per-record detail (one line per account, tree node or IIF line); the
+# log profile decides whether it is enabled. Records propagate to the root handlers.
+RECORD_LOGGER_NAME = 'qbd.records'
+_record_logger = logging.getLogger(RECORD_LOGGER_NAME)
+
+# Log profiles: level of the per-record detail logger
+LOG_PROFILES = {
+    'standard': logging.DEBUG,      # full per-record detail in the file log
+    'production': logging.WARNING,  # per-record debug off; stage-level detail kept
+}
+
+# Message accepted by the lazy helpers: a %-style template or a callable returning the text
+LazyMessage = Union[str, Callable[[], str]]
+
+# Maximum number of records waiting for the background log writer; callers block when full
+LOG_QUEUE_SIZE = 10000
+
+# Background listener and its queue when queued logging is active
+_log_queue: Optional[queue.Queue] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+class _BlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener and blocks on a full queue.
+    
+    The stock handler formats every record in the calling thread and drops records
+    when a bounded queue is full; here the record is queued as is (the listener's
+    handlers format it) and a full queue applies back-pressure instead of losing lines.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.put(record)
+
+# Repetitive DEBUG messages: lines written per template before suppression starts,
+# and how many suppressed occurrences pass between roll-up lines
+LOG_DEDUP_FIRST_N = 20
+LOG_DEDUP_REPORT_EVERY = 10000
+
+# Variable parts of pre-formatted messages: quoted values, bracketed lists and numbers
+_TEMPLATE_VALUE_RE = re.compile(r"'[^']*'|\[[^\]]*\]|\d+(?:\.\d+)?")
+
+class DedupFilter(logging.Filter):
+    """Rate-limit repetitive DEBUG messages, grouped by message template.
+    
+    Records logged with %-style args are grouped by their template; pre-formatted
+    messages are grouped after masking quoted values, bracketed lists and numbers.
+    The first `first_n` records of a template pass unchanged. After that only every
+    `report_every`-th record passes, annotated with the number suppressed since the
+    previous report, and `summary()` returns the counts still pending (written by
+    flush_logs). INFO and higher records and metrics records are never suppressed.
+    
+    The count is attached to the record as `dedup_suppressed` rather than written
+    into its message, since other handlers format the same record; DedupFormatter
+    on the file handler renders it.
+    """
+    
+    def __init__(self, first_n: int = LOG_DEDUP_FIRST_N, report_every: int = LOG_DEDUP_REPORT_EVERY):
+        super().__init__()
+        self.first_n = first_n
+        self.report_every = report_every
+        self._seen: Dict[str, int] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def template_of(record: logging.LogRecord) -> str:
+        if record.args:
+            return str(record.msg)
+        return _TEMPLATE_VALUE_RE.sub('#', str(record.msg))
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (record.levelno > logging.DEBUG or getattr(record, 'dedup_summary', False)
+                or hasattr(record, 'qbd_metrics')):
+            return True
+        template = self.template_of(record)
+        with self._lock:
+            seen = self._seen.get(template, 0) + 1
+            self._seen[template] = seen
+            if seen <= self.first_n:
+                return True
+            suppressed = self._suppressed.get(template, 0) + 1
+            if suppressed < self.report_every:
+                self._suppressed[template] = suppressed
+                return False
+            self._suppressed[template] = 0
+        # Periodic roll-up: let this occurrence through with the suppressed count
+        record.dedup_suppressed = suppressed - 1
+        return True
+    
+    def summary(self) -> List[Tuple[str, int]]:
+        """Return and reset (template, suppressed count) for templates with pending suppressions."""
+        with self._lock:
+            pending = [(template, count) for template, count in self._suppressed.items() if count]
+            for template, _ in pending:
+                self._suppressed[template] = 0
+        return pending
+
+class DedupFormatter(logging.Formatter):
+    """File log formatter that appends DedupFilter's suppressed count to the line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'dedup_suppressed', None)
+        if suppressed is None:
+            return text
+        return f"{text} [{suppressed} similar messages suppressed since last report]"
+
+# File handler and its dedup filter, for roll-up lines written by flush_logs
+_dedup_target: Optional[Tuple[DedupFilter, logging.Handler]] = None
+
+def _write_dedup_summary() -> None:
+    """Write one roll-up line per template with suppressed messages to the file log."""
+    if _dedup_target is None:
+        return
+    dedup_filter, handler = _dedup_target
+    for template, count in dedup_filter.summary():
+        record = logging.LogRecord('root', logging.DEBUG, __file__, 0,
+                                   "[LOG] Suppressed %d more messages like: %s", (count, template), None)
+        record.dedup_summary = True
+        handler.handle(record)
+
+# Structured JSON-lines run log: size-based rotation of output/qbd-to-gnucash.jsonl
+LOG_JSON_MAX_BYTES = 50 * 1024 * 1024
+LOG_JSON_BACKUP_COUNT = 5
+
+# Logger for metrics records (stage, counts, durations); written to both logs
+METRICS_LOGGER_NAME = 'qbd.metrics'
+_metrics_logger = logging.getLogger(METRICS_LOGGER_NAME)
+
+_DOMAIN_TAG_RE = re.compile(r"\[([A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*)\]")
+_ERROR_CODE_RE = re.compile(r"\b(E\d{4})\b")
+
+# One encoder instance reused for every record (stdlib json, compact separators)
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line.
+    
+    Keys: ts, level, message, plus domain (first [TAG] in the message), error_code
+    (from a ConversionError or an Exxxx code in the message) and, for metrics
+    records, stage, counts and durations_ms. Keys without a value are omitted.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        entry: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'message': message,
+        }
+        domain = _DOMAIN_TAG_RE.search(message)
+        if domain:
+            entry['domain'] = domain.group(1)
+        error_code = getattr(record, 'error_code', None)
+        if error_code is None and record.exc_info and isinstance(record.exc_info[1], ConversionError):
+            error_code = record.exc_info[1].error_code
+        if error_code is None:
+            code = _ERROR_CODE_RE.search(message)
+            error_code = code.group(1) if code else None
+        if error_code:
+            entry['error_code'] = error_code
+        metrics = getattr(record, 'qbd_metrics', None)
+        if metrics:
+            entry.update(metrics)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return _JSON_ENCODER.encode(entry)
+
+def _json_sink_filter(record: logging.LogRecord) -> bool:
+    """JSON sink keeps user-level records (INFO and up) and all metrics records."""
+    return record.levelno >= logging.INFO or hasattr(record, 'qbd_metrics')
+
+def _stop_queue_listener() -> None:
+    """Drain the log queue and stop the background writer thread."""
+    global _queue_listener, _log_queue
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _write_dedup_summary()
+        for handler in _queue_listener.handlers:
+            handler.flush()
+            handler.close()
+        _queue_listener = None
+        _log_queue = None
+
+def setup_logging(log_file: Optional[str] = None, queued: bool = True, profile: str = 'standard',
+                  dedup: bool = True, json_log_file: Optional[str] = None, json_log: bool = True) -> None:
     """Initialize the logging system with user-focused console and detailed file logging.
     
     Args:
         log_file: Optional path to the log file. If not provided, defaults to 'output/qbd-to-gnucash.log'
+        queued: Format and write records on a background thread behind a bounded queue
+            (LOG_QUEUE_SIZE) so logging calls do not block on file or console I/O
+        profile: Key of LOG_PROFILES; 'production' turns per-record debug logging off
+        dedup: Rate-limit repetitive DEBUG messages in the file log (see DedupFilter)
+        json_log_file: Path of the JSON-lines run log (defaults to qbd-to-gnucash.jsonl next to log_file)
+        json_log: Write the JSON-lines run log (INFO and up plus metrics, rotated by size)
     """
+    global _log_queue, _queue_listener, _dedup_target
+    if profile not in LOG_PROFILES:
+        raise ValueError(f"Unknown log profile '{profile}' (expected one of: {', '.join(LOG_PROFILES)})")
     if not log_file:
         log_file = os.path.join('output', 'qbd-to-gnucash.log')
     
@@ -26,8 +230,10 @@ def setup_logging(log_file: Optional[str] = None) -> None:
     # Configure root logger to capture everything
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
+    _record_logger.setLevel(LOG_PROFILES[profile])
     
-    # Clear any existing handlers
+    # Clear any existing handlers (and a previous background writer)
+    _stop_queue_listener()
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     
@@ -42,12 +248,38 @@ def setup_logging(log_file: Optional[str] = None) -> None:
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     # Remove 'root:' from file format - show timestamp, level, and message only
-    file_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    file_formatter = DedupFormatter('%(asctime)s [%(levelname)s] %(message)s')
     file_handler.setFormatter(file_formatter)
+    _dedup_target = None
+    if dedup:
+        dedup_filter = DedupFilter()
+        file_handler.addFilter(dedup_filter)
+        _dedup_target = (dedup_filter, file_handler)
     
-    # Add handlers to root logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    handlers: List[logging.Handler] = [console_handler, file_handler]
+    
+    # JSON-lines sink - structured user-level and metrics records, rotated by size
+    if json_log:
+        if not json_log_file:
+            json_log_file = os.path.join(os.path.dirname(log_file), 'qbd-to-gnucash.jsonl')
+        json_handler = logging.handlers.RotatingFileHandler(
+            json_log_file, maxBytes=LOG_JSON_MAX_BYTES, backupCount=LOG_JSON_BACKUP_COUNT, encoding='utf-8')
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.addFilter(_json_sink_filter)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+    
+    if queued:
+        # Root logger only enqueues; the listener thread formats and writes
+        _log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _queue_listener = logging.handlers.QueueListener(
+            _log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+        logger.addHandler(_BlockingQueueHandler(_log_queue))
+    else:
+        # Add handlers to root logger
+        for handler in handlers:
+            logger.addHandler(handler)
     
     # Log startup message to console (user-focused) with domain tag
     logging.info("[CORE] QBD to GnuCash Conversion Tool - Started")
@@ -56,6 +288,10 @@ def setup_logging(log_file: Optional[str] = None) -> None:
     logging.debug("[CORE] Detailed logging initialized: " + log_file)
     logging.debug("[CORE] Console logging: INFO level (user-focused)")
     logging.debug("[CORE] File logging: DEBUG level (technical details)")
+    logging.debug(f"[CORE] Log writer: {'background queue' if queued else 'synchronous'}")
+    logging.debug(f"[CORE] Log profile: {profile}")
+    if json_log:
+        logging.debug("[CORE] JSON-lines run log: " + json_log_file)
 
 def log_user_info(message: str) -> None:
     """Log user-focused information to console and file."""
@@ -84,6 +320,75 @@ def log_technical_detail(message: str) -> None:
     # Remove AUDIT: prefix per logging specification
     logging.debug(message)
 
+def _log_lazy(logger: logging.Logger, message: LazyMessage, args: tuple) -> None:
+    """Emit a DEBUG record only if enabled; formatting happens in the handler."""
+    if logger.isEnabledFor(logging.DEBUG):
+        if callable(message):
+            logger.debug(message())
+        else:
+            logger.debug(message, *args)
+
+def log_technical_lazy(message: LazyMessage, *args) -> None:
+    """Log technical details (DEBUG) with deferred formatting.
+    
+    Args:
+        message: %-style template formatted with args, or a callable returning the text
+        args: Values for the template; nothing is formatted when DEBUG is disabled
+    """
+    _log_lazy(logging.getLogger(), message, args)
+
+def log_record_detail(message: LazyMessage, *args) -> None:
+    """Log per-record technical detail with deferred formatting (off in the production profile)."""
+    _log_lazy(_record_logger, message, args)
+
+def record_detail_enabled() -> bool:
+    """Return True when per-record detail is logged, for call sites that must precompute values."""
+    return _record_logger.isEnabledFor(logging.DEBUG)
+
+def log_metrics(domain: str, stage: str, counts: Optional[Dict[str, int]] = None,
+                durations_ms: Optional[Dict[str, float]] = None, error_code: Optional[str] = None) -> None:
+    """Log a metrics record (file log line and structured JSON-lines record).
+    
+    Args:
+        domain: Domain tag without brackets, e.g. 'ACCOUNTS-PIPELINE'
+        stage: Processing stage name, e.g. 'export'
+        counts: Item counts for the stage
+        durations_ms: Durations in milliseconds
+        error_code: Error code when the stage failed
+    """
+    metrics: Dict[str, Any] = {'domain': domain, 'stage': stage}
+    if counts:
+        metrics['counts'] = counts
+    if durations_ms:
+        metrics['durations_ms'] = durations_ms
+    extra = {'qbd_metrics': metrics}
+    if error_code:
+        extra['error_code'] = error_code
+    _metrics_logger.debug("[%s] Metrics %s: counts=%s durations_ms=%s", domain, stage,
+                          counts or {}, durations_ms or {}, extra=extra)
+
+@contextmanager
+def timed_stage(domain: str, stage: str, counts: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, int]]:
+    """Time a processing stage and log its metrics record on exit.
+    
+    Yields the counts dict so the stage can add counts as it learns them. A stage
+    that raises is logged with the ConversionError code (or E9999) and re-raised.
+    """
+    counts = counts if counts is not None else {}
+    start = time.perf_counter()
+    error_code = None
+    try:
+        yield counts
+    except ConversionError as e:
+        error_code = e.error_code
+        raise
+    except Exception:
+        error_code = 'E9999'
+        raise
+    finally:
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        log_metrics(domain, stage, counts, {'total': elapsed_ms}, error_code)
+
 def log_module_registration(module_key: str) -> None:
     """Log module registration - file only with domain tag."""
     logging.debug(f"[CORE] Module registered - {module_key} module key -> processing function")
@@ -95,15 +400,17 @@ def log_unregistered_module_key(module_key: str, record_count: int) -> None:
 
 def log_field_mismatch(line_number: int, section: str, expected: int, got: int) -> None:
     """Log field count mismatch - file only with domain tag."""
-    logging.debug(f"[IIF-PARSER] Field count mismatch at line {line_number} in section {section}. Expected {expected}, got {got}")
+    log_record_detail("[IIF-PARSER] Field count mismatch at line %d in section %s. Expected %d, got %d",
+                      line_number, section, expected, got)
 
 def log_config_mapping(account_name: str, qbd_type: str, gnucash_type: str, hierarchy: str) -> None:
     """Log detailed config mapping - file only."""
-    logging.debug(f"[ACCOUNTS-MAPPING] Mapped account '{account_name}' ({qbd_type}) -> {gnucash_type} at {hierarchy}")
+    log_record_detail("[ACCOUNTS-MAPPING] Mapped account '%s' (%s) -> %s at %s",
+                      account_name, qbd_type, gnucash_type, hierarchy)
 
 def log_config_placement(account_name: str, hierarchy: str, gnucash_type: str) -> None:
     """Log account placement - file only."""
-    logging.debug(f"[ACCOUNTS-TREE] Placed account '{account_name}' under '{hierarchy}' as {gnucash_type}")
+    log_record_detail("[ACCOUNTS-TREE] Placed account '%s' under '%s' as %s", account_name, hierarchy, gnucash_type)
 
 def log_file_processing_start(file_path: str) -> None:
     """Log start of file processing - user focused."""
@@ -168,6 +475,19 @@ def log_sections_found(sections: list) -> None:
     log_technical_detail(f"[CORE] Module keys found: {sections}")
 
 def flush_logs() -> None:
-    """Flush all log handlers to ensure data is written."""
+    """Flush all log handlers to ensure data is written.
+    
+    In queued mode this first waits until the background writer has handled every
+    record queued so far. Pending roll-up counts of deduplicated messages are written.
+    """
+    if _queue_listener is not None:
+        _log_queue.join()
+    _write_dedup_summary()
+    if _queue_listener is not None:
+        for handler in _queue_listener.handlers:
+            handler.flush()
     for handler in logging.getLogger().handlers:
-        handler.flush()
\ No newline at end of file
+        handler.flush()
+
+# Drain queued records on interpreter exit (including sys.exit from log_and_exit)
+atexit.register(_stop_queue_listener)
\ No newline at end of file
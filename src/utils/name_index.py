@@ -0,0 +1,56 @@
+"""Shared name index across the QBD name lists (CUST, VEND, OTHERNAME).
+
+QuickBooks keeps customer, vendor, employee and other names in one namespace;
+GnuCash keeps separate customer and vendor tables. The name modules publish one
+NameIndex in extra_config under NAME_INDEX_KEY and add every name they convert,
+so a name used in more than one list (or twice after normalization) is caught
+when the second copy is indexed.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# extra_config key under which the name modules share the index
+NAME_INDEX_KEY = 'name_index'
+
+class NameEntry(NamedTuple):
+    """One indexed name."""
+    section: str        # IIF section the name came from, e.g. 'CUST'
+    name: str           # Name as converted (quotes removed)
+    record_id: str      # Identifier in the section's output (e.g. customer id)
+
+def normalize_name(name: str) -> str:
+    """Comparison key: case-folded with runs of whitespace collapsed."""
+    return ' '.join(name.split()).casefold()
+
+class NameIndex:
+    """Hash index of every converted name keyed by its normalized form."""
+
+    def __init__(self):
+        self.entries: Dict[str, NameEntry] = {}
+        self.duplicates: List[Tuple[NameEntry, NameEntry]] = []
+
+    def add(self, section: str, name: str, record_id: str = '') -> Optional[NameEntry]:
+        """Index one name.
+
+        Returns:
+            The previously indexed entry when the normalized name is already taken
+            (the pair is also recorded in duplicates), otherwise None
+        """
+        entry = NameEntry(section, name, record_id)
+        key = normalize_name(name)
+        existing = self.entries.get(key)
+        if existing is not None:
+            self.duplicates.append((existing, entry))
+            return existing
+        self.entries[key] = entry
+        return None
+
+    def lookup(self, name: str) -> Optional[NameEntry]:
+        """Return the first entry indexed under the normalized name."""
+        return self.entries.get(normalize_name(name))
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,168 @@
+"""Content-addressed output files with atomic replace.
+
+Outputs are written to a temporary file in the target directory while a
+SHA-256 of the content is computed on the fly. On commit the digest is compared
+with the digest recorded for the previous run in OUTPUT_MANIFEST_FILENAME:
+
+- unchanged content: the temporary file is discarded and the existing output
+  (and its modification time) is left untouched, so downstream re-imports can
+  be skipped
+- changed content: the temporary file is renamed over the target with
+  os.replace, so readers never see a half-written file, even after a crash
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, NamedTuple, Optional
+
+from .error_handler import OutputWriteError
+
+# Per output directory record of the last committed digest of each output file
+OUTPUT_MANIFEST_FILENAME = ".output_manifest.json"
+
+# Write buffer for output files
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# Read block size when hashing files already on disk
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+class OutputWriteResult(NamedTuple):
+    """Outcome of committing one output file."""
+    path: str
+    digest: str
+    size: int
+    changed: bool
+
+def _temp_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.tmp"
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _load_manifest(directory: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(directory, OUTPUT_MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(directory: str, manifest: Dict[str, str]) -> None:
+    manifest_path = os.path.join(directory, OUTPUT_MANIFEST_FILENAME)
+    temp_path = _temp_path(manifest_path)
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+def commit_output(temp_path: str, path: str, digest: Optional[str] = None) -> OutputWriteResult:
+    """Move a finished temporary file into place unless its content is unchanged.
+
+    Args:
+        temp_path: Fully written temporary file in the same directory as path
+        path: Final output path
+        digest: SHA-256 of the temporary file if already known (hashed from disk otherwise)
+
+    Returns:
+        OutputWriteResult describing the committed file
+    """
+    if digest is None:
+        digest = hash_file(temp_path)
+    size = os.path.getsize(temp_path)
+    directory = os.path.dirname(path) or '.'
+    name = os.path.basename(path)
+
+    manifest = _load_manifest(directory)
+    previous = manifest.get(name)
+    if previous is None and os.path.exists(path):
+        # First run with a manifest: hash the existing output once
+        previous = hash_file(path)
+
+    if previous == digest and os.path.exists(path):
+        os.remove(temp_path)
+        changed = False
+    else:
+        os.replace(temp_path, path)
+        changed = True
+
+    if manifest.get(name) != digest:
+        manifest[name] = digest
+        _save_manifest(directory, manifest)
+    return OutputWriteResult(path, digest, size, changed)
+
+class AtomicOutputFile:
+    """Text output file written to a temp file, hashed while writing, committed atomically.
+
+    Usage::
+
+        with AtomicOutputFile(path) as f:
+            csv.writer(f).writerows(rows)
+        if not f.result.changed:
+            ...  # identical to the previous run
+
+    The file object only supports write(); it is meant for csv.writer and similar
+    streaming producers. If the block raises, the temporary file is removed and
+    the existing output is left as it was. Without the context manager, call
+    open(), write(), then commit() or discard(); this lets several files be
+    committed together once all of them are complete.
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8', buffering: int = OUTPUT_BUFFER_SIZE):
+        self.path = path
+        self.encoding = encoding
+        self.buffering = buffering
+        self.temp_path = _temp_path(path)
+        self.result: Optional[OutputWriteResult] = None
+        self._file = None
+        self._digest = None
+
+    def __enter__(self) -> 'AtomicOutputFile':
+        self.open()
+        return self
+
+    def open(self) -> None:
+        """Create the temporary file (the context manager does this on entry)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.temp_path, 'wb', buffering=self.buffering)
+        self._digest = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        data = text.encode(self.encoding)
+        self._digest.update(data)
+        self._file.write(data)
+        return len(text)
+
+    def close(self) -> None:
+        """Finish writing; the file stays pending until commit() or discard()."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def commit(self) -> OutputWriteResult:
+        """Move the finished file into place (or keep the unchanged existing file)."""
+        self.close()
+        try:
+            self.result = commit_output(self.temp_path, self.path, self._digest.hexdigest())
+        except OSError as e:
+            self.discard()
+            raise OutputWriteError(f"Failed to commit output file {self.path}: {str(e)}")
+        return self.result
+
+    def discard(self) -> None:
+        """Drop the temporary file and leave the existing output as it was."""
+        self.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.discard()
+            return
+        self.commit()
@@ -0,0 +1,41 @@
+"""GnuCash multi-split transaction CSV layout shared by transaction writers.
+
+Each split is one CSV row; the rows of a transaction share Date, Transaction ID,
+Number and Description, which is the layout the GnuCash transaction importer
+reads in multi-split mode. Used by the transactions module's chunk files and
+the accounts module's opening-balance transaction.
+"""
+
+from typing import Iterator, List, NamedTuple, Tuple
+
+from .iif_values import format_cents
+
+# GnuCash multi-split transaction CSV columns, in order
+TRANSACTION_CSV_COLUMNS = (
+    'Date', 'Transaction ID', 'Number', 'Description', 'Notes', 'Commodity/Currency',
+    'Action', 'Memo', 'Full Account Name', 'Amount Num.', 'Value Num.', 'Reconcile'
+)
+
+class TransactionSplit(NamedTuple):
+    """One resolved split of a balanced transaction."""
+    full_account_name: str
+    cents: int
+    memo: str
+    action: str
+    reconcile: str
+
+class Transaction(NamedTuple):
+    """One balanced transaction ready for export."""
+    transaction_id: str
+    date: str           # ISO date
+    number: str
+    description: str
+    notes: str
+    splits: List[TransactionSplit]
+
+def transaction_rows(transaction: Transaction, commodity_label: str) -> Iterator[Tuple[str, ...]]:
+    """CSV rows of one transaction in TRANSACTION_CSV_COLUMNS order, one per split."""
+    return ((transaction.date, transaction.transaction_id, transaction.number, transaction.description,
+             transaction.notes, commodity_label, split.action, split.memo, split.full_account_name,
+             format_cents(split.cents), format_cents(split.cents), split.reconcile)
+            for split in transaction.splits)
@@ -0,0 +1,28 @@
+"""Shared pytest setup: the source tree is importable the way main.py runs it (from src/)."""
+
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+SAMPLE_IIF = os.path.join(os.path.dirname(SRC_DIR), 'input', 'qbd-all-lists-sample.IIF')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+@pytest.fixture(scope='session')
+def registered_modules():
+    """Register every module once per session, as main.py does for one run."""
+    from core import get_global_registry
+    from main import register_modules
+    if not get_global_registry():
+        register_modules()
+    return get_global_registry()
+
+@pytest.fixture
+def work_dir(tmp_path, monkeypatch):
+    """Fresh working directory with an output/ folder; the run's relative paths resolve here."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('output')
+    return tmp_path
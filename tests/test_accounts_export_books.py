@@ -0,0 +1,64 @@
+"""Native GnuCash book exports must carry the source account flags."""
+
+import gzip
+import sqlite3
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from conftest import SAMPLE_IIF
+from modules.accounts.accounts_export_sqlite import export_accounts_sqlite
+from modules.accounts.accounts_export_xml import export_accounts_xml
+from modules.accounts.accounts_mapping import compile_mapping_resolution, load_mapping
+from modules.accounts.accounts_tree import AccountNode, build_accounts_tree
+from utils.iif_parser import IIFParser
+
+XML_NS = {prefix: f"http://www.gnucash.org/XML/{prefix}" for prefix in ('gnc', 'act', 'slot')}
+
+@pytest.fixture
+def hidden_tree(work_dir):
+    """Sample chart with its first account marked hidden the way QuickBooks writes it."""
+    accounts = IIFParser(SAMPLE_IIF).parse()['ACCNT']
+    accounts[0]['HIDDEN'] = 'Y'
+    mapping = load_mapping()
+    root = build_accounts_tree(accounts, mapping, compile_mapping_resolution(mapping))
+    return root, mapping, accounts[0]['NAME'].split(':')[-1]
+
+def test_sqlite_book_keeps_quickbooks_hidden_flag(hidden_tree, work_dir):
+    root, mapping, hidden_name = hidden_tree
+    export_accounts_sqlite(root, mapping, output_dir="output")
+    connection = sqlite3.connect(str(work_dir / "output" / "accounts.gnucash"))
+    try:
+        hidden = connection.execute("SELECT name FROM accounts WHERE hidden = 1").fetchall()
+    finally:
+        connection.close()
+    assert hidden == [(hidden_name,)]
+
+def test_xml_book_keeps_quickbooks_hidden_flag(hidden_tree, work_dir):
+    root, mapping, hidden_name = hidden_tree
+    export_accounts_xml(root, mapping, output_dir="output")
+    with gzip.open(work_dir / "output" / "accounts.xml.gnucash") as book:
+        accounts = ET.parse(book).getroot().iterfind('gnc:book/gnc:account', XML_NS)
+        hidden = [account.findtext('act:name', namespaces=XML_NS) for account in accounts
+                  if any(key.text == 'hidden' for key in account.iterfind('act:slots/slot/slot:key', XML_NS))]
+    assert hidden == [hidden_name]
+
+def test_sqlite_book_roots_do_not_collide_with_account_names(work_dir):
+    root = AccountNode('Root', 'ROOT')
+    for name in ('Root Account', 'Template Root'):
+        root.add_child(AccountNode(name, 'ASSET'))
+    export_accounts_sqlite(root, load_mapping(), output_dir="output")
+    connection = sqlite3.connect(str(work_dir / "output" / "accounts.gnucash"))
+    try:
+        guids = connection.execute("SELECT guid FROM accounts").fetchall()
+    finally:
+        connection.close()
+    assert len(guids) == 4
+
+def test_xml_book_root_does_not_collide_with_account_names(work_dir):
+    root = AccountNode('Root', 'ROOT')
+    root.add_child(AccountNode('Root Account', 'ASSET'))
+    export_accounts_xml(root, load_mapping(), output_dir="output")
+    with gzip.open(work_dir / "output" / "accounts.xml.gnucash") as book:
+        guids = [guid.text for guid in ET.parse(book).getroot().iterfind('gnc:book/gnc:account/act:id', XML_NS)]
+    assert len(set(guids)) == 2
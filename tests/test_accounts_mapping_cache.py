@@ -0,0 +1,33 @@
+"""Compiled mapping cache: JSON under the run's output_dir, ignored when stale or malformed."""
+
+import json
+import os
+
+from modules.accounts.accounts_mapping import MAPPING_CACHE_FILENAME, load_mapping
+
+def test_cache_is_json_in_output_dir(work_dir):
+    output_dir = str(work_dir / 'elsewhere')
+
+    mapping = load_mapping(output_dir=output_dir)
+
+    cache_path = os.path.join(output_dir, MAPPING_CACHE_FILENAME)
+    with open(cache_path, encoding='utf-8') as f:
+        cached = json.load(f)
+    assert cached['mapping'] == mapping
+    assert not os.listdir('output')
+    assert load_mapping(output_dir=output_dir) == mapping
+
+def test_tampered_cache_is_ignored(work_dir):
+    output_dir = str(work_dir / 'output')
+    mapping = load_mapping(output_dir=output_dir)
+    cache_path = os.path.join(output_dir, MAPPING_CACHE_FILENAME)
+
+    with open(cache_path, 'wb') as f:
+        f.write(b'\x80\x04\x95not json')
+    assert load_mapping(output_dir=output_dir) == mapping
+
+    with open(cache_path, encoding='utf-8') as f:
+        key = json.load(f)['key']
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'mapping': ['not', 'a', 'mapping']}, f)
+    assert load_mapping(output_dir=output_dir) == mapping
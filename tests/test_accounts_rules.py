@@ -0,0 +1,21 @@
+"""The combined name matcher must pick the same rule as matching each rule alone."""
+
+from modules.accounts.accounts_rules import compile_account_rules
+
+def _rule(pattern, **extra):
+    return dict(name_pattern=pattern, gnucash_type='EXPENSE', destination_hierarchy='Expenses', **extra)
+
+def _solo_match(rules, qbd_type, name):
+    """Winning rule index by trying every rule on its own, highest priority first."""
+    ranked = sorted(range(len(rules)), key=lambda i: (-rules[i].get('priority', 0), i))
+    for index in ranked:
+        if compile_account_rules([rules[index]]).match(qbd_type, name) is not None:
+            return index
+    return None
+
+def test_numbered_backreference_matches_like_solo_rule():
+    rules = [_rule('Office'), _rule(r'(\w+) and \1'), _rule(r'(?P<word>\w+)-(?P=word)')]
+    matcher = compile_account_rules(rules)
+    for name in ('Office', 'Rent and Rent', 'Rent and Office', 'Fees-Fees', 'Fees-Dues'):
+        assert matcher.match('EXP', name) == _solo_match(rules, 'EXP', name)
+    assert matcher.match('EXP', 'Rent and Rent') == 1
@@ -0,0 +1,155 @@
+"""Incremental account tree updates must equal a full build of the same records."""
+
+import copy
+import os
+import random
+
+import pytest
+
+from conftest import SAMPLE_IIF
+from modules.accounts.accounts_mapping import compile_mapping_resolution, load_mapping
+from modules.accounts.accounts_snapshot import (
+    _node_to_dict, build_or_update_accounts_tree, load_tree_snapshot, save_tree_snapshot, update_accounts_tree
+)
+from modules.accounts.accounts_tree import build_accounts_tree
+from utils.error_handler import ValidationError
+from utils.iif_parser import IIFParser
+
+EDITS = ('add', 'add_sub', 'remove', 'rename', 'modify', 'retype')
+
+@pytest.fixture
+def chart(work_dir):
+    accounts = IIFParser(SAMPLE_IIF).parse()['ACCNT']
+    mapping = load_mapping()
+    return accounts, mapping, compile_mapping_resolution(mapping)
+
+def _full_build(accounts, mapping, resolution):
+    """Tree of a full build as snapshot data, or the ValidationError it raises."""
+    try:
+        return _node_to_dict(build_accounts_tree(copy.deepcopy(accounts), mapping, resolution))
+    except ValidationError as e:
+        return type(e)
+
+def _incremental(snapshot, accounts, mapping, resolution):
+    """Tree of update_accounts_tree (a full build where it declines), or the ValidationError it raises."""
+    try:
+        root = update_accounts_tree(copy.deepcopy(snapshot), copy.deepcopy(accounts), mapping, resolution)
+    except ValidationError as e:
+        return type(e)
+    return _full_build(accounts, mapping, resolution) if root is None else _node_to_dict(root)
+
+def _snapshot(tmp_path, accounts, mapping, resolution):
+    path = str(tmp_path / 'snapshot.json')
+    root = build_accounts_tree(copy.deepcopy(accounts), mapping, resolution)
+    save_tree_snapshot(root, copy.deepcopy(accounts), mapping, path)
+    return load_tree_snapshot(path, mapping)
+
+def _edit(rng, accounts, qbd_types, serial):
+    """Apply one random edit of the kinds in EDITS to a copy of the records."""
+    accounts = copy.deepcopy(accounts)
+    kind = rng.choice(EDITS)
+    position = rng.randrange(len(accounts))
+    record = accounts[position]
+    if kind in ('add', 'add_sub'):
+        new = dict(record, REFNUM=f"9{serial:04d}", ACCNTTYPE=rng.choice(qbd_types), OBAMOUNT='0.00')
+        new['NAME'] = f"{record['NAME']}:New {serial}" if kind == 'add_sub' else f"New {serial}"
+        accounts.insert(rng.randrange(len(accounts) + 1), new)
+    elif kind == 'remove':
+        # Removing a parent would orphan its sub-accounts; remove leaves only
+        if not any(other['NAME'].startswith(record['NAME'] + ':') for other in accounts):
+            del accounts[position]
+    elif kind == 'rename':
+        if not any(other['NAME'].startswith(record['NAME'] + ':') for other in accounts):
+            record['NAME'] = f"{record['NAME']} Renamed {serial}"
+    elif kind == 'modify':
+        record['DESC'] = f"Changed {serial}"
+    else:
+        record['ACCNTTYPE'] = rng.choice(qbd_types)
+    return accounts
+
+@pytest.mark.parametrize('seed', range(40))
+def test_random_edits_match_full_build(tmp_path, chart, seed):
+    accounts, mapping, resolution = chart
+    rng = random.Random(seed)
+    # AR/AP are excluded from random types so most edits stay valid; the uniqueness case is tested below
+    qbd_types = sorted(qbd_type for qbd_type in mapping['account_types'] if qbd_type not in ('AR', 'AP'))
+    snapshot = _snapshot(tmp_path, accounts, mapping, resolution)
+
+    edited = accounts
+    for serial in range(rng.randint(1, 5)):
+        edited = _edit(rng, edited, qbd_types, seed * 100 + serial)
+
+    assert _incremental(snapshot, edited, mapping, resolution) == _full_build(edited, mapping, resolution)
+
+def test_unchanged_records_reuse_snapshot(tmp_path, chart):
+    accounts, mapping, resolution = chart
+    snapshot = _snapshot(tmp_path, accounts, mapping, resolution)
+
+    root = update_accounts_tree(snapshot, copy.deepcopy(accounts), mapping, resolution)
+
+    assert root is not None
+    assert _node_to_dict(root) == _full_build(accounts, mapping, resolution)
+
+def test_reordered_records_fall_back_to_full_build(tmp_path, chart):
+    accounts, mapping, resolution = chart
+    snapshot = _snapshot(tmp_path, accounts, mapping, resolution)
+    reordered = copy.deepcopy(accounts)
+    reordered[0], reordered[1] = reordered[1], reordered[0]
+
+    assert update_accounts_tree(copy.deepcopy(snapshot), copy.deepcopy(reordered), mapping, resolution) is None
+    assert _incremental(snapshot, reordered, mapping, resolution) == _full_build(reordered, mapping, resolution)
+
+def test_missing_refnum_falls_back_to_full_build(tmp_path, chart):
+    accounts, mapping, resolution = chart
+    snapshot = _snapshot(tmp_path, accounts, mapping, resolution)
+    edited = copy.deepcopy(accounts)
+    edited[3]['REFNUM'] = ''
+    edited[5]['DESC'] = 'Changed'
+
+    assert update_accounts_tree(copy.deepcopy(snapshot), copy.deepcopy(edited), mapping, resolution) is None
+    assert _incremental(snapshot, edited, mapping, resolution) == _full_build(edited, mapping, resolution)
+
+def test_second_ar_account_is_rejected_like_full_build(tmp_path, chart):
+    accounts, mapping, resolution = chart
+    snapshot = _snapshot(tmp_path, accounts, mapping, resolution)
+    edited = copy.deepcopy(accounts)
+    edited.append(dict(edited[0], NAME='Second Receivable', REFNUM='9999', ACCNTTYPE='AR'))
+
+    assert _full_build(edited, mapping, resolution) is ValidationError
+    assert _incremental(snapshot, edited, mapping, resolution) is ValidationError
+
+def test_mapping_change_discards_snapshot(work_dir, chart):
+    accounts, mapping, resolution = chart
+    output_dir = str(work_dir / 'output')
+    build_or_update_accounts_tree(copy.deepcopy(accounts), mapping, output_dir, resolution)
+
+    changed = copy.deepcopy(mapping)
+    changed['account_types']['BANK']['destination_hierarchy'] = 'Assets:Banks'
+    changed_resolution = compile_mapping_resolution(changed)
+    assert load_tree_snapshot(os.path.join(output_dir, 'accounts_tree_snapshot.json'), changed) is None
+
+    root = build_or_update_accounts_tree(copy.deepcopy(accounts), changed, output_dir, changed_resolution)
+    assert _node_to_dict(root) == _full_build(accounts, changed, changed_resolution)
+
+def test_snapshot_write_is_atomic_and_skips_unchanged(tmp_path, chart, monkeypatch):
+    accounts, mapping, resolution = chart
+    snapshot_dir = tmp_path / 'snapshots'
+    path = str(snapshot_dir / 'snapshot.json')
+    root = build_accounts_tree(copy.deepcopy(accounts), mapping, resolution)
+    save_tree_snapshot(root, copy.deepcopy(accounts), mapping, path)
+    with open(path, encoding='utf-8') as f:
+        saved = f.read()
+    before = os.stat(path)
+
+    save_tree_snapshot(root, copy.deepcopy(accounts), mapping, path)
+    after = os.stat(path)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    def interrupted_dump(data, f):
+        f.write('{"version": ')
+        raise OSError("disk full")
+    monkeypatch.setattr('modules.accounts.accounts_snapshot.json.dump', interrupted_dump)
+    save_tree_snapshot(root, accounts[:1], mapping, path)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == saved
+    assert not [name for name in os.listdir(snapshot_dir) if name.endswith('.tmp')]
@@ -0,0 +1,21 @@
+"""Sorted-neighbourhood duplicate detection compares each name with `window` following names."""
+
+from utils.duplicate_finder import NameCandidate, find_duplicate_candidates
+
+def _names(*names):
+    return [NameCandidate('names', 'CUST', name) for name in names]
+
+def test_pair_exactly_window_positions_apart_is_found():
+    # Sort order: baker, bakeraxqz, bakermnop, bakerr - the pair is three positions apart
+    candidates = _names('Baker', 'Bakeraxqz', 'Bakermnop', 'Bakerr')
+
+    pairs = find_duplicate_candidates(candidates, window=3)
+    assert [(pair.first.name, pair.second.name) for pair in pairs] == [('Baker', 'Bakerr')]
+
+    assert find_duplicate_candidates(candidates, window=2) == []
+
+def test_legal_forms_and_word_order_are_ignored():
+    pairs = find_duplicate_candidates(_names('ACME, Inc.', 'Acme LLC', 'Supply Acme', 'Acme Supply'))
+
+    assert {(pair.first.name, pair.second.name) for pair in pairs} == {
+        ('ACME, Inc.', 'Acme LLC'), ('Supply Acme', 'Acme Supply')}
@@ -0,0 +1,51 @@
+"""IIF parsing: TRNS blocks are streamed from the file rather than held in memory."""
+
+from utils.iif_parser import SPLITS_KEY, IIFParser, StreamedSection
+
+LEDGER = """!ACCNT\tNAME\tACCNTTYPE
+ACCNT\tChecking\tBANK
+!TRNS\tTRNSID\tACCNT\tAMOUNT
+!SPL\tSPLID\tACCNT\tAMOUNT
+!ENDTRNS
+TRNS\t1\tChecking\t-10.00
+SPL\t2\tRent\t10.00
+ENDTRNS
+TRNS\t3\tChecking\t-5.00
+SPL\t4\tRent\t2.00
+SPL\t5\tTravel\t3.00
+ENDTRNS
+!CLASS\tNAME
+CLASS\tWest
+"""
+
+def _write(tmp_path, text: str) -> str:
+    path = tmp_path / 'ledger.IIF'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_transactions_are_streamed(tmp_path):
+    sections = IIFParser(_write(tmp_path, LEDGER)).parse()
+
+    assert list(sections) == ['ACCNT', 'TRNS', 'CLASS']
+    assert [record['NAME'] for record in sections['ACCNT']] == ['Checking']
+    transactions = sections['TRNS']
+    assert isinstance(transactions, StreamedSection)
+    assert len(transactions) == 2
+
+    records = list(transactions)
+    assert [record['TRNSID'] for record in records] == ['1', '3']
+    assert [[split['SPLID'] for split in record[SPLITS_KEY]] for record in records] == [['2'], ['4', '5']]
+    # Every iteration re-reads the file
+    assert [record['TRNSID'] for record in transactions] == ['1', '3']
+
+def test_transaction_without_endtrns_ends_at_next_record(tmp_path):
+    text = LEDGER.replace("SPL\t2\tRent\t10.00\nENDTRNS\n", "SPL\t2\tRent\t10.00\n")
+    sections = IIFParser(_write(tmp_path, text)).parse()
+
+    assert [len(record[SPLITS_KEY]) for record in sections['TRNS']] == [1, 2]
+
+def test_streaming_can_be_turned_off(tmp_path):
+    sections = IIFParser(_write(tmp_path, LEDGER), streamed_sections=()).parse()
+
+    assert isinstance(sections['TRNS'], list)
+    assert [record['TRNSID'] for record in sections['TRNS']] == ['1', '3']
@@ -0,0 +1,51 @@
+"""File-log dedup: annotations stay on the file handler and metrics are never suppressed."""
+
+import io
+import logging
+
+import pytest
+
+from utils.logging import DedupFilter, DedupFormatter
+
+class _MessageCollector(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+@pytest.fixture
+def handlers():
+    """Logger with a deduplicated file-style handler followed by a second sink on the same records."""
+    stream = io.StringIO()
+    file_handler = logging.StreamHandler(stream)
+    file_handler.addFilter(DedupFilter(first_n=2, report_every=3))
+    file_handler.setFormatter(DedupFormatter('%(message)s'))
+    collector = _MessageCollector()
+    logger = logging.getLogger('tests.dedup')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.handlers = [file_handler, collector]
+    yield logger, stream, collector
+    logger.handlers = []
+
+def test_suppressed_count_is_only_in_file_log(handlers):
+    logger, stream, collector = handlers
+    for number in range(8):
+        logger.debug("Processed account %d", number)
+
+    assert stream.getvalue().splitlines() == [
+        "Processed account 0",
+        "Processed account 1",
+        "Processed account 4 [2 similar messages suppressed since last report]",
+        "Processed account 7 [2 similar messages suppressed since last report]",
+    ]
+    assert collector.messages == [f"Processed account {number}" for number in range(8)]
+
+def test_metrics_records_are_never_suppressed(handlers):
+    logger, stream, _ = handlers
+    for number in range(8):
+        logger.debug("[%s] Metrics %s", 'CORE', number, extra={'qbd_metrics': {'stage': str(number)}})
+
+    assert stream.getvalue().splitlines() == [f"[CORE] Metrics {number}" for number in range(8)]
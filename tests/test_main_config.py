@@ -0,0 +1,29 @@
+"""Run settings from the environment into the shared extra_config."""
+
+import pytest
+
+from main import read_extra_config
+
+def test_settings_are_parsed():
+    extra_config = read_extra_config({
+        'QBD_EXPORT_FORMATS': 'SQLite, xml,',
+        'QBD_VALIDATION_WORKERS': '4',
+        'QBD_TRANSACTIONS_CHUNK_ROWS': '1000',
+        'QBD_OPENING_BALANCE_DATE': ' 2024-01-01 ',
+        'PATH': '/usr/bin',
+    })
+
+    assert extra_config == {'export_formats': ['sqlite', 'xml'], 'validation_workers': 4,
+                            'transactions_chunk_rows': 1000, 'opening_balance_date': '2024-01-01'}
+
+def test_unset_and_empty_settings_are_omitted():
+    assert read_extra_config({'QBD_EXPORT_FORMATS': '  '}) == {}
+
+@pytest.mark.parametrize('variable, value', [
+    ('QBD_VALIDATION_WORKERS', 'many'),
+    ('QBD_VALIDATION_WORKERS', '-1'),
+    ('QBD_TRANSACTIONS_CHUNK_ROWS', '0'),
+])
+def test_invalid_settings_name_the_variable(variable, value):
+    with pytest.raises(ValueError, match=variable):
+        read_extra_config({variable: value})
@@ -0,0 +1,44 @@
+"""A HALT from the accounts module stops the run before dependent sections are dispatched."""
+
+import os
+
+from core import run_conversion_pipeline
+
+from conftest import SAMPLE_IIF
+
+def _sample_with_account_type(path, original: str, replacement: str) -> str:
+    with open(SAMPLE_IIF, encoding='utf-8') as f:
+        lines = f.readlines()
+    for position, line in enumerate(lines):
+        fields = line.split('\t')
+        if fields[0] == 'ACCNT' and fields[4] == original:
+            fields[4] = replacement
+            lines[position] = '\t'.join(fields)
+            break
+    else:
+        raise AssertionError(f"sample has no {original} account")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return str(path)
+
+def test_unmapped_account_type_halts_with_questions_file(work_dir, registered_modules):
+    input_path = _sample_with_account_type(work_dir / 'unmapped.IIF', 'EXP', 'FOOBAR')
+
+    exit_code = run_conversion_pipeline({'iif_files': [input_path], 'input_dir': str(work_dir),
+                                         'output_dir': 'output'})
+
+    assert exit_code == 2
+    questions_path = os.path.join('output', 'accounts_mapping_questions.txt')
+    assert os.path.exists(questions_path)
+    with open(questions_path, encoding='utf-8') as f:
+        assert 'FOOBAR' in f.read()
+    # Sections dispatched after ACCNT never ran
+    assert not os.path.exists(os.path.join('output', 'items.csv'))
+    assert not os.path.exists(os.path.join('output', 'accounts.csv'))
+
+def test_sample_converts(work_dir, registered_modules):
+    exit_code = run_conversion_pipeline({'iif_files': [SAMPLE_IIF], 'input_dir': os.path.dirname(SAMPLE_IIF),
+                                         'output_dir': 'output'})
+
+    assert exit_code == 0
+    assert os.path.exists(os.path.join('output', 'accounts.csv'))